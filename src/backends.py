@@ -0,0 +1,150 @@
+"""
+This module collects the available sudoku solving backends behind a common interface.
+Every backend takes a 2D numpy array of dtype :code:`np.intc` representing a sudoku
+board and returns the solved board as a 2D numpy array, raising a :code:`ValueError`
+if the board cannot be solved.
+
+| :code:`bt_mrv`: cythonised backtracking with MRV heuristics (requires the compiled
+  :code:`cython/bt_mrv` extension, solves the board in place).
+| :code:`python_mrv`: pure python backtracking with MRV heuristics from
+  :code:`backtracking_mrv`.
+| :code:`python_backjump`: pure python MRV search with conflict-directed
+  backjumping and nogood learning from :code:`backjumping`.
+| :code:`sat`: built-in CDCL SAT solver from :code:`sat`.
+
+:code:`solve()` can also write the solution into a caller-provided 9x9 buffer
+(:code:`out`), in which case the input board is left unchanged. The :code:`bt_mrv`
+backend then solves directly in the buffer without allocating any arrays.
+"""
+
+import numpy as np
+
+try:
+    from .backjumping import solve_backjump
+    from .backtracking_mrv import solve_backtrack_MRV
+    from .sat import solved_SAT
+except ImportError:
+    from backjumping import solve_backjump
+    from backtracking_mrv import solve_backtrack_MRV
+    from sat import solved_SAT
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+BACKENDS = ("bt_mrv", "python_mrv", "python_backjump", "sat")
+
+
+def _solve_bt_mrv(sudoku_board: np.ndarray) -> np.ndarray:
+    """Solve with the cythonised backtracking algorithm with MRV (in place)."""
+    return np.asarray(bt.solved_MRV(sudoku_board, 0, 0))
+
+
+def _solve_python_mrv(sudoku_board: np.ndarray) -> np.ndarray:
+    """Solve with the pure python backtracking algorithm with MRV."""
+    result = solve_backtrack_MRV(
+        [[int(val) for val in row] for row in sudoku_board], 0, 0
+    )
+    if result is False:
+        raise ValueError("Sudoku puzzle cannot be solved.")
+    return np.array(result, dtype=np.intc)
+
+
+def _solve_python_backjump(sudoku_board: np.ndarray) -> np.ndarray:
+    """Solve with the pure python MRV search with conflict-directed backjumping."""
+    result = solve_backjump([[int(val) for val in row] for row in sudoku_board], 0, 0)
+    if result is False:
+        raise ValueError("Sudoku puzzle cannot be solved.")
+    return np.array(result, dtype=np.intc)
+
+
+_SOLVERS = {
+    "bt_mrv": _solve_bt_mrv,
+    "python_mrv": _solve_python_mrv,
+    "python_backjump": _solve_python_backjump,
+    "sat": solved_SAT,
+}
+
+
+def available_backends() -> list[str]:
+    """
+    Returns the names of the backends which can be used in this environment
+    (:code:`bt_mrv` is only available if the cython extension has been compiled).
+
+    Returns
+    ---------
+    list[str]
+        Names of the available backends
+    """
+    return [name for name in BACKENDS if name != "bt_mrv" or bt is not None]
+
+
+def get_solver(backend: str):
+    """
+    Returns the solve function of a backend.
+
+    Parameters
+    ----------
+    backend : str
+        Name of the backend, one of :code:`BACKENDS`
+
+    Returns
+    ---------
+    callable
+        Function taking a 2D numpy array representing a sudoku board and returning
+        the solved board as a 2D numpy array
+
+    Raises
+    ---------
+    ValueError
+        If the backend is unknown or not available
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend must be one of {BACKENDS}")
+    if backend not in available_backends():
+        raise ValueError(
+            f"Backend {backend} is not available "
+            "(compile it with: cd src/cython && python setup.py build_ext --inplace)"
+        )
+    return _SOLVERS[backend]
+
+
+def solve(
+    sudoku_board: np.ndarray, backend: str = "bt_mrv", out: np.ndarray = None
+) -> np.ndarray:
+    """
+    Solve a sudoku board with the given backend.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array of dtype :code:`np.intc` representing sudoku board (the
+        :code:`bt_mrv` backend solves it in place unless :code:`out` is given)
+    backend : str
+        Name of the backend, one of :code:`BACKENDS`
+    out : np.ndarray
+        Optional 9x9 array of dtype :code:`np.intc` (e.g. a row of a preallocated
+        (N, 9, 9) array) in which the solved board is written
+
+    Returns
+    ---------
+    np.ndarray
+        2D numpy array representing solved sudoku board (:code:`out` if given)
+
+    Raises
+    ---------
+    ValueError
+        If the backend is unknown or not available, or if the sudoku board cannot be
+        solved.
+    """
+    solver = get_solver(backend)
+    if out is None:
+        return solver(sudoku_board)
+    if backend == "bt_mrv":
+        return np.asarray(bt.solve_into(sudoku_board, out))
+    out[...] = solver(sudoku_board)
+    return out
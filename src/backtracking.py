@@ -5,6 +5,12 @@ cells and 'backtracking' if the value is invalid.
 Validity of values is checked using ``validateCell()``, which checks
 if the value is valid for the cell according to sudoku rules.
 
+The public functions check their inputs, but the search itself calls the unchecked
+kernel :code:`_validate_cell()`: the board is checked once by :code:`check_board()`
+when :code:`solve_backtrack()` is called, instead of on every call inside the search.
+:code:`strict=True` re-checks the board and every value at each node (for
+debugging).
+
 **References:**
 
 - `Norvig, P. (2013). Solving Every Sudoku Puzzle <https://norvig.com/sudoku.html>`_
@@ -13,6 +19,58 @@ if the value is valid for the cell according to sudoku rules.
 
 """
 
+try:
+    from .tables import PEER_POSITIONS
+except ImportError:
+    from tables import PEER_POSITIONS
+
+
+def check_board(sudoku_board: list[list[int]]) -> None:
+    """
+    Check that :code:`sudoku_board` is a 9x9 list of lists of ints from 0-9 (the
+    values themselves may still clash).
+
+    Parameters
+    ----------
+    sudoku_board : list[list[int]]
+        List of list representing sudoku board
+
+    Raises
+    ---------
+    TypeError
+        If sudoku board input is not a list of lists of ints
+    ValueError
+        If sudoku board is not 9x9 or contains values outside of 0-9
+    """
+    if type(sudoku_board) != list:
+        raise TypeError("Input must be a list")
+    if len(sudoku_board) != 9:
+        raise ValueError("Input grid must be 9x9")
+    for row in sudoku_board:
+        if type(row) != list:
+            raise TypeError("Input must be a list of lists")
+        if len(row) != 9:
+            raise ValueError("Input grid must be 9x9")
+        for val in row:
+            if type(val) != int:
+                raise TypeError("Input must be a list of lists of ints")
+            if val < 0 or val > 9:
+                raise ValueError("Input must be a list of lists of ints from 0-9")
+
+
+def _validate_cell(sudoku_board, val, i, j, peer_positions=PEER_POSITIONS) -> bool:
+    """
+    Unchecked kernel of :code:`validate_cell()` used inside the search
+    (:code:`peer_positions` as in :code:`tables.UnitTables` for sudoku variants).
+    """
+    # Check cell itself and its peers (row, column & block) using precomputed table
+    if sudoku_board[i][j] == val:
+        return False
+    for p_i, p_j in peer_positions[i][j]:
+        if sudoku_board[p_i][p_j] == val:
+            return False
+    return True
+
 
 def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bool:
     """
@@ -77,23 +135,7 @@ def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bo
     if j < 0 or j > 8:
         raise ValueError("Column index must be between 0-8")
 
-    # Check row & column of val
-    for k in range(9):
-        if sudoku_board[i][k] == val:  # check row
-            return False
-        if sudoku_board[k][j] == val:  # check column
-            return False
-
-    # Get index for block (9 blocks of 3x3)
-    block_i = i // 3
-    block_j = j // 3
-
-    # Check block of val
-    for b_i in range(block_i * 3, block_i * 3 + 3):  # iterate over rows of block
-        for b_j in range(block_j * 3, block_j * 3 + 3):  # iterate over cols of block
-            if sudoku_board[b_i][b_j] == val:
-                return False
-    return True
+    return _validate_cell(sudoku_board, val, i, j)
 
 
 def find_empty_cell(sudoku_board: list[list[int]]) -> tuple[int, int]:
@@ -120,7 +162,37 @@ def find_empty_cell(sudoku_board: list[list[int]]) -> tuple[int, int]:
     return None
 
 
-def solve_backtrack(grid: list[list[int]], i: [int], j: [int]) -> list[list[int]]:
+def _search(grid, strict):
+    """
+    Recursive backtracking search used by :code:`solve_backtrack()`.
+    """
+    if strict:
+        check_board(grid)
+
+    # Find empty cell
+    empty_cell = find_empty_cell(grid)
+    if empty_cell is None:  # if no empty cells, sudoku is solved
+        return grid
+    else:
+        i_e, j_e = empty_cell
+
+    # Try values 1-9
+    check = validate_cell if strict else _validate_cell
+    for val in range(1, 10):
+        if check(grid, val, i_e, j_e):
+            grid[i_e][j_e] = val
+            result = _search(grid, strict)
+            if result is not False:
+                return result  # if sudoku is solved, passed solved grid up the stack
+            else:
+                grid[i_e][j_e] = 0  # backtrack
+
+    return False  # trigger backtracking
+
+
+def solve_backtrack(
+    grid: list[list[int]], i: [int], j: [int], strict: bool = False
+) -> list[list[int]]:
     """
     Solve sudoku using backtracking algorithm (recursive implementation).
     The algorithm works as follows:
@@ -141,28 +213,24 @@ def solve_backtrack(grid: list[list[int]], i: [int], j: [int]) -> list[list[int]
         Row index of cell
     j : int
         Column index of cell
+    strict : bool
+        Check the board and every value with the checked public functions at each
+        node of the search (slow, for debugging)
 
     Returns
     ---------
     list[list[int]]
-        List of list with dimensions 9x9 representing solved sudoku board
-
-    """
-    # Find empty cell
-    empty_cell = find_empty_cell(grid)
-    if empty_cell is None:  # if no empty cells, sudoku is solved
-        return grid
-    else:
-        i_e, j_e = empty_cell
+        List of list with dimensions 9x9 representing solved sudoku board, or False
+        if the board cannot be solved
 
-    # Try values 1-9
-    for val in range(1, 10):
-        if validate_cell(grid, val, i_e, j_e):
-            grid[i_e][j_e] = val
-            result = solve_backtrack(grid, i_e, j_e)
-            if result is not False:
-                return result  # if sudoku is solved, passed solved grid up the stack
-            else:
-                grid[i_e][j_e] = 0  # backtrack
+    Raises
+    ---------
+    TypeError
+        If grid is not a list of lists of ints
+    ValueError
+        If grid is not 9x9 or contains values outside of 0-9
 
-    return False  # trigger backtracking
+    """
+    # Check input once, the search itself uses unchecked kernels
+    check_board(grid)
+    return _search(grid, strict)
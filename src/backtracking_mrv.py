@@ -6,10 +6,67 @@ include minimum remaining values (MRV) heuristics. This means that the backtrack
 algorithm will always choose the cell with the fewest possible values to try first
 (instead of the next empty cell). This is done using the :code:`n_possible_values()`
 function.
+
+Two further (optional) heuristics can be selected for :code:`solve_backtrack_MRV()`:
+
+- **Value ordering**: :code:`value_order="lcv"` tries values in least-constraining
+  value (LCV) order, i.e. values which remove the fewest options from the unfilled
+  peers of the cell are tried first (see :code:`order_values()`).
+- **Tie-breaking**: :code:`tie_break="degree"` breaks ties between cells with the same
+  number of possible values using the degree heuristic, i.e. the cell with the most
+  unfilled peers is chosen (see :code:`n_unfilled_peers()`).
+
+- **Forward checking**: :code:`forward_check=True` checks for domain wipeouts as
+  soon as a value is placed, and abandons the branch at once if a peer of the cell
+  has no candidates left, or a value missing from a row, column or block has no
+  empty cell of it left to go to (see :code:`trail.BoardState.wiped_out()`). The
+  MRV search finds empty cells without candidates one level down anyway, but the
+  values without a cell would otherwise only fail deeper in the tree. A board which
+  already has a wipeout fails before the search.
+
+As in :code:`backtracking`, inputs are checked once by :code:`solve_backtrack_MRV()`
+and the search runs on unchecked kernels with policies already converted to flags.
+:code:`strict=True` keeps the per-node checks for debugging.
+
+The search keeps the board together with bitmasks of the values placed in each unit
+in a :code:`trail.BoardState`: candidates are found from the masks, and every change
+is recorded on a trail and undone on backtracking (see :code:`trail`). The units are
+the standard rows, columns and blocks unless a :code:`tables.UnitTables` is passed
+as :code:`units`, so sudoku variants are solved by the same search (see
+:code:`variants`).
+
+:code:`solve_restarts()` is a randomised variant for puzzles on which the fixed value
+order runs into a heavy tail: the values of every cell are tried in a random order,
+and each run of the search is cut off after a number of nodes given by a restart
+policy (:code:`"luby"`: the Luby sequence times :code:`base`, :code:`"geometric"`:
+:code:`base * factor ** k`), after which the search restarts from the givens with the
+random stream continued. The random numbers come from a 32-bit xorshift generator
+seeded by :code:`seed`, the same as in the cythonised :code:`bt_mrv` module, so runs
+are reproducible and both implementations explore the same tree for a seed.
 """
 
+try:
+    from .backtracking import check_board, _validate_cell
+    from .tables import PEER_POSITIONS, UnitTables
+    from .trail import ALL_VALUES, BoardState
+    from .sat import luby
+except ImportError:
+    from backtracking import check_board, _validate_cell
+    from tables import PEER_POSITIONS, UnitTables
+    from trail import ALL_VALUES, BoardState
+    from sat import luby
 
-def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bool:
+
+# Available value ordering and MRV tie-breaking policies
+VALUE_ORDERS = ("natural", "lcv")
+TIE_BREAKS = ("scan", "degree")
+# Available restart policies of solve_restarts()
+RESTART_POLICIES = ("luby", "geometric")
+
+
+def validate_cell(
+    sudoku_board: list[list[int]], val: int, i: int, j: int, units: UnitTables = None
+) -> bool:
     """
     Check if a value is valid for cell :code:`[i][j]` in :code:`sudoku_board`.
     Validity of sudoku is based off the following rules:
@@ -20,6 +77,9 @@ def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bo
     3) Each of the nine 3 x 3 sub-grids
        must contain the digits 1-9 without repetition
 
+    or, for a sudoku variant, on its units (each must contain the digits 1-9 without
+    repetition).
+
     Parameters
     ------------
     sudoku_board : list[list[int]]
@@ -30,6 +90,8 @@ def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bo
         Row index of cell
     j : int
         Column index of cell
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     ---------
@@ -72,29 +134,16 @@ def validate_cell(sudoku_board: list[list[int]], val: int, i: int, j: int) -> bo
     if j < 0 or j > 8:
         raise ValueError("Column index must be between 0-8")
 
-    # Check row & column of val
-    for k in range(9):
-        if sudoku_board[i][k] == val:  # check row
-            return False
-        if sudoku_board[k][j] == val:  # check column
-            return False
-
-    # Get index for block (9 blocks of 3x3)
-    block_i = i // 3
-    block_j = j // 3
-
-    # Check block of val
-    for b_i in range(block_i * 3, block_i * 3 + 3):  # iterate over rows of block
-        for b_j in range(block_j * 3, block_j * 3 + 3):  # iterate over cols of block
-            if sudoku_board[b_i][b_j] == val:
-                return False
-    return True
+    if units is None:
+        return _validate_cell(sudoku_board, val, i, j)
+    return _validate_cell(sudoku_board, val, i, j, units.peer_positions)
 
 
 def n_possible_values(sudoku_board: list[list[int]], i: int, j: int) -> int:
     """
-    Returns the number of possible values for a given cell in a Sudoku board.
-    Uses :code:`validate_cell()`.
+    Returns the number of possible values for a given cell in a Sudoku board, i.e.
+    the number of values for which :code:`validate_cell()` is True. The values of
+    the cell and its peers are collected once instead of checking each value.
 
     Parameters
     -----------
@@ -110,50 +159,283 @@ def n_possible_values(sudoku_board: list[list[int]], i: int, j: int) -> int:
         int:
             Number of possible values for the given cell (:code:`sudoku_board[i][j]`).
     """
-    possible_values = 0
-    for val in range(1, 10):
-        if validate_cell(sudoku_board, val, i, j):
-            possible_values += 1
-    return possible_values
+    used = {sudoku_board[p_i][p_j] for p_i, p_j in PEER_POSITIONS[i][j]}
+    used.add(sudoku_board[i][j])
+    used.discard(0)
+    return 9 - len(used)
 
 
-def find_empty_cell_MRV(sudoku_board: list[list[int]]) -> tuple[int, int]:
+def n_unfilled_peers(
+    sudoku_board: list[list[int]], i: int, j: int, units: UnitTables = None
+) -> int:
     """
-    Iterates through given Sudoku board and uses :code:`n_possible_values()` to find
-    the cell with the fewest possible values. Returns the row and column indices of
-    that cell as a tuple to be used in the backtracking algorithm. This technique is
-    called the Minimum Remaining Value (MRV) heuristic.
+    Returns the number of unfilled peers of a given cell in a Sudoku board, i.e. the
+    number of empty cells (other than :code:`[i][j]`) which share a row, column or
+    3 x 3 sub-grid with the cell. This is the degree of the cell in the constraint
+    graph of the remaining search problem.
 
     Parameters
     -----------
     sudoku_board : list[list[int]]
         List of lists representing sudoku board
+    i : int
+        Row index of cell
+    j : int
+        Column index of cell
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     ----------
-    min_cell : tuple[int, int]:
-        Row and column indices of the cell with the fewest possible values.
+        int:
+            Number of unfilled peers of the given cell (:code:`sudoku_board[i][j]`).
+    """
+    peer_positions = PEER_POSITIONS if units is None else units.peer_positions
+    unfilled = 0
+    for p_i, p_j in peer_positions[i][j]:
+        if sudoku_board[p_i][p_j] == 0:
+            unfilled += 1
+    return unfilled
+
+
+def _find_empty_cell_MRV(sudoku_board, degree):
+    """
+    Unchecked kernel of :code:`find_empty_cell_MRV()` (:code:`degree` is True for
+    the degree tie-breaking policy).
     """
     # Initialize minimum possible values to 10
     # (always greater than 9, if cell can have all values between 1 and 9)
     min_possible_values = 10
     min_cell = None
+    max_degree = -1
 
     for i in range(9):
+        row = sudoku_board[i]
         for j in range(9):
-            if sudoku_board[i][j] == 0:
+            if row[j] == 0:
                 # Find number of possible values for given cell
                 num_possible_vals = n_possible_values(sudoku_board, i, j)
                 if num_possible_vals < min_possible_values:
                     # Update minimum possible values and cell
                     min_possible_values = num_possible_vals
                     min_cell = (i, j)
+                    if degree:
+                        max_degree = n_unfilled_peers(sudoku_board, i, j)
+                elif num_possible_vals == min_possible_values and degree:
+                    # Break tie with degree heuristic (most unfilled peers)
+                    cell_degree = n_unfilled_peers(sudoku_board, i, j)
+                    if cell_degree > max_degree:
+                        max_degree = cell_degree
+                        min_cell = (i, j)
 
     # Return cell with fewest possible values (MRV)
     return min_cell
 
 
-def solve_backtrack_MRV(sudoku_board, i, j) -> list[list[int]]:
+def find_empty_cell_MRV(
+    sudoku_board: list[list[int]], tie_break: str = "scan"
+) -> tuple[int, int]:
+    """
+    Iterates through given Sudoku board and uses :code:`n_possible_values()` to find
+    the cell with the fewest possible values. Returns the row and column indices of
+    that cell as a tuple to be used in the backtracking algorithm. This technique is
+    called the Minimum Remaining Value (MRV) heuristic.
+
+    Ties between cells with the same number of possible values are broken by scan
+    order (:code:`tie_break="scan"`), or by choosing the cell with the most unfilled
+    peers (:code:`tie_break="degree"`, see :code:`n_unfilled_peers()`).
+
+    Parameters
+    -----------
+    sudoku_board : list[list[int]]
+        List of lists representing sudoku board
+    tie_break : str
+        Tie-breaking policy, one of :code:`TIE_BREAKS`
+
+    Returns
+    ----------
+    min_cell : tuple[int, int]:
+        Row and column indices of the cell with the fewest possible values.
+
+    Raises
+    ----------
+    ValueError
+        If tie-breaking policy is not one of :code:`TIE_BREAKS`
+    """
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Tie-breaking policy must be one of {TIE_BREAKS}")
+
+    return _find_empty_cell_MRV(sudoku_board, tie_break == "degree")
+
+
+def _order_values(sudoku_board, i, j, lcv):
+    """
+    Unchecked kernel of :code:`order_values()` (:code:`lcv` is True for the LCV
+    value ordering policy).
+    """
+    values = [val for val in range(1, 10) if _validate_cell(sudoku_board, val, i, j)]
+    if not lcv or len(values) < 2:
+        return values
+
+    # Unfilled peers of the cell
+    peers = [
+        (p_i, p_j) for p_i, p_j in PEER_POSITIONS[i][j] if sudoku_board[p_i][p_j] == 0
+    ]
+
+    # Count how many peers each value would constrain
+    n_constrained = {}
+    for val in values:
+        n_constrained[val] = sum(
+            _validate_cell(sudoku_board, val, p_i, p_j) for p_i, p_j in peers
+        )
+    return sorted(values, key=lambda val: n_constrained[val])
+
+
+def order_values(
+    sudoku_board: list[list[int]], i: int, j: int, value_order: str = "natural"
+) -> list[int]:
+    """
+    Returns the valid values for cell :code:`[i][j]` in the order they should be
+    tried by the backtracking algorithm. With :code:`value_order="natural"` the
+    values are in ascending order. With :code:`value_order="lcv"` (least-constraining
+    value) they are sorted by the number of unfilled peers which would lose the value
+    as an option, fewest first (ties are kept in ascending order).
+
+    Parameters
+    -----------
+    sudoku_board : list[list[int]]
+        List of lists representing sudoku board
+    i : int
+        Row index of cell
+    j : int
+        Column index of cell
+    value_order : str
+        Value ordering policy, one of :code:`VALUE_ORDERS`
+
+    Returns
+    ----------
+    list[int]
+        Valid values for the given cell, in the order they should be tried.
+
+    Raises
+    ----------
+    ValueError
+        If value ordering policy is not one of :code:`VALUE_ORDERS`
+    """
+    if value_order not in VALUE_ORDERS:
+        raise ValueError(f"Value ordering policy must be one of {VALUE_ORDERS}")
+
+    return _order_values(sudoku_board, i, j, value_order == "lcv")
+
+
+def _find_empty_cell_state(state, degree):
+    """
+    :code:`_find_empty_cell_MRV()` on a :code:`BoardState`, counting possible values
+    from the unit masks.
+    """
+    board = state.board
+    used = state.unit_used
+    cell_units3 = state.cell_units3
+    cell_units_rest = state.cell_units_rest
+    min_possible_values = 10
+    min_cell = None
+    max_degree = -1
+
+    for i in range(9):
+        row = board[i]
+        for j in range(9):
+            if row[j] == 0:
+                r, c, b = cell_units3[i * 9 + j]
+                placed = used[r] | used[c] | used[b]
+                for u in cell_units_rest[i * 9 + j]:
+                    placed |= used[u]
+                num_possible_vals = (ALL_VALUES & ~placed).bit_count()
+                if num_possible_vals < min_possible_values:
+                    min_possible_values = num_possible_vals
+                    min_cell = (i, j)
+                    if degree:
+                        max_degree = n_unfilled_peers(board, i, j, state.tables)
+                elif num_possible_vals == min_possible_values and degree:
+                    cell_degree = n_unfilled_peers(board, i, j, state.tables)
+                    if cell_degree > max_degree:
+                        max_degree = cell_degree
+                        min_cell = (i, j)
+
+    return min_cell
+
+
+def _order_values_state(state, i, j, lcv):
+    """
+    :code:`_order_values()` on a :code:`BoardState`, using the candidate masks.
+    """
+    candidates = state.candidates(i, j)
+    values = [val for val in range(1, 10) if candidates >> val & 1]
+    if not lcv or len(values) < 2:
+        return values
+
+    # Candidate masks of the unfilled peers of the cell
+    board = state.board
+    peer_masks = [
+        state.candidates(p_i, p_j)
+        for p_i, p_j in state.tables.peer_positions[i][j]
+        if board[p_i][p_j] == 0
+    ]
+
+    # Count how many peers each value would constrain
+    n_constrained = {}
+    for val in values:
+        n_constrained[val] = sum(mask >> val & 1 for mask in peer_masks)
+    return sorted(values, key=lambda val: n_constrained[val])
+
+
+def _search(state, lcv, degree, stats, strict, fc=False):
+    """
+    Recursive backtracking search with MRV used by :code:`solve_backtrack_MRV()`.
+    Returns True if the board of :code:`state` has been solved in place. With
+    :code:`fc` (forward checking), a placement which causes a domain wipeout is
+    undone at once.
+    """
+    if strict:
+        check_board(state.board)
+
+    # Find empty cell
+    empty_cell = _find_empty_cell_state(state, degree)
+    if empty_cell is None:  # if no empty cells, sudoku is solved
+        return True
+    else:
+        i_e, j_e = empty_cell
+
+    # Try valid values in the order given by the value ordering policy
+    for val in _order_values_state(state, i_e, j_e, lcv):
+        if strict and not validate_cell(state.board, val, i_e, j_e, state.tables):
+            raise AssertionError(f"Invalid value {val} for cell ({i_e}, {j_e})")
+        mark = state.mark()
+        state.place(i_e, j_e, val)
+        if stats is not None:
+            stats["nodes"] += 1
+        if fc and state.wiped_out(i_e, j_e):
+            if stats is not None:
+                stats["wipeouts"] += 1
+        elif _search(state, lcv, degree, stats, strict, fc):
+            return True  # if sudoku is solved, pass success up the stack
+        state.undo(mark)  # backtrack
+        if stats is not None:
+            stats["backtracks"] += 1
+
+    return False  # trigger backtracking
+
+
+def solve_backtrack_MRV(
+    sudoku_board,
+    i,
+    j,
+    value_order: str = "natural",
+    tie_break: str = "scan",
+    stats: dict = None,
+    strict: bool = False,
+    forward_check: bool = False,
+    units: UnitTables = None,
+) -> list[list[int]]:
     """
     **Backtracking algorithm with MRV**
 
@@ -170,28 +452,221 @@ def solve_backtrack_MRV(sudoku_board, i, j) -> list[list[int]]:
         Row index of cell
     j : int
         Column index of cell
+    value_order : str
+        Value ordering policy, one of :code:`VALUE_ORDERS` (see :code:`order_values()`)
+    tie_break : str
+        MRV tie-breaking policy, one of :code:`TIE_BREAKS`
+        (see :code:`find_empty_cell_MRV()`)
+    stats : dict
+        Optional dictionary in which the number of search nodes (values placed),
+        backtracks (values removed again) and, with forward checking, wipeouts
+        (placements abandoned because of a domain wipeout) are accumulated
+        under the keys :code:`"nodes"`, :code:`"backtracks"` and :code:`"wipeouts"`
+    strict : bool
+        Check the board and every value with the checked public functions at each
+        node of the search (slow, for debugging)
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None, see :code:`variants`)
 
     Returns
     ---------
     list[list[int]]
-        List of list with dimensions 9x9 representing solved sudoku board
+        List of list with dimensions 9x9 representing solved sudoku board, or False
+        if the board cannot be solved
+
+    Raises
+    ---------
+    TypeError
+        If sudoku board is not a list of lists of ints
+    ValueError
+        If sudoku board is not 9x9 or contains values outside of 0-9, or if a
+        policy is unknown
     """
+    # Check inputs once, the search itself uses unchecked kernels
+    check_board(sudoku_board)
+    if value_order not in VALUE_ORDERS:
+        raise ValueError(f"Value ordering policy must be one of {VALUE_ORDERS}")
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Tie-breaking policy must be one of {TIE_BREAKS}")
+    if stats is not None:
+        stats.setdefault("nodes", 0)
+        stats.setdefault("backtracks", 0)
+        if forward_check:
+            stats.setdefault("wipeouts", 0)
 
-    # Find empty cell
-    empty_cell = find_empty_cell_MRV(sudoku_board)
-    if empty_cell is None:  # if no empty cells, sudoku is solved
+    state = BoardState(sudoku_board, units)
+    if forward_check and state.has_wipeout():
+        # wiped_out() only checks the units changed by a placement
+        return False
+    lcv = value_order == "lcv"
+    if _search(state, lcv, tie_break == "degree", stats, strict, forward_check):
         return sudoku_board
-    else:
-        i_e, j_e = empty_cell
+    return False
 
-    # Try values 1-9
-    for val in range(1, 10):
-        if validate_cell(sudoku_board, val, i_e, j_e):
-            sudoku_board[i_e][j_e] = val
-            result = solve_backtrack_MRV(sudoku_board, i_e, j_e)
-            if result is not False:
-                return result  # if sudoku is solved, passed solved grid up the stack
-            else:
-                sudoku_board[i_e][j_e] = 0  # backtrack
 
-    return False  # trigger backtracking
+def _xorshift(rng):
+    """
+    Advance the 32-bit xorshift generator :code:`rng` (a one-element list holding the
+    state) and return the new state.
+    """
+    x = rng[0]
+    x ^= (x << 13) & 0xFFFFFFFF
+    x ^= x >> 17
+    x ^= (x << 5) & 0xFFFFFFFF
+    rng[0] = x
+    return x
+
+
+def _shuffle(values, rng):
+    """Shuffle a list in place (Fisher-Yates) with the xorshift generator."""
+    for k in range(len(values) - 1, 0, -1):
+        r = _xorshift(rng) % (k + 1)
+        values[k], values[r] = values[r], values[k]
+
+
+def restart_cutoffs(restart: str = "luby", base: int = 100, factor: float = 1.5):
+    """
+    Returns a generator of the node cutoffs of successive search runs for a restart
+    policy: :code:`base * luby(k)` for :code:`"luby"` and :code:`base * factor ** k`
+    for :code:`"geometric"` (k = 1, 2, ... and k = 0, 1, ... respectively).
+
+    The parameters are checked when it is called, before the first cutoff is
+    generated.
+
+    Raises
+    ---------
+    ValueError
+        If the policy is unknown, base is not positive or factor is not greater
+        than 1 (the cutoff would never grow, so a board needing more nodes would
+        restart forever)
+    """
+    if restart not in RESTART_POLICIES:
+        raise ValueError(f"Restart policy must be one of {RESTART_POLICIES}")
+    if base < 1:
+        raise ValueError("Base cutoff must be positive")
+    if factor <= 1:
+        raise ValueError("Geometric factor must be greater than 1")
+    return _cutoffs(restart, base, factor)
+
+
+def _cutoffs(restart: str, base: int, factor: float):
+    """Generator of the cutoffs of restart_cutoffs() (parameters already checked)."""
+    k = 0
+    while True:
+        k += 1
+        if restart == "luby":
+            yield base * luby(k)
+        else:
+            yield int(base * factor ** (k - 1))
+
+
+class _Cutoff(Exception):
+    """Raised to abandon a run of the randomised search at its node cutoff."""
+
+
+def _search_random(state, degree, rng, budget, stats):
+    """
+    Backtracking search with MRV and random value order used by
+    :code:`solve_restarts()`. :code:`budget` is a one-element list with the number
+    of nodes left in the run. Returns True if the board of :code:`state` has been
+    solved in place, and raises :code:`_Cutoff` if the budget runs out.
+    """
+    empty_cell = _find_empty_cell_state(state, degree)
+    if empty_cell is None:
+        return True
+    i_e, j_e = empty_cell
+
+    values = _order_values_state(state, i_e, j_e, False)
+    _shuffle(values, rng)
+    for val in values:
+        if budget[0] == 0:
+            raise _Cutoff
+        budget[0] -= 1
+        mark = state.mark()
+        state.place(i_e, j_e, val)
+        stats["nodes"] += 1
+        if _search_random(state, degree, rng, budget, stats):
+            return True
+        state.undo(mark)
+        stats["backtracks"] += 1
+
+    return False
+
+
+def solve_restarts(
+    sudoku_board,
+    seed: int = 0,
+    restart: str = "luby",
+    base: int = 100,
+    factor: float = 1.5,
+    tie_break: str = "scan",
+    stats: dict = None,
+    units: UnitTables = None,
+) -> list[list[int]]:
+    """
+    **Randomised backtracking with MRV and restarts**
+
+    Solve a sudoku with the MRV search, trying the values of every cell in a random
+    order and restarting after the node cutoffs of a restart policy (see module
+    docstring). A run which finishes without reaching its cutoff has searched the
+    whole tree, so unsolvable boards are still detected.
+
+    Parameters
+    -----------
+    sudoku_board : (list[list[int]])
+        List of list with dimensions 9x9 representing sudoku board (solved in place)
+    seed : int
+        Seed of the random value order (the same seed gives the same search)
+    restart : str
+        Restart policy, one of :code:`RESTART_POLICIES`
+    base : int
+        Node cutoff of the first run (unit of the Luby sequence)
+    factor : float
+        Growth factor of the cutoff for the geometric policy (greater than 1)
+    tie_break : str
+        MRV tie-breaking policy, one of :code:`TIE_BREAKS`
+    stats : dict
+        Optional dictionary in which the number of search nodes, backtracks and
+        restarts are accumulated under the keys :code:`"nodes"`,
+        :code:`"backtracks"` and :code:`"restarts"`
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None, see :code:`variants`)
+
+    Returns
+    ---------
+    list[list[int]]
+        List of list with dimensions 9x9 representing solved sudoku board, or False
+        if the board cannot be solved
+
+    Raises
+    ---------
+    TypeError
+        If sudoku board is not a list of lists of ints
+    ValueError
+        If sudoku board is not 9x9 or contains values outside of 0-9, or if a
+        policy or cutoff parameter is invalid
+    """
+    check_board(sudoku_board)
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Tie-breaking policy must be one of {TIE_BREAKS}")
+    # Raises before the search if a policy parameter is invalid
+    cutoffs = restart_cutoffs(restart, base, factor)
+    if stats is None:
+        stats = {}
+    for key in ("nodes", "backtracks", "restarts"):
+        stats.setdefault(key, 0)
+
+    # xorshift needs a non-zero state
+    rng = [seed & 0xFFFFFFFF or 0x9E3779B9]
+    state = BoardState(sudoku_board, units)
+    degree = tie_break == "degree"
+    for cutoff in cutoffs:
+        try:
+            if _search_random(state, degree, rng, [cutoff], stats):
+                return sudoku_board
+            return False
+        except _Cutoff:
+            state.undo(0)
+            stats["restarts"] += 1
@@ -0,0 +1,266 @@
+"""
+This module contains a batch executor which solves many sudoku boards in a pool of
+worker processes without pickling the boards.
+
+The input (N, 9, 9) array, the output array and a per-board status array are placed
+in :code:`multiprocessing.shared_memory` blocks. Every worker attaches to the blocks
+once (in the pool initializer) and views them as numpy arrays. Tasks are only index
+ranges :code:`(start, stop)`. The worker solves the boards of its range directly into
+the shared output array, and sends back just the range and the number of boards it
+could not solve. The only copies of the boards are the copy into shared memory
+and the copy of the results out of it, both made in the parent.
+
+Workers use the cythonised :code:`bt_mrv` backend when it has been compiled (solving
+each range with a single :code:`bt_mrv.solve_batch()` call), and fall back to the
+pure python :code:`python_mrv` backend otherwise.
+
+Progress can be followed while the batch is solved by passing a
+:code:`metrics.BatchMetrics`: every completed range is recorded (with the solve
+time of each of its boards, its failures and, with :code:`bt_mrv`, search nodes),
+and the number of boards not solved yet is kept as the queue depth.
+
+The boards are validated in the parent (:code:`utils.validate_boards()`) before any
+of them is copied into shared memory: boards with values outside 0-9 or clashing
+givens are marked as failed without being sent to the workers.
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .backends import solve, available_backends, get_solver
+    from .utils import validate_boards
+except ImportError:
+    from backends import solve, available_backends, get_solver
+    from utils import validate_boards
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+# Shared memory blocks and array views of a worker process (set by _attach())
+_shared = {}
+
+
+def _solve_range(
+    boards: np.ndarray,
+    out: np.ndarray,
+    status: np.ndarray,
+    start: int,
+    stop: int,
+    backend: str,
+    stats: dict = None,
+    seconds: np.ndarray = None,
+) -> int:
+    """
+    Solve :code:`boards[start:stop]` into :code:`out[start:stop]`, setting the
+    status of every board to 1 if it was solved and 0 otherwise. Returns the number
+    of boards which could not be solved. With :code:`bt_mrv`, the search statistics
+    are added to :code:`stats` (if given). The solve time of every board is written
+    to :code:`seconds` (if given, a float64 array of length :code:`stop - start`).
+    """
+    if backend == "bt_mrv":
+        # Whole range in one call, without the GIL
+        return bt.solve_batch(
+            boards[start:stop],
+            out[start:stop],
+            status[start:stop],
+            stats=stats,
+            seconds=seconds,
+        )
+    # Unknown or unavailable backends raise here, not as a failure of every board
+    get_solver(backend)
+    failed = 0
+    for k in range(start, stop):
+        start_time = time.perf_counter()
+        try:
+            solve(boards[k], backend, out=out[k])
+            status[k] = 1
+        except ValueError:
+            out[k] = 0
+            status[k] = 0
+            failed += 1
+        if seconds is not None:
+            seconds[k - start] = time.perf_counter() - start_time
+    return failed
+
+
+def _attach(names: tuple[str, str, str], n: int, backend: str) -> None:
+    """
+    Pool initializer: attach to the shared memory blocks and create the array views.
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _shared["blocks"] = blocks
+    _shared["boards"] = np.ndarray((n, 9, 9), dtype=np.intc, buffer=blocks[0].buf)
+    _shared["out"] = np.ndarray((n, 9, 9), dtype=np.intc, buffer=blocks[1].buf)
+    _shared["status"] = np.ndarray((n,), dtype=np.uint8, buffer=blocks[2].buf)
+    _shared["backend"] = backend
+
+
+def _timed_range(
+    boards: np.ndarray,
+    out: np.ndarray,
+    status: np.ndarray,
+    start: int,
+    stop: int,
+    backend: str,
+) -> tuple[int, int, int, np.ndarray, int]:
+    """
+    :code:`_solve_range()` which also measures the solve time of every board.
+    Returns :code:`(start, stop, failed, seconds, nodes)`.
+    """
+    stats = {}
+    seconds = np.zeros(stop - start)
+    failed = _solve_range(boards, out, status, start, stop, backend, stats, seconds)
+    return start, stop, failed, seconds, stats.get("nodes", 0)
+
+
+def _solve_task(bounds: tuple[int, int]) -> tuple[int, int, int, np.ndarray, int]:
+    """
+    Worker function: solve a range of the shared boards. Returns
+    :code:`(start, stop, failed, seconds, nodes)`.
+    """
+    start, stop = bounds
+    return _timed_range(
+        _shared["boards"],
+        _shared["out"],
+        _shared["status"],
+        start,
+        stop,
+        _shared["backend"],
+    )
+
+
+def _record(metrics, result: tuple[int, int, int, np.ndarray, int]) -> None:
+    """Record the result of a range (see :code:`_timed_range()`) in the metrics."""
+    _, _, failed, seconds, nodes = result
+    metrics.record(seconds, failed=failed, nodes=nodes)
+
+
+def solve_batch(
+    boards: np.ndarray,
+    processes: int = None,
+    chunk_size: int = None,
+    backend: str = None,
+    metrics=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    **Shared memory batch solving**
+
+    Solve every board of an (N, 9, 9) array in a pool of :code:`processes` worker
+    processes, exchanging the boards through shared memory (see module docstring).
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Integer array of shape (N, 9, 9) of sudoku boards (not modified)
+    processes : int
+        Number of worker processes. Defaults to :code:`os.cpu_count()`. With 1
+        process, the boards are solved in the calling process.
+    chunk_size : int
+        Number of boards per task. Defaults to about 4 tasks per process.
+    backend : str
+        Backend used by the workers, :code:`bt_mrv` or :code:`python_mrv`.
+        Defaults to :code:`bt_mrv` if it is available and :code:`python_mrv`
+        otherwise.
+    metrics : metrics.BatchMetrics
+        Optional metrics updated as the ranges of boards are solved
+
+    Returns
+    ---------
+    tuple[np.ndarray, np.ndarray]
+        Solved boards as an (N, 9, 9) array of dtype :code:`np.intc` (all zeros for
+        boards which could not be solved or are not valid), and a boolean array of
+        shape (N,) which is True for the solved boards
+
+    Raises
+    ---------
+    ValueError
+        If boards do not have shape (N, 9, 9), processes or chunk_size are not
+        positive, or the backend is unknown or not available
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError("Boards must have shape (N, 9, 9)")
+    if backend is None:
+        backend = "bt_mrv" if "bt_mrv" in available_backends() else "python_mrv"
+    # Checked in the parent, before any worker is started
+    get_solver(backend)
+    if processes is None:
+        processes = os.cpu_count()
+    if processes < 1:
+        raise ValueError("Number of processes must be positive")
+    n = boards.shape[0]
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(n / (4 * processes)))
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    valid = validate_boards(boards)
+    if not valid.all():
+        # Only the valid boards are solved; the others fail without a search
+        out = np.zeros((n, 9, 9), dtype=np.intc)
+        status = np.zeros(n, dtype=bool)
+        if metrics is not None:
+            invalid = n - int(valid.sum())
+            metrics.record(np.zeros(invalid), failed=invalid)
+        out[valid], status[valid] = solve_batch(
+            boards[valid], processes, chunk_size, backend, metrics
+        )
+        return out, status
+
+    ranges = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    if metrics is not None:
+        metrics.set_queued(n)
+
+    if n == 0 or processes == 1:
+        boards = np.ascontiguousarray(boards, dtype=np.intc)
+        out = np.zeros(boards.shape, dtype=np.intc)
+        status = np.zeros(n, dtype=np.uint8)
+        if metrics is None:
+            _solve_range(boards, out, status, 0, n, backend)
+        else:
+            # Range by range, so the metrics are updated during the batch
+            for start, stop in ranges:
+                _record(
+                    metrics, _timed_range(boards, out, status, start, stop, backend)
+                )
+        return out, status.astype(bool)
+
+    sizes = (boards.size * np.intc().itemsize,) * 2 + (n,)
+    blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+    views = []
+    try:
+        views = [
+            np.ndarray((n, 9, 9), dtype=np.intc, buffer=blocks[0].buf),
+            np.ndarray((n, 9, 9), dtype=np.intc, buffer=blocks[1].buf),
+            np.ndarray((n,), dtype=np.uint8, buffer=blocks[2].buf),
+        ]
+        views[0][...] = boards
+
+        names = tuple(block.name for block in blocks)
+        with multiprocessing.Pool(
+            processes, initializer=_attach, initargs=(names, n, backend)
+        ) as pool:
+            for result in pool.imap_unordered(_solve_task, ranges):
+                if metrics is not None:
+                    _record(metrics, result)
+
+        out = views[1].copy()
+        status = views[2].astype(bool)
+    finally:
+        # The views must be released before the blocks can be closed
+        views.clear()
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return out, status
@@ -0,0 +1,416 @@
+"""
+This script benchmarks the value ordering and MRV tie-breaking heuristics of the
+backtracking algorithm. For every puzzle and every combination of policies it reports
+the number of search nodes (values placed), backtracks and the time taken, for the
+cythonised :code:`bt_mrv` module and (optionally) the pure python
+:code:`backtracking_mrv` module. Usage:
+:code:`python src/benchmark.py [--python] [puzzle.txt ...]`. By default the puzzles
+in :code:`test/example_sudokus/` are used.
+
+Node counts are deterministic, so they are also used as a performance regression
+test which does not depend on timings. :code:`record_node_counts()` records the
+nodes and backtracks of every puzzle in :code:`test/example_sudokus/` and the
+benchmark corpus (see :code:`corpus`) for every search of :code:`baseline_groups()`,
+and :code:`python src/benchmark.py --record-baseline` saves them to
+:code:`BASELINE_PATH`. A group is named after its search:
+
+| :code:`<backend>/<value order>/<tie-break>`: MRV search of the :code:`cython` or
+  :code:`python` backend with the given policies, with :code:`/forward_check`
+  appended for forward checking.
+| :code:`<backend>/restarts/<policy>`: randomised search with restarts, seeded
+  with :code:`RESTART_SEED`.
+| :code:`python/backjump`: conflict-directed backjumping (see :code:`backjumping`).
+| :code:`sat`: the CDCL SAT solver, whose counts are decisions and conflicts.
+
+:code:`compare_node_counts()` reports the counts which grew by more than
+:code:`NODE_COUNT_TOLERANCE` relative to the baseline. The pure python searches are
+much slower, so they are only recorded for the example puzzles and the first
+:code:`PYTHON_PER_TIER` puzzles of every corpus tier. After an intended change of
+the search, record a new baseline and commit it with the change.
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+try:
+    from .utils import parse_grid
+    from .backjumping import solve_backjump
+    from .backtracking_mrv import (
+        solve_backtrack_MRV,
+        solve_restarts,
+        VALUE_ORDERS,
+        TIE_BREAKS,
+        RESTART_POLICIES,
+    )
+    from .corpus import CORPUS_PATH, CORPUS_VERSION, TIERS, load_corpus
+    from .sat import solved_SAT
+except ImportError:
+    from utils import parse_grid
+    from backjumping import solve_backjump
+    from backtracking_mrv import (
+        solve_backtrack_MRV,
+        solve_restarts,
+        VALUE_ORDERS,
+        TIE_BREAKS,
+        RESTART_POLICIES,
+    )
+    from corpus import CORPUS_PATH, CORPUS_VERSION, TIERS, load_corpus
+    from sat import solved_SAT
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+EXAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "test", "example_sudokus"
+)
+BASELINE_PATH = os.path.join(
+    os.path.dirname(CORPUS_PATH), f"node_counts_v{CORPUS_VERSION}.json"
+)
+# Relative growth of a node or backtrack count which counts as a regression
+NODE_COUNT_TOLERANCE = 0.10
+# Corpus puzzles per tier recorded for the pure python searches
+PYTHON_PER_TIER = 2
+# Seed of the searches with restarts in the baseline
+RESTART_SEED = 1
+
+
+def run_policy(
+    sudoku_board,
+    backend: str,
+    value_order: str,
+    tie_break: str,
+    forward_check: bool = False,
+) -> dict:
+    """
+    Solve a copy of :code:`sudoku_board` with the given backend and policies.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array representing sudoku board (not modified)
+    backend : str
+        :code:`"cython"` or :code:`"python"`
+    value_order : str
+        Value ordering policy, one of :code:`VALUE_ORDERS`
+    tie_break : str
+        MRV tie-breaking policy, one of :code:`TIE_BREAKS`
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+
+    Returns
+    ---------
+    dict
+        :code:`"solved"`, :code:`"nodes"`, :code:`"backtracks"` and :code:`"time"`
+        (seconds)
+
+    Raises
+    ---------
+    ValueError
+        If backend is unknown or not available
+    """
+    if backend == "cython":
+        if bt is None:
+            raise ValueError("Cython backend is not compiled")
+        board = sudoku_board.copy()
+        start_time = time.perf_counter()
+        stats = bt.solve_with_stats(board, value_order, tie_break, forward_check)
+        stats["time"] = time.perf_counter() - start_time
+        return stats
+    if backend == "python":
+        board = sudoku_board.tolist()
+        stats = {}
+        start_time = time.perf_counter()
+        result = solve_backtrack_MRV(
+            board, 0, 0, value_order, tie_break, stats, forward_check=forward_check
+        )
+        stats["time"] = time.perf_counter() - start_time
+        stats["solved"] = result is not False
+        return stats
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def benchmark_policies(puzzles: dict, backends: list[str]) -> list[dict]:
+    """
+    Run every combination of value ordering and tie-breaking policy on every puzzle.
+
+    Parameters
+    ----------
+    puzzles : dict
+        Mapping of puzzle name to 2D numpy array representing sudoku board
+    backends : list[str]
+        Backends to benchmark (see :code:`run_policy()`)
+
+    Returns
+    ---------
+    list[dict]
+        One result per (puzzle, backend, value order, tie-break), with keys
+        :code:`"puzzle"`, :code:`"backend"`, :code:`"value_order"`,
+        :code:`"tie_break"` and the keys returned by :code:`run_policy()`
+    """
+    results = []
+    for name, sudoku_board in puzzles.items():
+        for backend in backends:
+            for value_order in VALUE_ORDERS:
+                for tie_break in TIE_BREAKS:
+                    result = run_policy(sudoku_board, backend, value_order, tie_break)
+                    result.update(
+                        puzzle=name,
+                        backend=backend,
+                        value_order=value_order,
+                        tie_break=tie_break,
+                    )
+                    results.append(result)
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    """
+    Format benchmark results as a text table.
+    """
+    header = (
+        f"{'puzzle':<20}{'backend':<9}{'values':<9}{'ties':<8}"
+        f"{'nodes':>10}{'backtracks':>12}{'time [s]':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['puzzle']:<20}{r['backend']:<9}{r['value_order']:<9}"
+            f"{r['tie_break']:<8}{r['nodes']:>10}{r['backtracks']:>12}"
+            f"{r['time']:>11.4f}"
+        )
+    return "\n".join(lines)
+
+
+def regression_puzzles(corpus_path: str = CORPUS_PATH) -> dict:
+    """
+    Returns the puzzles of the node count regression test, as a mapping of name
+    (:code:`example/<file>` or :code:`<tier>/<index>` for the corpus) to 2D numpy
+    array.
+    """
+    puzzles = {}
+    for path in sorted(glob.glob(os.path.join(EXAMPLE_DIR, "*.txt"))):
+        with open(path, "r") as f:
+            puzzles[f"example/{os.path.basename(path)}"] = parse_grid(f.read())
+    counters = dict.fromkeys(TIERS, 0)
+    for tier, puzzle, _ in load_corpus(corpus_path):
+        puzzles[f"{tier}/{counters[tier]}"] = puzzle
+        counters[tier] += 1
+    return puzzles
+
+
+def baseline_groups(backends: tuple[str, ...] = ("cython", "python")) -> list[str]:
+    """
+    Returns the names of the searches recorded in the node count baseline (see
+    module docstring): every combination of policies with and without forward
+    checking and every restart policy of each backend, then backjumping and the
+    SAT solver.
+    """
+    groups = []
+    for backend in backends:
+        for suffix in ("", "/forward_check"):
+            for value_order in VALUE_ORDERS:
+                for tie_break in TIE_BREAKS:
+                    groups.append(f"{backend}/{value_order}/{tie_break}{suffix}")
+        for restart in RESTART_POLICIES:
+            groups.append(f"{backend}/restarts/{restart}")
+    return groups + ["python/backjump", "sat"]
+
+
+def run_group(sudoku_board, group: str) -> list[int]:
+    """
+    Solve a copy of :code:`sudoku_board` with the search of a baseline group (see
+    module docstring).
+
+    Returns
+    ---------
+    list[int]
+        :code:`[nodes, backtracks]` (:code:`[decisions, conflicts]` for
+        :code:`sat`)
+
+    Raises
+    ---------
+    ValueError
+        If the group is unknown, or its backend is not available
+    """
+    parts = group.split("/")
+    stats = {}
+    if parts == ["sat"]:
+        solved_SAT(sudoku_board, stats)
+        return [stats["decisions"], stats["conflicts"]]
+    if parts == ["python", "backjump"]:
+        solve_backjump(sudoku_board.tolist(), 0, 0, stats=stats)
+    elif len(parts) == 3 and parts[1] == "restarts" and parts[0] == "cython":
+        if bt is None:
+            raise ValueError("Cython backend is not compiled")
+        stats = bt.solve_restarts(sudoku_board.copy(), RESTART_SEED, parts[2])
+    elif len(parts) == 3 and parts[1] == "restarts" and parts[0] == "python":
+        solve_restarts(sudoku_board.tolist(), RESTART_SEED, parts[2], stats=stats)
+    elif len(parts) == 3 or parts[3:] == ["forward_check"]:
+        stats = run_policy(sudoku_board, *parts[:3], forward_check=len(parts) == 4)
+    else:
+        raise ValueError(f"Unknown baseline group: {group}")
+    return [stats["nodes"], stats["backtracks"]]
+
+
+def _recorded(name: str, group: str) -> bool:
+    """Whether a puzzle of regression_puzzles() is recorded for a group."""
+    if not group.startswith("cython/") and not name.startswith("example/"):
+        return int(name.rsplit("/", 1)[1]) < PYTHON_PER_TIER
+    return True
+
+
+def record_node_counts(puzzles: dict, groups: list[str]) -> dict:
+    """
+    Record the node and backtrack counts of every puzzle (the pure python searches
+    only on a subset, see module docstring) for every search of :code:`groups`.
+
+    Parameters
+    ----------
+    puzzles : dict
+        Mapping of puzzle name to 2D numpy array (see :code:`regression_puzzles()`)
+    groups : list[str]
+        Searches to record (see :code:`baseline_groups()`)
+
+    Returns
+    ---------
+    dict
+        Mapping of group name to a mapping of puzzle name to the counts of
+        :code:`run_group()`
+    """
+    counts = {}
+    for group in groups:
+        counts[group] = {
+            name: run_group(sudoku_board, group)
+            for name, sudoku_board in puzzles.items()
+            if _recorded(name, group)
+        }
+    return counts
+
+
+def compare_node_counts(
+    baseline: dict, counts: dict, tolerance: float = NODE_COUNT_TOLERANCE
+) -> list[str]:
+    """
+    Compare node counts (as returned by :code:`record_node_counts()`) with a
+    baseline.
+
+    Parameters
+    ----------
+    baseline : dict
+        Baseline counts
+    counts : dict
+        Current counts
+    tolerance : float
+        Relative growth of a count allowed
+
+    Returns
+    ---------
+    list[str]
+        One message per regression: a node or backtrack count (decision or conflict
+        count for :code:`sat`) more than :code:`tolerance` above the baseline, or a
+        puzzle missing from the current counts. Empty if there are none.
+    """
+    regressions = []
+    for group, expected in baseline.items():
+        current = counts.get(group, {})
+        labels = (
+            ("decisions", "conflicts") if group == "sat" else ("nodes", "backtracks")
+        )
+        for name, old in expected.items():
+            if name not in current:
+                regressions.append(f"{group} {name}: not recorded")
+                continue
+            new = current[name]
+            for k, label in enumerate(labels):
+                if new[k] > old[k] * (1 + tolerance):
+                    regressions.append(f"{group} {name}: {label} {old[k]} -> {new[k]}")
+    return regressions
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    """
+    Read node counts saved by :code:`save_baseline()`.
+
+    Raises
+    ---------
+    ValueError
+        If the baseline was recorded on a different corpus version
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("corpus_version") != CORPUS_VERSION:
+        raise ValueError(f"Baseline must be for corpus version {CORPUS_VERSION}")
+    return data["counts"]
+
+
+def save_baseline(counts: dict, path: str = BASELINE_PATH) -> None:
+    """
+    Save node counts (as returned by :code:`record_node_counts()`) as a baseline,
+    one puzzle per line.
+    """
+    lines = ["{", f'"corpus_version": {CORPUS_VERSION},', '"counts": {']
+    for g, (group, entries) in enumerate(counts.items()):
+        lines.append(f"{json.dumps(group)}: {{")
+        items = [f"{json.dumps(name)}: {value}" for name, value in entries.items()]
+        lines.append(",\n".join(items))
+        lines.append("}" + ("," if g < len(counts) - 1 else ""))
+    lines.extend(["}", "}"])
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    """
+    Parse command line arguments, run the benchmark and print the results table.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark MRV search heuristics")
+    parser.add_argument("puzzles", nargs="*", help="Sudoku text files to benchmark")
+    parser.add_argument(
+        "--python",
+        action="store_true",
+        help="Also benchmark the (much slower) pure python backend",
+    )
+    parser.add_argument(
+        "--record-baseline",
+        nargs="?",
+        const=BASELINE_PATH,
+        default=None,
+        metavar="FILE",
+        help="Record the node counts of the regression test puzzles (default file: "
+        "test/corpus/node_counts_v<version>.json) instead of benchmarking",
+    )
+    args = parser.parse_args()
+
+    paths = args.puzzles or sorted(glob.glob(os.path.join(EXAMPLE_DIR, "*.txt")))
+    puzzles = {}
+    for path in paths:
+        with open(path, "r") as f:
+            puzzles[os.path.basename(path)] = parse_grid(f.read())
+
+    if args.record_baseline is not None:
+        if bt is None:
+            raise ValueError("Cython backend is not compiled")
+        counts = record_node_counts(regression_puzzles(), baseline_groups())
+        save_baseline(counts, args.record_baseline)
+        print(f"Wrote node counts of {len(counts)} groups to {args.record_baseline}")
+        return
+
+    backends = []
+    if bt is not None:
+        backends.append("cython")
+    if args.python or bt is None:
+        backends.append("python")
+
+    print(format_results(benchmark_policies(puzzles, backends)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+This module contains :code:`Board`, a compact sudoku board type for applications
+which hold many boards in memory (e.g. deduplication sets and solution caches).
+
+A board is stored as an 81-byte :code:`bytearray` (row by row, 0 for empty cells) in
+an object with :code:`__slots__`, so it takes about 200 bytes, against more than
+1 kB for a list of lists of ints. The bytes are shared with every view of the
+board, without copies:
+
+| :code:`Board.array()`: 9x9 numpy array of dtype :code:`np.uint8`.
+| :code:`Board.cells`: the :code:`bytearray` itself, which supports the buffer
+  protocol (e.g. :code:`memoryview(board.cells)`), so Cython functions taking a typed
+  memoryview use it directly, e.g. :code:`bt_mrv.solve_cells(board.cells)` solves
+  the board in place. On Python 3.12+ the board itself is a buffer too.
+
+The solvers working on :code:`np.intc` arrays or lists of lists are reached through
+:code:`Board.to_intc()` and :code:`Board.tolist()` (which copy), and
+:code:`Board.from_array()` converts their results back. :code:`Board.tobytes()` is
+the same key as :code:`symmetry.canonical_key()` uses for canonical boards.
+"""
+
+import numpy as np
+
+
+class Board:
+    """
+    Sudoku board stored as 81 bytes.
+
+    Parameters
+    ----------
+    cells : bytes-like, np.ndarray or list
+        The 81 values (0-9, 0 for empty cells) row by row, as a bytes-like object,
+        a 9x9 or flat array or a list of lists. The board is empty if None. A
+        :code:`bytearray` is used as is (not copied); anything else is copied.
+
+    Attributes
+    ----------
+    cells : bytearray
+        The 81 values of the board
+
+    Raises
+    ----------
+    ValueError
+        If there are not 81 values, values which are not integers, or values outside
+        of 0-9
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells=None):
+        if cells is None:
+            cells = bytearray(81)
+        elif not isinstance(cells, bytearray):
+            if isinstance(cells, (bytes, memoryview)):
+                cells = bytearray(cells)
+            else:
+                values = np.asarray(cells)
+                # Floats would be truncated silently by the conversion to bytes
+                if values.size and not np.issubdtype(values.dtype, np.integer):
+                    raise ValueError("Sudoku must only contain integer values")
+                if values.size and (values.min() < 0 or values.max() > 9):
+                    raise ValueError("Sudoku must only contain values from 0-9")
+                cells = bytearray(values.astype(np.uint8).tobytes())
+        if len(cells) != 81:
+            raise ValueError("Board must have 81 cells")
+        if max(cells) > 9:
+            raise ValueError("Sudoku must only contain values from 0-9")
+        self.cells = cells
+
+    @classmethod
+    def from_array(cls, sudoku_board) -> "Board":
+        """
+        Returns a board with the values of a 9x9 array (or list of lists).
+        """
+        if np.shape(sudoku_board) != (9, 9):
+            raise ValueError("Input grid must be 9x9")
+        return cls(sudoku_board)
+
+    @classmethod
+    def from_string(cls, text: str) -> "Board":
+        """
+        Returns a board from a string of 81 digits, row by row (:code:`0` or
+        :code:`.` for empty cells), as in :code:`dataset` files.
+        """
+        if len(text) != 81:
+            raise ValueError("Board must have 81 cells")
+        digits = text.replace(".", "0")
+        if not digits.isdigit():
+            raise ValueError("Sudoku must only contain values from 0-9")
+        return cls(bytes(int(char) for char in digits))
+
+    def array(self) -> np.ndarray:
+        """
+        Returns a writable 9x9 numpy array of dtype :code:`np.uint8` sharing the
+        bytes of the board.
+        """
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(9, 9)
+
+    def to_intc(self) -> np.ndarray:
+        """
+        Returns a copy of the board as a 9x9 numpy array of dtype :code:`np.intc`,
+        as used by the solver backends.
+        """
+        return self.array().astype(np.intc)
+
+    def tolist(self) -> list[list[int]]:
+        """
+        Returns a copy of the board as a list of lists, as used by the python solvers.
+        """
+        return self.array().tolist()
+
+    def tobytes(self) -> bytes:
+        """
+        Returns the 81 values as an immutable, hashable bytes object.
+        """
+        return bytes(self.cells)
+
+    def to_string(self) -> str:
+        """
+        Returns the board as a string of 81 digits (inverse of :code:`from_string()`).
+        """
+        return "".join(map(str, self.cells))
+
+    def copy(self) -> "Board":
+        """
+        Returns a copy of the board which does not share its bytes.
+        """
+        return Board(bytearray(self.cells))
+
+    def n_filled(self) -> int:
+        """
+        Returns the number of filled cells.
+        """
+        return 81 - self.cells.count(0)
+
+    @staticmethod
+    def _offset(index: tuple[int, int]) -> int:
+        """Returns the offset of cell (i, j) in the 81 bytes."""
+        i, j = index
+        # Out of range indices would otherwise wrap around to another cell
+        if not (0 <= i <= 8 and 0 <= j <= 8):
+            raise ValueError("Row and column indices must be between 0-8")
+        return i * 9 + j
+
+    def __getitem__(self, index: tuple[int, int]) -> int:
+        return self.cells[self._offset(index)]
+
+    def __setitem__(self, index: tuple[int, int], value: int):
+        if not 0 <= value <= 9:
+            raise ValueError("Sudoku must only contain values from 0-9")
+        self.cells[self._offset(index)] = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.cells == other.cells
+
+    # Boards are mutable, use tobytes() as a dictionary or set key
+    __hash__ = None
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self.cells)
+
+    def __repr__(self) -> str:
+        return f"Board({self.to_string()!r})"
@@ -0,0 +1,443 @@
+"""
+This script generates a seeded, versioned corpus of benchmark puzzles in stratified
+difficulty tiers, and reports latency percentiles and node-count distributions of
+the solver backends on it. Usage:
+:code:`python src/corpus.py generate [--seed S] [--per-tier N] [-o corpus.csv]` and
+:code:`python src/corpus.py report [-b BACKEND ...] [corpus.csv]`. By default the
+corpus in :code:`test/corpus/` is used.
+
+Tiers (every puzzle has a unique solution):
+
+| :code:`easy`: random grid with clues removed (keeping uniqueness) down to 32.
+  Most are solved by the MRV search without backtracking, so this tier mostly
+  measures the fixed cost per puzzle, but about a third need a little search.
+| :code:`medium`: as :code:`easy`, down to 28 clues (a few dozen backtracks).
+| :code:`hard`: minimal puzzles (no clue can be removed without losing
+  uniqueness).
+| :code:`seventeen`: the distinct known 17-clue puzzles of :code:`SEVENTEEN_CLUES`
+  in turn, under random validity-preserving transformations.
+| :code:`anti_backtracking`: minimal puzzles relabelled so that the solution's top
+  row reads 987654321, with the row with the fewest clues moved to the top. This is
+  the worst case for searches which try the cells in scan order and the values in
+  ascending order.
+
+Random grids are produced by applying random transformations (digit relabelling,
+row and column permutations within bands and stacks, band and stack permutations,
+transposition) to a pattern grid, so that generation only depends on the seed and
+:code:`CORPUS_VERSION`. Corpus files are CSV with :code:`tier,puzzle,solution` rows
+of 81-digit strings, preceded by a :code:`#` header recording version and seed.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+try:
+    from .backtracking_mrv import (
+        _find_empty_cell_state,
+        _order_values_state,
+        solve_backtrack_MRV,
+    )
+    from .backends import available_backends
+    from .backjumping import solve_backjump
+    from .sat import solved_SAT
+    from .trail import BoardState
+except ImportError:
+    from backtracking_mrv import (
+        _find_empty_cell_state,
+        _order_values_state,
+        solve_backtrack_MRV,
+    )
+    from backends import available_backends
+    from backjumping import solve_backjump
+    from sat import solved_SAT
+    from trail import BoardState
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+# Bump when the generator changes, so that old corpus files are not mistaken for
+# new ones
+CORPUS_VERSION = 2
+CORPUS_SEED = 2023
+TIERS = ("easy", "medium", "hard", "seventeen", "anti_backtracking")
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "test",
+    "corpus",
+    f"corpus_v{CORPUS_VERSION}.csv",
+)
+
+# Clues left in the easy and medium tiers
+TIER_CLUES = {"easy": 32, "medium": 28}
+
+# Known 17-clue puzzles with unique solutions (from Royle's list of minimum sudokus),
+# pairwise non-isomorphic
+SEVENTEEN_CLUES = (
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+    "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+    "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    "000000012300000060000040000900000500000001070020000000000350400001400800060000000",
+    "000000012400090000000000050070200000600000400000108000018000000000030700502000000",
+    "000000012500008000000700000600120000700000450000030000030000800000500700020000000",
+    "000000012700060000000000050080200000600000400000109000019000000000030800502000000",
+    "000000012980000000000600000100700080402000000000300600070000300050040000000010000",
+    "000000013000030080070000000000206000030000900000010000600500204000400700100000000",
+    "000000013000200000000000080000760200008000400010000000200000750600340000000008000",
+    "000000013000500070000802000000400900107000000000000200890000050040000600000010000",
+    "000000013000700060000508000000400800106000000000000200740000050020000400000010000",
+    "000000013020500000000000000103000070000802000004000000000340500670000200000010000",
+    "000000013040000080200060000609000400000800000000300000030100500000040706000000000",
+    "000000013040000090200070000607000400000300000000900000030100500000060807000000000",
+    "000000014000000203800050000000207000031000000000000650600000700000140000000300000",
+    "000000014000020000500000000010804000700000500000100000000050730004200000030000600",
+    "000000014008005000020000000000020705100000000000000800070000530600140000000200000",
+    "000000014700000000000500000090014000050000720000600000000900805600000900100000000",
+    "000000021000030070040080000100207000050000400000000003200100000000040500000600000",
+    "000000021000306000000800000400010600000700300200000000000090040530000000086000000",
+    "000000021000500030400600000000021000800000007500000600000400800010070000030000000",
+    "000000021005080000600000000000670300120000500400000000000201040003000000080000000",
+    "000000021090700000000000000000514000630000000000002000000600930001040000200000800",
+    "000000023000500080000100000020000900000400100580000000600009500000020070001000000",
+)
+
+PERCENTILES = (50, 90, 99, 100)
+
+
+def to_string(sudoku_board: np.ndarray) -> str:
+    """Returns a board as a string of 81 digits (row by row)."""
+    return "".join(str(int(val)) for val in np.asarray(sudoku_board).ravel())
+
+
+def from_string(digits: str) -> np.ndarray:
+    """Returns a string of 81 digits as a 2D numpy array of dtype :code:`np.intc`."""
+    return np.array([int(char) for char in digits], dtype=np.intc).reshape(9, 9)
+
+
+def random_transform(rng: np.random.Generator) -> tuple:
+    """
+    Returns a random validity-preserving transformation :code:`(rows, cols, digits,
+    transpose)` to be used with :code:`transform()`.
+    """
+    rows = np.concatenate(
+        [band * 3 + rng.permutation(3) for band in rng.permutation(3)]
+    )
+    cols = np.concatenate(
+        [stack * 3 + rng.permutation(3) for stack in rng.permutation(3)]
+    )
+    digits = np.concatenate(([0], rng.permutation(9) + 1)).astype(np.intc)
+    return rows, cols, digits, bool(rng.integers(2))
+
+
+def transform(sudoku_board: np.ndarray, rows, cols, digits, transpose) -> np.ndarray:
+    """
+    Apply a transformation to a board: reorder rows and columns, relabel values with
+    :code:`digits` (:code:`digits[0]` must be 0) and optionally transpose. Valid
+    puzzles are mapped to valid puzzles with the same number of solutions.
+    """
+    board = digits[np.asarray(sudoku_board)[np.ix_(rows, cols)]]
+    return board.T.copy() if transpose else board
+
+
+def random_grid(rng: np.random.Generator) -> np.ndarray:
+    """Returns a random completed sudoku grid."""
+    i, j = np.indices((9, 9))
+    pattern = ((i % 3) * 3 + i // 3 + j) % 9 + 1
+    return transform(pattern.astype(np.intc), *random_transform(rng))
+
+
+def _count(state: BoardState, limit: int) -> int:
+    """Count the solutions of a board state (up to limit) with MRV search."""
+    cell = _find_empty_cell_state(state, False)
+    if cell is None:
+        return 1
+    i, j = cell
+    n_solutions = 0
+    for val in _order_values_state(state, i, j, False):
+        mark = state.mark()
+        state.place(i, j, val)
+        n_solutions += _count(state, limit - n_solutions)
+        state.undo(mark)
+        if n_solutions >= limit:
+            break
+    return n_solutions
+
+
+def is_unique(sudoku_board: np.ndarray) -> bool:
+    """Returns True if the (clash-free) puzzle has exactly one solution."""
+    return _count(BoardState(np.asarray(sudoku_board).tolist()), 2) == 1
+
+
+def remove_clues(solution, rng, min_clues: int = 0) -> np.ndarray:
+    """
+    Remove clues from a completed grid in random order, skipping removals which
+    would make the solution non-unique, until :code:`min_clues` clues are left or no
+    clue can be removed (a minimal puzzle).
+    """
+    puzzle = np.array(solution, dtype=np.intc)
+    flat = puzzle.reshape(81)
+    n_clues = 81
+    for idx in rng.permutation(81):
+        if n_clues <= min_clues:
+            break
+        val = flat[idx]
+        flat[idx] = 0
+        if is_unique(puzzle):
+            n_clues -= 1
+        else:
+            flat[idx] = val
+    return puzzle
+
+
+def anti_backtracking(puzzle, solution) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Move the row with the fewest clues to the top (within its band, and its band to
+    the top), then relabel the values so that the top row of the solution reads
+    987654321.
+    """
+    top = int(np.argmin((puzzle != 0).sum(axis=1)))
+    band = range(top // 3 * 3, top // 3 * 3 + 3)
+    rows = (
+        [top] + [r for r in band if r != top] + [r for r in range(9) if r not in band]
+    )
+    cols = list(range(9))
+    moved = transform(solution, rows, cols, np.arange(10, dtype=np.intc), False)
+    digits = np.zeros(10, dtype=np.intc)
+    digits[moved[0]] = np.arange(9, 0, -1)
+    return (
+        transform(puzzle, rows, cols, digits, False),
+        transform(solution, rows, cols, digits, False),
+    )
+
+
+def generate_tier(tier: str, n: int, rng: np.random.Generator) -> list[tuple]:
+    """
+    Generate :code:`n` (puzzle, solution) pairs of a tier.
+
+    Raises
+    ---------
+    ValueError
+        If tier is unknown
+    """
+    pairs = []
+    for k in range(n):
+        if tier == "seventeen":
+            puzzle = from_string(SEVENTEEN_CLUES[k % len(SEVENTEEN_CLUES)])
+            # Solved once, the solution is carried through the transformation
+            solution = np.array(solve_backtrack_MRV(puzzle.tolist(), 0, 0))
+            trans = random_transform(rng)
+            pairs.append((transform(puzzle, *trans), transform(solution, *trans)))
+        elif tier in TIER_CLUES:
+            solution = random_grid(rng)
+            pairs.append((remove_clues(solution, rng, TIER_CLUES[tier]), solution))
+        elif tier in ("hard", "anti_backtracking"):
+            solution = random_grid(rng)
+            puzzle = remove_clues(solution, rng)
+            if tier == "anti_backtracking":
+                puzzle, solution = anti_backtracking(puzzle, solution)
+            pairs.append((puzzle, solution))
+        else:
+            raise ValueError(f"Tier must be one of {TIERS}")
+    return pairs
+
+
+def generate_corpus(seed: int = CORPUS_SEED, per_tier: int = 100) -> list[tuple]:
+    """
+    Generate the benchmark corpus. The result only depends on :code:`seed`,
+    :code:`per_tier` and :code:`CORPUS_VERSION`.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the random number generator
+    per_tier : int
+        Number of puzzles per tier
+
+    Returns
+    ---------
+    list[tuple]
+        :code:`(tier, puzzle, solution)` triples, puzzles and solutions as 2D numpy
+        arrays
+    """
+    rng = np.random.default_rng([CORPUS_VERSION, seed])
+    corpus = []
+    for tier in TIERS:
+        for puzzle, solution in generate_tier(tier, per_tier, rng):
+            corpus.append((tier, puzzle, solution))
+    return corpus
+
+
+def save_corpus(corpus: list[tuple], path: str, seed: int = CORPUS_SEED) -> None:
+    """Write a corpus to a CSV file (see module docstring for the format)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"# sudoku benchmark corpus version={CORPUS_VERSION} seed={seed}\n")
+        f.write("tier,puzzle,solution\n")
+        for tier, puzzle, solution in corpus:
+            f.write(f"{tier},{to_string(puzzle)},{to_string(solution)}\n")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list[tuple]:
+    """
+    Read a corpus written by :code:`save_corpus()`.
+
+    Raises
+    ---------
+    ValueError
+        If the corpus was generated by a different version of the generator
+    """
+    corpus = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#"):
+                fields = dict(item.split("=") for item in line.split() if "=" in item)
+                if fields.get("version") != str(CORPUS_VERSION):
+                    raise ValueError(f"Corpus must be version {CORPUS_VERSION}")
+                continue
+            if not line or line.startswith("tier,"):
+                continue
+            tier, puzzle, solution = line.split(",")
+            corpus.append((tier, from_string(puzzle), from_string(solution)))
+    return corpus
+
+
+def run_backend(sudoku_board: np.ndarray, backend: str) -> tuple:
+    """
+    Solve a copy of :code:`sudoku_board` with a backend.
+
+    Returns
+    ---------
+    tuple[float, int, np.ndarray]
+        Time taken (seconds), number of search nodes (values placed, or decisions
+        for the :code:`sat` backend) and the solved board
+
+    Raises
+    ---------
+    ValueError
+        If backend is unknown or the board cannot be solved
+    """
+    stats = {}
+    if backend == "bt_mrv":
+        board = sudoku_board.copy()
+        start_time = time.perf_counter()
+        stats = bt.solve_with_stats(board)
+        elapsed = time.perf_counter() - start_time
+        if not stats["solved"]:
+            raise ValueError("Sudoku puzzle cannot be solved.")
+        return elapsed, stats["nodes"], board
+    if backend in ("python_mrv", "python_backjump"):
+        solver = solve_backtrack_MRV if backend == "python_mrv" else solve_backjump
+        start_time = time.perf_counter()
+        result = solver(sudoku_board.tolist(), 0, 0, stats=stats)
+        elapsed = time.perf_counter() - start_time
+        if result is False:
+            raise ValueError("Sudoku puzzle cannot be solved.")
+        return elapsed, stats["nodes"], np.array(result, dtype=np.intc)
+    if backend == "sat":
+        start_time = time.perf_counter()
+        result = solved_SAT(sudoku_board, stats)
+        return time.perf_counter() - start_time, stats["decisions"], result
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def corpus_report(corpus: list[tuple], backends: list[str]) -> list[dict]:
+    """
+    Solve every puzzle of the corpus with every backend and summarise the latency
+    and node counts per tier and backend.
+
+    Returns
+    ---------
+    list[dict]
+        One result per (tier, backend) with keys :code:`"tier"`, :code:`"backend"`,
+        :code:`"n"`, :code:`"mismatches"` (solutions differing from the corpus),
+        :code:`"time"` and :code:`"nodes"` (percentiles :code:`PERCENTILES` as
+        lists)
+    """
+    results = []
+    for tier in [t for t in TIERS if any(entry[0] == t for entry in corpus)]:
+        entries = [entry for entry in corpus if entry[0] == tier]
+        for backend in backends:
+            times, nodes, mismatches = [], [], 0
+            for _, puzzle, solution in entries:
+                elapsed, n_nodes, result = run_backend(puzzle, backend)
+                times.append(elapsed)
+                nodes.append(n_nodes)
+                mismatches += not np.array_equal(result, solution)
+            results.append(
+                {
+                    "tier": tier,
+                    "backend": backend,
+                    "n": len(entries),
+                    "mismatches": mismatches,
+                    "time": np.percentile(times, PERCENTILES).tolist(),
+                    "nodes": np.percentile(nodes, PERCENTILES).tolist(),
+                }
+            )
+    return results
+
+
+def format_report(results: list[dict]) -> str:
+    """
+    Format a corpus report as a text table (times in milliseconds).
+    """
+    labels = [f"p{p}" if p < 100 else "max" for p in PERCENTILES]
+    header = (
+        f"{'tier':<18}{'backend':<16}{'n':>4}{'bad':>4}"
+        + "".join(f"{'ms ' + label:>10}" for label in labels)
+        + "".join(f"{'nodes ' + label:>12}" for label in labels)
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['tier']:<18}{r['backend']:<16}{r['n']:>4}{r['mismatches']:>4}"
+            + "".join(f"{1000 * t:>10.2f}" for t in r["time"])
+            + "".join(f"{n:>12.0f}" for n in r["nodes"])
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """
+    Parse command line arguments and generate a corpus or print a report.
+    """
+    parser = argparse.ArgumentParser(description="Sudoku benchmark corpus")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="Generate and save a corpus")
+    generate.add_argument("--seed", type=int, default=CORPUS_SEED)
+    generate.add_argument("--per-tier", type=int, default=100)
+    generate.add_argument("-o", "--output", default=CORPUS_PATH)
+    report = commands.add_parser("report", help="Report latency and node counts")
+    report.add_argument("corpus", nargs="?", default=CORPUS_PATH)
+    report.add_argument(
+        "-b",
+        "--backend",
+        action="append",
+        choices=available_backends(),
+        help="Backend to report on (repeatable, default: all available)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        corpus = generate_corpus(args.seed, args.per_tier)
+        save_corpus(corpus, args.output, args.seed)
+        print(f"Wrote {len(corpus)} puzzles to {args.output}")
+    else:
+        backends = args.backend or available_backends()
+        print(format_report(corpus_report(load_corpus(args.corpus), backends)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+This module counts the solutions of a sudoku board, which is used to prove that a
+puzzle has a unique solution (e.g. when minimising puzzles). Unlike solving, counting
+has to explore the whole MRV search tree, so :code:`count_solutions_parallel()`
+spreads the tree over several worker processes.
+
+The parallel engine balances load by work stealing: every worker searches its own
+subtree depth-first, and whenever another worker is idle it splits off the untried
+branch closest to the root of its subtree (the largest piece of remaining work) and
+puts it on a shared queue. Counting stops early once :code:`limit` solutions have
+been found.
+"""
+
+import multiprocessing
+import queue
+
+try:
+    from .backtracking import _validate_cell
+    from .backtracking_mrv import _find_empty_cell_MRV
+except ImportError:
+    from backtracking import _validate_cell
+    from backtracking_mrv import _find_empty_cell_MRV
+
+# Number of search nodes between checks of the shared state in worker processes
+CHECK_INTERVAL = 64
+
+
+def _has_conflict(sudoku_board: list[list[int]]) -> bool:
+    """
+    Check whether any of the filled cells of :code:`sudoku_board` clash with each
+    other (the search only validates the values it places itself).
+    """
+    for i in range(9):
+        for j in range(9):
+            val = sudoku_board[i][j]
+            if val != 0:
+                sudoku_board[i][j] = 0
+                valid = _validate_cell(sudoku_board, val, i, j)
+                sudoku_board[i][j] = val
+                if not valid:
+                    return True
+    return False
+
+
+def _new_frame(sudoku_board: list[list[int]], cell: tuple[int, int]) -> list:
+    """
+    Create a search frame :code:`[i, j, values]` for an empty cell, where
+    :code:`values` holds the untried valid values in reverse order (so that
+    :code:`values.pop()` returns the smallest one).
+    """
+    i, j = cell
+    values = [val for val in range(9, 0, -1) if _validate_cell(sudoku_board, val, i, j)]
+    return [i, j, values]
+
+
+def _split_work(sudoku_board: list[list[int]], stack: list) -> list[list[int]]:
+    """
+    Remove the untried branch closest to the root from :code:`stack` and return it
+    as a new board, or None if there are no untried branches.
+    """
+    for depth, (i, j, values) in enumerate(stack):
+        if values:
+            val = values.pop(0)  # last value the owner would have tried
+            board = [list(row) for row in sudoku_board]
+            for i_k, j_k, _ in stack[depth:]:
+                board[i_k][j_k] = 0  # undo assignments below the split point
+            board[i][j] = val
+            return board
+    return None
+
+
+def _add_solution(total, stop, limit: int) -> None:
+    """
+    Add a solution to the shared total of the workers, setting the stop event once
+    the limit is reached.
+    """
+    with total.get_lock():
+        total.value += 1
+        if limit is not None and total.value >= limit:
+            stop.set()
+
+
+def _count_subtree(sudoku_board: list[list[int]], limit: int, shared=None) -> int:
+    """
+    Count the solutions below :code:`sudoku_board` with an iterative MRV
+    depth-first search (:code:`sudoku_board` is used as scratch space).
+
+    When :code:`shared` is given (worker processes only), solutions are added to the
+    shared total as they are found, the search stops once the shared stop event is
+    set, and work is donated to the shared queue whenever a worker is idle.
+    """
+    if shared is not None:
+        tasks, outstanding, idle, total, stop = shared
+
+    cell = _find_empty_cell_MRV(sudoku_board, False)
+    if cell is None:
+        # Full board (the whole puzzle, or a donated subtree whose last empty cell
+        # was assigned by the split): a single solution
+        if shared is not None:
+            _add_solution(total, stop, limit)
+        return 1
+
+    count = 0
+    nodes = 0
+    stack = [_new_frame(sudoku_board, cell)]
+    while stack:
+        if shared is not None:
+            nodes += 1
+            if nodes % CHECK_INTERVAL == 0:
+                if stop.is_set():
+                    break
+                if idle.value > 0:
+                    board = _split_work(sudoku_board, stack)
+                    if board is not None:
+                        with outstanding.get_lock():
+                            outstanding.value += 1
+                        tasks.put(board)
+
+        i, j, values = stack[-1]
+        if not values:
+            sudoku_board[i][j] = 0  # backtrack
+            stack.pop()
+            continue
+
+        sudoku_board[i][j] = values.pop()
+        cell = _find_empty_cell_MRV(sudoku_board, False)
+        if cell is None:  # board is full: found a solution
+            count += 1
+            if shared is not None:
+                _add_solution(total, stop, limit)
+            elif limit is not None and count >= limit:
+                break
+            continue
+        stack.append(_new_frame(sudoku_board, cell))
+
+    return count
+
+
+def _counting_worker(tasks, outstanding, idle, total, stop, limit) -> None:
+    """
+    Worker process: repeatedly take a subtree from the shared queue and count its
+    solutions, until the stop event is set or no subtrees are left anywhere.
+    """
+    shared = (tasks, outstanding, idle, total, stop)
+    while not stop.is_set():
+        with idle.get_lock():
+            idle.value += 1
+        try:
+            board = tasks.get(timeout=0.01)
+        except queue.Empty:
+            board = None
+        with idle.get_lock():
+            idle.value -= 1
+
+        if board is None:
+            if outstanding.value == 0:
+                break  # every subtree has been counted
+            continue
+
+        _count_subtree(board, limit, shared)
+        with outstanding.get_lock():
+            outstanding.value -= 1
+
+    # Unread donated subtrees must not keep this process alive after a stop
+    tasks.cancel_join_thread()
+
+
+def count_solutions(sudoku_board: list[list[int]], limit: int = None) -> int:
+    """
+    Count the solutions of a sudoku board using backtracking with MRV heuristics.
+
+    Parameters
+    ----------
+    sudoku_board : list[list[int]]
+        List of lists (or 2D numpy array) representing sudoku board (not modified)
+    limit : int
+        Stop counting once this many solutions have been found. Counts the full
+        search tree if None.
+
+    Returns
+    ---------
+    int
+        Number of solutions, or :code:`limit` if there are at least :code:`limit`
+        solutions. 0 if the filled cells clash with each other.
+
+    Raises
+    ---------
+    ValueError
+        If limit is not positive
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("Limit must be a positive int")
+
+    board = [[int(val) for val in row] for row in sudoku_board]
+    if _has_conflict(board):
+        return 0
+    return _count_subtree(board, limit)
+
+
+def count_solutions_parallel(
+    sudoku_board: list[list[int]], limit: int = None, processes: int = None
+) -> int:
+    """
+    **Work-stealing parallel solution counting**
+
+    Count the solutions of a sudoku board in :code:`processes` worker processes.
+    The MRV search tree is split into subtrees on demand: a worker donates its
+    untried branch closest to the root to a shared queue whenever another worker
+    is idle.
+
+    Parameters
+    ----------
+    sudoku_board : list[list[int]]
+        List of lists (or 2D numpy array) representing sudoku board (not modified)
+    limit : int
+        Stop counting once this many solutions have been found. Counts the full
+        search tree if None.
+    processes : int
+        Number of worker processes. Defaults to :code:`os.cpu_count()`.
+
+    Returns
+    ---------
+    int
+        Number of solutions, or :code:`limit` if there are at least :code:`limit`
+        solutions. 0 if the filled cells clash with each other.
+
+    Raises
+    ---------
+    ValueError
+        If limit is not positive
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("Limit must be a positive int")
+
+    board = [[int(val) for val in row] for row in sudoku_board]
+    if _has_conflict(board):
+        return 0
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    tasks = multiprocessing.Queue()
+    outstanding = multiprocessing.Value("i", 1)  # subtrees queued or being counted
+    idle = multiprocessing.Value("i", 0)  # workers waiting for a subtree
+    total = multiprocessing.Value("q", 0)
+    stop = multiprocessing.Event()
+    tasks.put(board)
+
+    workers = [
+        multiprocessing.Process(
+            target=_counting_worker,
+            args=(tasks, outstanding, idle, total, stop, limit),
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    if limit is not None:
+        return min(total.value, limit)
+    return total.value
@@ -4,18 +4,291 @@ This module is a cython implementation of backtracking_mrv.py. The functions are
 same with modified type declarations for performance. A cython struct is created to
 hold the row and column indices of a cell. This is used to return a tuple of indices
 from the find_empty_cell_mrv function.
+
+As in backtracking_mrv.py, the value ordering ("natural" or least-constraining value
+"lcv") and MRV tie-breaking ("scan" or "degree") policies can be selected. The
+policies are converted to C flags once in the cpdef entry points, and search
+statistics (nodes and backtracks) are accumulated in a C struct. With
+forward_check=True, every placement is checked for domain wipeouts (a peer left
+without candidates, or a value left without a cell in a unit, as in
+backtracking_mrv.py), and such branches are abandoned at once.
+
+The rules are given by a list of units (groups of 9 cells which must contain the
+values 1-9 once each, as tables.UnitTables in python). The units of every cell, its
+peers and the cells of every unit are precomputed once per list of units into a C
+unit_tables struct, held by a UnitTables object, so the innermost loops do not need
+any block index arithmetic. Every function takes an optional UnitTables (the
+standard rows, columns and blocks, STANDARD_UNITS, if None), so sudoku variants with
+extra or irregular units (see variants.py) are solved by the same search.
+
+The search itself runs on a C search_state struct (as trail.BoardState in python):
+a copy of the board, a bitmask of the values placed in each unit, and a fixed-size
+trail (undo log) recording every change, which is rolled back to a mark on
+backtracking. The state lives on the C stack of the entry point, so no memory is
+allocated during the search, and the board is only copied back once solved.
+
+The search only touches the state struct and the read-only static tables, so it runs
+without the GIL. solve_into() releases the GIL during the search, and solve_batch()
+solves a whole (N, 9, 9) array without holding the GIL, so that several Python
+threads can solve independent boards in parallel (see threaded.py). solve_cells()
+solves a board stored as 81 bytes (e.g. a board.Board) in place.
+
+solve_restarts() is the randomised search with restarts of
+backtracking_mrv.solve_restarts(), with the same xorshift generator and restart
+policies, so both explore the same tree for a seed.
 """
+from libc.math cimport pow
+from libc.string cimport memcpy, memset
+from posix.time cimport CLOCK_MONOTONIC, clock_gettime, timespec
+
+# Available value ordering and MRV tie-breaking policies
+VALUE_ORDERS = ("natural", "lcv")
+TIE_BREAKS = ("scan", "degree")
+# Available restart policies of solve_restarts()
+RESTART_POLICIES = ("luby", "geometric")
+
 # Struct to hold row and column indices of a cell
 ctypedef struct cell_position:
     int i
     int j
 
-cpdef bint validate_cell(int[:, :] sudoku_board, int val, int i, int j):
+# Struct to accumulate search statistics
+ctypedef struct search_stats:
+    long nodes
+    long backtracks
+    long wipeouts
+
+cdef enum:
+    # Bits 1-9 set: all values are candidates
+    ALL_VALUES = 0x3FE
+    # Size limits of the unit tables: number of units, units per cell, peers per cell
+    MAX_UNITS = 64
+    MAX_CELL_UNITS = 8
+    MAX_PEERS = 80
+    # At most 1 + MAX_CELL_UNITS changes (cell and unit masks) per assigned cell on
+    # the trail
+    TRAIL_SIZE = (1 + MAX_CELL_UNITS) * 81
+    # Results of _state_load()
+    LOADED = 0
+    BAD_VALUE = 1
+    CLASHING_GIVENS = 2
+
+# Unit tables: flat indices of the cells of every unit, units of every cell and
+# flat indices of the peers of every cell (the other cells of its units, in unit
+# order)
+ctypedef struct unit_tables:
+    int n_units
+    int unit_cell[MAX_UNITS][9]
+    int n_cell_units[81]
+    int cell_unit[81][MAX_CELL_UNITS]
+    int n_peers[81]
+    int peer_cell[81][MAX_PEERS]
+
+# Trail entry: address of a changed int and its old value
+ctypedef struct trail_entry:
+    int* addr
+    int old
+
+# Search state: board cells (flat), bitmask of the values placed in each unit and the
+# trail of changes (top is the number of entries)
+ctypedef struct search_state:
+    int cells[81]
+    int unit_used[MAX_UNITS]
+    trail_entry trail[TRAIL_SIZE]
+    int top
+
+# Number of set bits of every candidate mask
+cdef int N_BITS[1024]
+
+
+cdef void _init_bit_counts():
+    """
+    Fill the N_BITS table.
+    """
+    cdef int k
+    for k in range(1, 1024):
+        N_BITS[k] = N_BITS[k >> 1] + (k & 1)
+
+
+_init_bit_counts()
+
+
+cdef int _fill_tables(unit_tables* tables, tuple units) except -1:
+    """
+    Fill a unit_tables struct from a tuple of units (tuples of 9 flat indices).
+    """
+    cdef int n_units = len(units)
+    if n_units > MAX_UNITS:
+        raise ValueError(f"At most {MAX_UNITS} units are supported")
+    cdef int u, m, k, n, cell, peer
+    tables.n_units = n_units
+    for cell in range(81):
+        tables.n_cell_units[cell] = 0
+        tables.n_peers[cell] = 0
+    for u in range(n_units):
+        unit = units[u]
+        if len(unit) != 9 or len(set(unit)) != 9 or min(unit) < 0 or max(unit) > 80:
+            raise ValueError("Each unit must consist of 9 distinct cells (0-80)")
+        for m in range(9):
+            cell = unit[m]
+            if tables.n_cell_units[cell] == MAX_CELL_UNITS:
+                raise ValueError(f"A cell can be in at most {MAX_CELL_UNITS} units")
+            tables.unit_cell[u][m] = cell
+            tables.cell_unit[cell][tables.n_cell_units[cell]] = u
+            tables.n_cell_units[cell] += 1
+    for cell in range(81):
+        for k in range(tables.n_cell_units[cell]):
+            u = tables.cell_unit[cell][k]
+            for m in range(9):
+                peer = tables.unit_cell[u][m]
+                if peer == cell:
+                    continue
+                for n in range(tables.n_peers[cell]):
+                    if tables.peer_cell[cell][n] == peer:
+                        break
+                else:
+                    tables.peer_cell[cell][tables.n_peers[cell]] = peer
+                    tables.n_peers[cell] += 1
+    return 0
+
+
+cdef class UnitTables:
+    """
+    Precomputed C lookup tables of a list of units, to be passed to the solver
+    functions (as tables.UnitTables in python). Build it once per sudoku variant.
+
+    Parameters
+    -----------
+    units : sequence
+        Units as sequences of 9 flat cell indices (i * 9 + j)
+
+    Raises
+    -------
+    ValueError
+        If a unit does not consist of 9 distinct cells, there are more than
+        MAX_UNITS units or a cell is in more than MAX_CELL_UNITS units
+    """
+
+    cdef unit_tables tables
+    cdef readonly tuple units
+
+    def __init__(self, units):
+        units = tuple(tuple(int(cell) for cell in unit) for unit in units)
+        _fill_tables(&self.tables, units)
+        self.units = units
+
+    def __len__(self):
+        return self.tables.n_units
+
+
+def _standard_units():
+    """
+    Rows, columns and blocks as flat indices (as UNITS in tables.py).
+    """
+    rows = [[i * 9 + j for j in range(9)] for i in range(9)]
+    cols = [[i * 9 + j for i in range(9)] for j in range(9)]
+    boxes = [
+        [(b_i + i) * 9 + b_j + j for i in range(3) for j in range(3)]
+        for b_i in range(0, 9, 3)
+        for b_j in range(0, 9, 3)
+    ]
+    return rows + cols + boxes
+
+
+cdef UnitTables _STANDARD = UnitTables(_standard_units())
+# Standard sudoku rules, used when no unit tables are given
+STANDARD_UNITS = _STANDARD
+cdef unit_tables* STANDARD_TABLES = &_STANDARD.tables
+
+# The search functions are fused over the rules: they are compiled once for general
+# unit tables and once for the standard rules, which use fixed-size static copies of
+# the standard tables (constant loop bounds and static addresses are measurably
+# faster in the innermost loops). standard_rules is only a marker type.
+ctypedef struct standard_rules:
+    int unused
+
+ctypedef fused rules:
+    standard_rules
+    unit_tables
+
+cdef standard_rules STANDARD_RULES
+cdef int CELL_UNIT[81][3]
+cdef int PEER_CELL[81][20]
+cdef int UNIT_CELL[27][9]
+
+
+cdef void _init_standard_tables():
+    """
+    Fill the CELL_UNIT, PEER_CELL and UNIT_CELL tables from STANDARD_TABLES.
+    """
+    cdef int cell, k, u
+    for cell in range(81):
+        for k in range(3):
+            CELL_UNIT[cell][k] = STANDARD_TABLES.cell_unit[cell][k]
+        for k in range(20):
+            PEER_CELL[cell][k] = STANDARD_TABLES.peer_cell[cell][k]
+    for u in range(27):
+        for k in range(9):
+            UNIT_CELL[u][k] = STANDARD_TABLES.unit_cell[u][k]
+
+
+_init_standard_tables()
+
+
+cdef inline unit_tables* _tables(UnitTables units):
+    """
+    C tables of units, or of the standard rules if units is None.
+    """
+    if units is None:
+        return STANDARD_TABLES
+    return &units.tables
+
+
+cdef bint _lcv_flag(str value_order) except -1:
+    """
+    Convert value ordering policy into a C flag (1 for "lcv", 0 for "natural").
+    """
+    if value_order not in VALUE_ORDERS:
+        raise ValueError(f"Value ordering policy must be one of {VALUE_ORDERS}")
+    return value_order == "lcv"
+
+
+cdef bint _degree_flag(str tie_break) except -1:
+    """
+    Convert tie-breaking policy into a C flag (1 for "degree", 0 for "scan").
+    """
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Tie-breaking policy must be one of {TIE_BREAKS}")
+    return tie_break == "degree"
+
+cdef bint _validate_cell(
+    int[:, :] sudoku_board, int val, int i, int j, const unit_tables* units
+):
+    """
+    C implementation of validate_cell() taking the C unit tables.
+    """
+
+    # Check cell itself and its peers using precomputed tables
+    if sudoku_board[i, j] == val:
+        return False
+    cdef int cell = i * 9 + j
+    cdef int k, peer
+    for k in range(units.n_peers[cell]):
+        peer = units.peer_cell[cell][k]
+        if sudoku_board[peer // 9, peer % 9] == val:
+            return False
+    return True
+
+
+cpdef bint validate_cell(
+    int[:, :] sudoku_board, int val, int i, int j, UnitTables units=None
+):
     """
     Checks if given value is valid for cell[i][j] in sudoku_board.
     Validation is based on sudoku rules (each row must contain digits 1-9 without
     repetition, each column must contain digits 1-9 without repetition, and each of the
-    nine 3 x 3 sub-grids must contain digits 1-9 wihtout repetition).
+    nine 3 x 3 sub-grids must contain digits 1-9 wihtout repetition), or on the units
+    of a sudoku variant.
 
     Parameters
     -----------
@@ -27,6 +300,8 @@ cpdef bint validate_cell(int[:, :] sudoku_board, int val, int i, int j):
         Row index of cell
     j : int
         Column index of cell
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     ---------
@@ -34,28 +309,23 @@ cpdef bint validate_cell(int[:, :] sudoku_board, int val, int i, int j):
         1 (True) if value is valid according to sudoku rules, 0 (False) otherwise
     """
 
-    # Check row & column of val
-    cdef int k
-    for k in range(9):
-        if sudoku_board[i][k] == val: # Check row
-            return False
-        if sudoku_board[k][j] == val: # Check column
-            return False
+    return _validate_cell(sudoku_board, val, i, j, _tables(units))
 
-    # Get index for block (9 blocks of 3x3)
-    cdef int block_i = i // 3
-    cdef int block_j = j // 3
 
-    # Chek block of val
-    cdef int b_i, b_j
-    for b_i in range(block_i * 3, block_i * 3 + 3):
-        for b_j in range(block_j * 3, block_j * 3 + 3):
-            if sudoku_board[b_i][b_j] == val:
-                return False
-    return True
+cdef int _n_poss_vals(int[:, :] sudoku_board, int i, int j, const unit_tables* units):
+    """
+    C implementation of n_poss_vals() taking the C unit tables.
+    """
 
+    cdef int poss_vals = 0
+    cdef int val
+    for val in range(1, 10):
+        if _validate_cell(sudoku_board, val, i, j, units):
+            poss_vals += 1
+    return poss_vals
 
-cpdef int n_poss_vals(int[:, :] sudoku_board, int i, int j):
+
+cpdef int n_poss_vals(int[:, :] sudoku_board, int i, int j, UnitTables units=None):
     """
     Returns the number of possible values for a given cell in a Sudoku board.
     Uses :code:`validate_cell()` to check which numbers from 1 to 9 are valid for a
@@ -69,6 +339,8 @@ cpdef int n_poss_vals(int[:, :] sudoku_board, int i, int j):
         Row index of cell to be checked
     j : int
         Column index of cell to be checked
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     ----------
@@ -76,35 +348,65 @@ cpdef int n_poss_vals(int[:, :] sudoku_board, int i, int j):
             Numbe of possible values for the given cell.
     """
 
-    cdef int poss_vals = 0
-    cdef int val
-    for val in range(1, 10):
-        if validate_cell(sudoku_board, val, i, j):
-            poss_vals += 1
-    return poss_vals
+    return _n_poss_vals(sudoku_board, i, j, _tables(units))
+
+
+cdef int _n_unfilled_peers(
+    int[:, :] sudoku_board, int i, int j, const unit_tables* units
+):
+    """
+    C implementation of n_unfilled_peers() taking the C unit tables.
+    """
 
+    cdef int unfilled = 0
+    cdef int cell = i * 9 + j
+    cdef int k, peer
+    for k in range(units.n_peers[cell]):
+        peer = units.peer_cell[cell][k]
+        if sudoku_board[peer // 9, peer % 9] == 0:
+            unfilled += 1
+    return unfilled
 
 
-cpdef cell_position find_empty_cell_mrv(int[:, :] sudoku_board):
+cpdef int n_unfilled_peers(
+    int[:, :] sudoku_board, int i, int j, UnitTables units=None
+):
     """
-    Iterates through given Sudoku board and uses n_possible_values to find the cell
-    with the fewest possible values. Returns the row and column indices of that cell as
-    a tuple to be used in the backtracking algorithm. This technique is called Minimum
-    Remaining Values (MRV).
+    Returns the number of unfilled peers (empty cells sharing a row, column or 3 x 3
+    sub-grid with cell[i][j], excluding the cell itself). Used by the degree
+    tie-breaking heuristic.
 
     Parameters
     -----------
     sudoku_board : int[:, :]
         two-dimensional c array representing sudoku board
+    i : int
+        Row index of cell
+    j : int
+        Column index of cell
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     ----------
-    min_cell : cell_position struct
-        Row and column indices of the cell with the fewest possible values.
+        int:
+            Number of unfilled peers of the given cell.
+    """
+
+    return _n_unfilled_peers(sudoku_board, i, j, _tables(units))
+
+
+cdef cell_position _find_empty_cell(
+    int[:, :] sudoku_board, bint degree, const unit_tables* units
+):
+    """
+    C implementation of find_empty_cell_mrv() taking the tie-breaking policy as a
+    C flag.
     """
 
     cdef int min_poss_vals = 10
-    cdef int poss_vals
+    cdef int max_degree = -1
+    cdef int poss_vals, cell_degree
     cdef int i, j
     # Initialise to invalid values (instead of None in python)
     cdef int min_i = -1
@@ -112,12 +414,21 @@ cpdef cell_position find_empty_cell_mrv(int[:, :] sudoku_board):
 
     for i in range(9):
         for j in range(9):
-            if sudoku_board[i][j] == 0:
-                poss_vals = n_poss_vals(sudoku_board, i, j)
+            if sudoku_board[i, j] == 0:
+                poss_vals = _n_poss_vals(sudoku_board, i, j, units)
                 if poss_vals < min_poss_vals:
                     min_poss_vals = poss_vals
                     min_i = i
                     min_j = j
+                    if degree:
+                        max_degree = _n_unfilled_peers(sudoku_board, i, j, units)
+                elif poss_vals == min_poss_vals and degree:
+                    # Break tie with degree heuristic (most unfilled peers)
+                    cell_degree = _n_unfilled_peers(sudoku_board, i, j, units)
+                    if cell_degree > max_degree:
+                        max_degree = cell_degree
+                        min_i = i
+                        min_j = j
 
     # Use c struct to return python-type tuple
     cdef cell_position min_cell
@@ -126,7 +437,571 @@ cpdef cell_position find_empty_cell_mrv(int[:, :] sudoku_board):
 
     return min_cell
 
-cpdef bint solve_backtrack_MRV(int[:, :] sudoku_board, int i, int j):
+
+cpdef cell_position find_empty_cell_mrv(
+    int[:, :] sudoku_board, str tie_break="scan", UnitTables units=None
+):
+    """
+    Iterates through given Sudoku board and uses n_possible_values to find the cell
+    with the fewest possible values. Returns the row and column indices of that cell as
+    a tuple to be used in the backtracking algorithm. This technique is called Minimum
+    Remaining Values (MRV). Ties are broken by scan order ("scan") or by choosing the
+    cell with the most unfilled peers ("degree").
+
+    Parameters
+    -----------
+    sudoku_board : int[:, :]
+        two-dimensional c array representing sudoku board
+    tie_break : str
+        Tie-breaking policy, one of TIE_BREAKS
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+
+    Returns
+    ----------
+    min_cell : cell_position struct
+        Row and column indices of the cell with the fewest possible values.
+    """
+
+    return _find_empty_cell(sudoku_board, _degree_flag(tie_break), _tables(units))
+
+
+cdef int _order_values(
+    int[:, :] sudoku_board,
+    int i,
+    int j,
+    bint lcv,
+    int* values,
+    const unit_tables* units,
+):
+    """
+    C implementation of order_values(). Writes the valid values for cell[i][j] into
+    values (in the order they should be tried) and returns the number of values.
+    """
+
+    cdef int n_vals = 0
+    cdef int val
+    for val in range(1, 10):
+        if _validate_cell(sudoku_board, val, i, j, units):
+            values[n_vals] = val
+            n_vals += 1
+    if not lcv or n_vals < 2:
+        return n_vals
+
+    # Count the unfilled peers each value would constrain
+    cdef int n_constrained[9]
+    cdef int cell = i * 9 + j
+    cdef int k, m, p_i, p_j, count
+    for k in range(n_vals):
+        val = values[k]
+        count = 0
+        for m in range(units.n_peers[cell]):
+            p_i = units.peer_cell[cell][m] // 9
+            p_j = units.peer_cell[cell][m] % 9
+            if (
+                sudoku_board[p_i, p_j] == 0
+                and _validate_cell(sudoku_board, val, p_i, p_j, units)
+            ):
+                count += 1
+        n_constrained[k] = count
+
+    # Stable insertion sort of values by number of constrained peers
+    cdef int key_val, key_count
+    for k in range(1, n_vals):
+        key_val = values[k]
+        key_count = n_constrained[k]
+        m = k - 1
+        while m >= 0 and n_constrained[m] > key_count:
+            values[m + 1] = values[m]
+            n_constrained[m + 1] = n_constrained[m]
+            m -= 1
+        values[m + 1] = key_val
+        n_constrained[m + 1] = key_count
+    return n_vals
+
+
+cpdef list order_values(
+    int[:, :] sudoku_board,
+    int i,
+    int j,
+    str value_order="natural",
+    UnitTables units=None,
+):
+    """
+    Returns the valid values for cell[i][j] in the order they should be tried:
+    ascending ("natural") or least-constraining value first ("lcv").
+
+    Parameters
+    -----------
+    sudoku_board : int[:, :]
+        two-dimensional c array representing sudoku board
+    i : int
+        Row index of cell
+    j : int
+        Column index of cell
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+
+    Returns
+    ----------
+    list
+        Valid values for the given cell, in the order they should be tried.
+    """
+
+    cdef int values[9]
+    cdef int n_vals = _order_values(
+        sudoku_board, i, j, _lcv_flag(value_order), values, _tables(units)
+    )
+    return [values[k] for k in range(n_vals)]
+
+
+cdef int _state_init(
+    search_state* state, int[:, :] sudoku_board, const unit_tables* units
+) except -1:
+    """
+    Initialise a search state (cells, unit masks of the units and empty trail) from
+    a board. Raises ValueError if a cell is outside 0-9; returns 0 if two givens of
+    a unit clash (the board cannot be solved) and 1 otherwise.
+    """
+    cdef int cells[81]
+    cdef int cell
+    for cell in range(81):
+        cells[cell] = sudoku_board[cell // 9, cell % 9]
+    cdef int loaded = _state_load(state, cells, units)
+    if loaded == BAD_VALUE:
+        raise ValueError('Sudoku must only contain values from 0-9')
+    return loaded == LOADED
+
+
+cdef void _state_store(search_state* state, int[:, :] sudoku_board):
+    """
+    Copy the cells of a search state back into a board.
+    """
+    cdef int cell
+    for cell in range(81):
+        sudoku_board[cell // 9, cell % 9] = state.cells[cell]
+
+
+cdef int _state_load(
+    search_state* state, const int* cells, const unit_tables* units
+) noexcept nogil:
+    """
+    _state_init() from 81 contiguous cells, without the GIL. Returns LOADED,
+    BAD_VALUE if a cell is outside 0-9 or CLASHING_GIVENS if a value is given twice
+    in a unit; the state must not be searched unless LOADED.
+    """
+    cdef int cell, k, val, unit
+    for k in range(units.n_units):
+        state.unit_used[k] = 0
+    state.top = 0
+    for cell in range(81):
+        val = cells[cell]
+        if val < 0 or val > 9:
+            return BAD_VALUE
+        state.cells[cell] = val
+        if val != 0:
+            for k in range(units.n_cell_units[cell]):
+                unit = units.cell_unit[cell][k]
+                if state.unit_used[unit] & (1 << val):
+                    return CLASHING_GIVENS
+                state.unit_used[unit] |= 1 << val
+    return LOADED
+
+
+cdef inline void _trail_set(search_state* state, int* addr, int value) noexcept nogil:
+    """
+    Set *addr = value, recording the old value on the trail.
+    """
+    state.trail[state.top].addr = addr
+    state.trail[state.top].old = addr[0]
+    state.top += 1
+    addr[0] = value
+
+
+cdef inline void _trail_undo(search_state* state, int mark) noexcept nogil:
+    """
+    Undo all changes made since the trail had mark entries (most recent first).
+    """
+    while state.top > mark:
+        state.top -= 1
+        state.trail[state.top].addr[0] = state.trail[state.top].old
+
+
+cdef inline int _candidates(search_state* state, rules* units, int cell) noexcept nogil:
+    """
+    Bitmask of the values not yet placed in the units of cell.
+    """
+    cdef int used = 0
+    cdef int k
+    if rules is standard_rules:
+        return ALL_VALUES & ~(
+            state.unit_used[CELL_UNIT[cell][0]]
+            | state.unit_used[CELL_UNIT[cell][1]]
+            | state.unit_used[CELL_UNIT[cell][2]]
+        )
+    else:
+        for k in range(units.n_cell_units[cell]):
+            used |= state.unit_used[units.cell_unit[cell][k]]
+        return ALL_VALUES & ~used
+
+
+cdef inline int _peers(rules* units, int cell, const int** peers) noexcept nogil:
+    """
+    Set peers to the flat indices of the peers of cell and return their number.
+    """
+    if rules is standard_rules:
+        peers[0] = PEER_CELL[cell]
+        return 20
+    else:
+        peers[0] = units.peer_cell[cell]
+        return units.n_peers[cell]
+
+
+cdef inline int _cell_units(rules* units, int cell, const int** cell_units) noexcept nogil:
+    """
+    Set cell_units to the indices of the units of cell and return their number.
+    """
+    if rules is standard_rules:
+        cell_units[0] = CELL_UNIT[cell]
+        return 3
+    else:
+        cell_units[0] = units.cell_unit[cell]
+        return units.n_cell_units[cell]
+
+
+cdef inline void _place(search_state* state, rules* units, int cell, int val) noexcept nogil:
+    """
+    Place val in cell, recording the changes to the cell and unit masks on the trail.
+    """
+    cdef int k, u
+    _trail_set(state, &state.cells[cell], val)
+    if rules is standard_rules:
+        for k in range(3):
+            u = CELL_UNIT[cell][k]
+            _trail_set(state, &state.unit_used[u], state.unit_used[u] | (1 << val))
+    else:
+        for k in range(units.n_cell_units[cell]):
+            u = units.cell_unit[cell][k]
+            _trail_set(state, &state.unit_used[u], state.unit_used[u] | (1 << val))
+
+
+cdef bint _unit_sees(search_state* state, rules* units, int u, int values) noexcept nogil:
+    """
+    True if every value of the bitmask values is placed in unit u or is still a
+    candidate of one of its empty cells.
+    """
+    cdef const int* unit
+    if rules is standard_rules:
+        unit = UNIT_CELL[u]
+    else:
+        unit = units.unit_cell[u]
+    cdef int seen = state.unit_used[u]
+    cdef int m, c
+    for m in range(9):
+        if seen & values == values:
+            return True
+        c = unit[m]
+        if state.cells[c] == 0:
+            seen |= _candidates(state, units, c)
+    return seen & values == values
+
+
+cdef bint _wiped_out(search_state* state, rules* units, int cell) noexcept nogil:
+    """
+    Forward checking after placing a value in cell: True if an empty peer of cell
+    has no candidates left, or a value missing from a unit has no empty cell of the
+    unit left to go to. Only the units which the placement can change are checked
+    (there was no wipeout before it): the units of cell, which lose its other
+    candidates, and the units of its empty peers, which can only lose the placed
+    value.
+    """
+    cdef const int* own
+    cdef int n_own = _cell_units(units, cell, &own)
+    cdef unsigned char checked[MAX_UNITS]
+    memset(checked, 0, sizeof(checked))
+    cdef int k, m, u
+    for k in range(n_own):
+        checked[own[k]] = 1
+        if not _unit_sees(state, units, own[k], ALL_VALUES):
+            return True
+    cdef int bit = 1 << state.cells[cell]
+    cdef const int* peers
+    cdef int n_peers = _peers(units, cell, &peers)
+    cdef const int* peer_units
+    cdef int n_peer_units, peer
+    for k in range(n_peers):
+        peer = peers[k]
+        if state.cells[peer] == 0:
+            if _candidates(state, units, peer) == 0:
+                return True
+            n_peer_units = _cell_units(units, peer, &peer_units)
+            for m in range(n_peer_units):
+                u = peer_units[m]
+                if not checked[u]:
+                    checked[u] = 1
+                    if not _unit_sees(state, units, u, bit):
+                        return True
+    return False
+
+
+cdef bint _has_wipeout(search_state* state, rules* units) noexcept nogil:
+    """
+    True if an empty cell has no candidates, or a value missing from a unit has no
+    empty cell of the unit left to go to (checks the whole board, before the search
+    with forward checking).
+    """
+    cdef int cell, u, n_units
+    for cell in range(81):
+        if state.cells[cell] == 0 and _candidates(state, units, cell) == 0:
+            return True
+    if rules is standard_rules:
+        n_units = 27
+    else:
+        n_units = units.n_units
+    for u in range(n_units):
+        if not _unit_sees(state, units, u, ALL_VALUES):
+            return True
+    return False
+
+
+cdef int _unfilled_state(search_state* state, rules* units, int cell) noexcept nogil:
+    """
+    n_unfilled_peers() on a search state.
+    """
+    cdef const int* peers
+    cdef int n_peers = _peers(units, cell, &peers)
+    cdef int unfilled = 0
+    cdef int k
+    for k in range(n_peers):
+        if state.cells[peers[k]] == 0:
+            unfilled += 1
+    return unfilled
+
+
+cdef int _find_empty_state(search_state* state, rules* units, bint degree) noexcept nogil:
+    """
+    _find_empty_cell() on a search state. Returns the flat index of the chosen cell,
+    or -1 if there are no empty cells.
+    """
+    cdef int min_poss_vals = 10
+    cdef int max_degree = -1
+    cdef int min_cell = -1
+    cdef int cell, poss_vals, cell_degree
+
+    for cell in range(81):
+        if state.cells[cell] == 0:
+            poss_vals = N_BITS[_candidates(state, units, cell)]
+            if poss_vals < min_poss_vals:
+                min_poss_vals = poss_vals
+                min_cell = cell
+                if degree:
+                    max_degree = _unfilled_state(state, units, cell)
+            elif poss_vals == min_poss_vals and degree:
+                # Break tie with degree heuristic (most unfilled peers)
+                cell_degree = _unfilled_state(state, units, cell)
+                if cell_degree > max_degree:
+                    max_degree = cell_degree
+                    min_cell = cell
+    return min_cell
+
+
+cdef int _order_state(
+    search_state* state, rules* units, int cell, bint lcv, int* values
+) noexcept nogil:
+    """
+    _order_values() on a search state, using the candidate masks.
+    """
+    cdef int candidates = _candidates(state, units, cell)
+    cdef int n_vals = 0
+    cdef int val
+    for val in range(1, 10):
+        if candidates >> val & 1:
+            values[n_vals] = val
+            n_vals += 1
+    if not lcv or n_vals < 2:
+        return n_vals
+
+    # Candidate masks of the unfilled peers
+    cdef const int* peers
+    cdef int n_cell_peers = _peers(units, cell, &peers)
+    cdef int peer_masks[MAX_PEERS]
+    cdef int n_peers = 0
+    cdef int k, m, peer
+    for m in range(n_cell_peers):
+        peer = peers[m]
+        if state.cells[peer] == 0:
+            peer_masks[n_peers] = _candidates(state, units, peer)
+            n_peers += 1
+
+    # Count the unfilled peers each value would constrain
+    cdef int n_constrained[9]
+    cdef int count
+    for k in range(n_vals):
+        val = values[k]
+        count = 0
+        for m in range(n_peers):
+            count += peer_masks[m] >> val & 1
+        n_constrained[k] = count
+
+    # Stable insertion sort of values by number of constrained peers
+    cdef int key_val, key_count
+    for k in range(1, n_vals):
+        key_val = values[k]
+        key_count = n_constrained[k]
+        m = k - 1
+        while m >= 0 and n_constrained[m] > key_count:
+            values[m + 1] = values[m]
+            n_constrained[m + 1] = n_constrained[m]
+            m -= 1
+        values[m + 1] = key_val
+        n_constrained[m + 1] = key_count
+    return n_vals
+
+
+cdef bint _search(
+    search_state* state,
+    rules* units,
+    bint lcv,
+    bint degree,
+    bint fc,
+    search_stats* stats,
+) noexcept nogil:
+    """
+    Recursive backtracking search with MRV heuristic used by the cpdef entry points.
+    Changes are recorded on the trail of state and undone on backtracking. With fc
+    (forward checking), a placement which causes a domain wipeout is undone at once.
+    """
+
+    # Find empty cell
+    cdef int cell = _find_empty_state(state, units, degree)
+    if cell == -1: # No empty cells left: sudoku is solved
+        return True
+
+    # Try valid values in the order given by the value ordering policy
+    cdef int values[9]
+    cdef int n_vals = _order_state(state, units, cell, lcv, values)
+    cdef int mark = state.top
+    cdef int k
+    for k in range(n_vals):
+        _place(state, units, cell, values[k])
+        stats.nodes += 1
+        if fc and _wiped_out(state, units, cell):
+            stats.wipeouts += 1
+        elif _search(state, units, lcv, degree, fc, stats):
+            return True
+        _trail_undo(state, mark) # Backtrack
+        stats.backtracks += 1
+
+    return False # Trigger recursive backtracking
+
+
+cdef inline unsigned int _xorshift(unsigned int* rng) noexcept nogil:
+    """
+    Advance the 32-bit xorshift generator and return its new state.
+    """
+    cdef unsigned int x = rng[0]
+    x ^= x << 13
+    x ^= x >> 17
+    x ^= x << 5
+    rng[0] = x
+    return x
+
+
+cdef void _shuffle(int* values, int n_vals, unsigned int* rng) noexcept nogil:
+    """
+    Shuffle values in place (Fisher-Yates) with the xorshift generator.
+    """
+    cdef int k, r, tmp
+    for k in range(n_vals - 1, 0, -1):
+        r = _xorshift(rng) % (k + 1)
+        tmp = values[k]
+        values[k] = values[r]
+        values[r] = tmp
+
+
+cdef long long _luby(long long i) noexcept nogil:
+    """
+    i-th element (1-indexed) of the Luby sequence (as sat.luby()).
+    """
+    cdef int k
+    while True:
+        k = 1
+        while (1LL << k) - 1 < i:
+            k += 1
+        if i == (1LL << k) - 1:
+            return 1LL << (k - 1)
+        i -= (1LL << (k - 1)) - 1
+
+
+cdef int _search_random(
+    search_state* state,
+    rules* units,
+    bint degree,
+    unsigned int* rng,
+    long long* budget,
+    search_stats* stats,
+) noexcept nogil:
+    """
+    Backtracking search with MRV and random value order used by solve_restarts().
+    Returns 1 if solved, 0 if the subtree has no solution and -1 if the node budget
+    ran out.
+    """
+    cdef int cell = _find_empty_state(state, units, degree)
+    if cell == -1:
+        return 1
+
+    cdef int values[9]
+    cdef int n_vals = _order_state(state, units, cell, False, values)
+    _shuffle(values, n_vals, rng)
+    cdef int mark = state.top
+    cdef int k, result
+    for k in range(n_vals):
+        if budget[0] == 0:
+            return -1
+        budget[0] -= 1
+        _place(state, units, cell, values[k])
+        stats.nodes += 1
+        result = _search_random(state, units, degree, rng, budget, stats)
+        if result != 0:
+            return result
+        _trail_undo(state, mark)
+        stats.backtracks += 1
+
+    return 0
+
+
+cdef bint _run_search(
+    search_state* state,
+    unit_tables* units,
+    bint lcv,
+    bint degree,
+    bint fc,
+    search_stats* stats,
+) noexcept nogil:
+    """
+    _search() specialised for the standard rules if units are STANDARD_TABLES. With
+    fc, a board which already has a wipeout fails without any search.
+    """
+    if units == STANDARD_TABLES:
+        if fc and _has_wipeout(state, &STANDARD_RULES):
+            return False
+        return _search(state, &STANDARD_RULES, lcv, degree, fc, stats)
+    if fc and _has_wipeout(state, units):
+        return False
+    return _search(state, units, lcv, degree, fc, stats)
+
+
+cpdef bint solve_backtrack_MRV(
+    int[:, :] sudoku_board,
+    int i,
+    int j,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+):
     """
     Recursive backtracking algorithm with MRV heuristic. Modifies sudoku_board in place
     and returns 1 (True) if a solution is found, 0 (False) otherwise.
@@ -139,6 +1014,14 @@ cpdef bint solve_backtrack_MRV(int[:, :] sudoku_board, int i, int j):
         Row index of cell
     j : int
         Column index of cell
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     --------
@@ -146,26 +1029,77 @@ cpdef bint solve_backtrack_MRV(int[:, :] sudoku_board, int i, int j):
         1 (True) if sudoku board is solved, 0 (False) otherwise
     """
 
-    # Find empty cell
-    cdef cell_position empty_cell = find_empty_cell_mrv(sudoku_board)
-    if empty_cell.i == -1 and empty_cell.j == -1: # No empty cells left: sudoku is solved
+    cdef bint lcv = _lcv_flag(value_order)
+    cdef bint degree = _degree_flag(tie_break)
+    cdef search_stats stats = search_stats(0, 0, 0)
+    cdef search_state state
+    cdef unit_tables* tables = _tables(units)
+    if not _state_init(&state, sudoku_board, tables):
+        return False
+    if _run_search(&state, tables, lcv, degree, forward_check, &stats):
+        _state_store(&state, sudoku_board)
         return True
-    else:
-        i_e = empty_cell.i
-        j_e = empty_cell.j
+    return False
 
-    # Try all possible values for empty cell (1-9)
-    cdef int val
-    for val in range(1,10):
-        if validate_cell(sudoku_board, val, i_e, j_e):
-            sudoku_board[i_e][j_e] = val
-            if solve_backtrack_MRV(sudoku_board, i_e, j_e):
-                return True
-            sudoku_board[i_e][j_e] = 0 # Backtrack
 
-    return False # Trigger recursive backtracking
+cpdef dict solve_with_stats(
+    int[:, :] sudoku_board,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+):
+    """
+    Solve sudoku_board in place (as solve_backtrack_MRV()) and return the search
+    statistics.
+
+    Parameters
+    -----------
+    sudoku_board : int[:, :]
+        two-dimensional c array representing sudoku board
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
-cpdef int[:, :] solved_MRV(int[:, :] sudoku_board, int i, int j):
+    Returns
+    --------
+    dict
+        "solved" (bool), "nodes" (values placed), "backtracks" (values removed) and
+        "wipeouts" (placements abandoned by forward checking)
+    """
+
+    cdef bint lcv = _lcv_flag(value_order)
+    cdef bint degree = _degree_flag(tie_break)
+    cdef search_stats stats = search_stats(0, 0, 0)
+    cdef search_state state
+    cdef unit_tables* tables = _tables(units)
+    cdef bint solved = _state_init(&state, sudoku_board, tables) and _run_search(
+        &state, tables, lcv, degree, forward_check, &stats
+    )
+    if solved:
+        _state_store(&state, sudoku_board)
+    return {
+        "solved": solved,
+        "nodes": stats.nodes,
+        "backtracks": stats.backtracks,
+        "wipeouts": stats.wipeouts,
+    }
+
+
+cpdef int[:, :] solved_MRV(
+    int[:, :] sudoku_board,
+    int i,
+    int j,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+):
     """
     Wrapper function for solve_backtrack_MRV(). Returns solved sudoku board.
 
@@ -177,6 +1111,14 @@ cpdef int[:, :] solved_MRV(int[:, :] sudoku_board, int i, int j):
         Row index of cell
     j : int
         Column index of cell
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
 
     Returns
     --------
@@ -189,7 +1131,325 @@ cpdef int[:, :] solved_MRV(int[:, :] sudoku_board, int i, int j):
         If sudoku board cannot be solved.
     """
 
-    if solve_backtrack_MRV(sudoku_board, i, j):
+    if solve_backtrack_MRV(
+        sudoku_board, i, j, value_order, tie_break, forward_check, units
+    ):
         return sudoku_board
     else:
         raise ValueError('Sudoku puzzle cannot be solved.')
+
+
+cpdef int[:, :] solve_into(
+    const int[:, :] sudoku_board,
+    int[:, :] out,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+):
+    """
+    Solve sudoku_board into a caller-provided buffer, leaving sudoku_board
+    unchanged. The board is copied into out and solved there, so no arrays are
+    allocated per call (out can e.g. be a row of a preallocated (N, 9, 9) array).
+
+    Parameters
+    -----------
+    sudoku_board : const int[:, :]
+        two-dimensional c array representing sudoku board (read only)
+    out : int[:, :]
+        9x9 two-dimensional c array in which the solved board is written
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+
+    Returns
+    --------
+    int[:, :]
+        out, containing the solved sudoku board
+
+    Raises
+    -------
+    ValueError
+        If out is not 9x9 or if sudoku board cannot be solved.
+    """
+
+    if out.shape[0] != 9 or out.shape[1] != 9:
+        raise ValueError('Output buffer must be 9x9')
+    cdef bint lcv = _lcv_flag(value_order)
+    cdef bint degree = _degree_flag(tie_break)
+    out[:, :] = sudoku_board
+    cdef search_stats stats = search_stats(0, 0, 0)
+    cdef search_state state
+    cdef bint solved
+    cdef unit_tables* tables = _tables(units)
+    if _state_init(&state, out, tables):
+        with nogil:
+            solved = _run_search(&state, tables, lcv, degree, forward_check, &stats)
+    else:
+        solved = False
+    if solved:
+        _state_store(&state, out)
+        return out
+    else:
+        raise ValueError('Sudoku puzzle cannot be solved.')
+
+
+
+cpdef bint solve_cells(
+    unsigned char[::1] cells,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+) except -1:
+    """
+    Solve a board stored as 81 bytes (row by row, 0 for empty cells) in place, e.g.
+    a bytearray or the cells of a board.Board, without copying it into an int
+    array first. The GIL is released during the search.
+
+    Parameters
+    -----------
+    cells : unsigned char[::1]
+        one-dimensional c array of the 81 cells of the sudoku board
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+
+    Returns
+    --------
+    bool
+        True if the board was solved (cells is then the solved board), False
+        otherwise (cells is unchanged)
+
+    Raises
+    -------
+    ValueError
+        If cells does not have 81 values from 0-9
+    """
+
+    if cells.shape[0] != 81:
+        raise ValueError('Board must have 81 cells')
+    cdef bint lcv = _lcv_flag(value_order)
+    cdef bint degree = _degree_flag(tie_break)
+    cdef int values[81]
+    cdef int cell
+    for cell in range(81):
+        if cells[cell] > 9:
+            raise ValueError('Sudoku must only contain values from 0-9')
+        values[cell] = cells[cell]
+    cdef search_stats stats = search_stats(0, 0, 0)
+    cdef search_state state
+    cdef bint solved
+    cdef unit_tables* tables = _tables(units)
+    with nogil:
+        solved = _state_load(&state, values, tables) == LOADED and _run_search(
+            &state, tables, lcv, degree, forward_check, &stats
+        )
+        if solved:
+            for cell in range(81):
+                cells[cell] = <unsigned char>state.cells[cell]
+    return solved
+
+cpdef dict solve_restarts(
+    int[:, :] sudoku_board,
+    seed=0,
+    str restart="luby",
+    long long base=100,
+    double factor=1.5,
+    str tie_break="scan",
+    UnitTables units=None,
+):
+    """
+    Solve sudoku_board in place with the MRV search, trying the values of every cell
+    in a random order and restarting after the node cutoffs of a restart policy (as
+    backtracking_mrv.solve_restarts()), and return the search statistics.
+
+    Parameters
+    -----------
+    sudoku_board : int[:, :]
+        two-dimensional c array representing sudoku board
+    seed : int
+        Seed of the random value order (the same seed gives the same search)
+    restart : str
+        Restart policy, one of RESTART_POLICIES
+    base : int
+        Node cutoff of the first run (unit of the Luby sequence)
+    factor : float
+        Growth factor of the cutoff for the geometric policy (greater than 1)
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+
+    Returns
+    --------
+    dict
+        "solved" (bool), "nodes" (values placed), "backtracks" (values removed) and
+        "restarts"
+
+    Raises
+    -------
+    ValueError
+        If a policy or cutoff parameter is invalid
+    """
+
+    if restart not in RESTART_POLICIES:
+        raise ValueError(f"Restart policy must be one of {RESTART_POLICIES}")
+    if base < 1:
+        raise ValueError("Base cutoff must be positive")
+    if factor <= 1:
+        raise ValueError("Geometric factor must be greater than 1")
+    cdef bint degree = _degree_flag(tie_break)
+    cdef bint luby = restart == "luby"
+    # xorshift needs a non-zero state
+    cdef unsigned int rng = <unsigned int>(seed & 0xFFFFFFFF)
+    if rng == 0:
+        rng = 0x9E3779B9
+    cdef search_stats stats = search_stats(0, 0, 0)
+    cdef search_state state
+    cdef long long budget
+    cdef long long k = 0
+    cdef long restarts = 0
+    cdef int result
+    cdef unit_tables* tables = _tables(units)
+    if not _state_init(&state, sudoku_board, tables):
+        return {"solved": False, "nodes": 0, "backtracks": 0, "restarts": 0}
+    with nogil:
+        while True:
+            k += 1
+            if luby:
+                budget = base * _luby(k)
+            else:
+                budget = <long long>min(base * pow(factor, k - 1), 1e18)
+            if tables == STANDARD_TABLES:
+                result = _search_random(
+                    &state, &STANDARD_RULES, degree, &rng, &budget, &stats
+                )
+            else:
+                result = _search_random(&state, tables, degree, &rng, &budget, &stats)
+            if result != -1:
+                break
+            _trail_undo(&state, 0)
+            restarts += 1
+    if result == 1:
+        _state_store(&state, sudoku_board)
+    return {
+        "solved": result == 1,
+        "nodes": stats.nodes,
+        "backtracks": stats.backtracks,
+        "restarts": restarts,
+    }
+
+
+cdef inline double _monotonic() noexcept nogil:
+    """
+    Seconds on the monotonic clock (the clock of time.perf_counter() on Linux).
+    """
+    cdef timespec now
+    clock_gettime(CLOCK_MONOTONIC, &now)
+    return now.tv_sec + 1e-9 * now.tv_nsec
+
+
+cpdef int solve_batch(
+    const int[:, :, ::1] boards,
+    int[:, :, ::1] out,
+    unsigned char[::1] status,
+    str value_order="natural",
+    str tie_break="scan",
+    bint forward_check=False,
+    UnitTables units=None,
+    dict stats=None,
+    double[::1] seconds=None,
+) except -1:
+    """
+    Solve every board of a C-contiguous (N, 9, 9) array into out, without holding
+    the GIL. The status of every board is set to 1 if it was solved and 0 otherwise
+    (the board in out is then all zeros); boards with a value outside 0-9 or
+    clashing givens are not searched and get status 0. Several threads can call
+    solve_batch() on independent boards (or disjoint slices of the same arrays) in
+    parallel.
+
+    Parameters
+    -----------
+    boards : const int[:, :, ::1]
+        three-dimensional c array of sudoku boards (read only)
+    out : int[:, :, ::1]
+        three-dimensional c array of the same shape in which the solved boards are
+        written
+    status : unsigned char[::1]
+        one-dimensional c array of length N for the status of every board
+    value_order : str
+        Value ordering policy, one of VALUE_ORDERS
+    tie_break : str
+        MRV tie-breaking policy, one of TIE_BREAKS
+    forward_check : bool
+        Abandon a branch as soon as a placement causes a domain wipeout
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None)
+    stats : dict
+        Optional dict to which the search statistics of all boards are added
+        ("nodes", "backtracks" and "wipeouts", as solve_with_stats())
+    seconds : double[::1]
+        Optional one-dimensional c array of length N in which the solve time of
+        every board (seconds) is written
+
+    Returns
+    --------
+    int
+        Number of boards which could not be solved
+
+    Raises
+    -------
+    ValueError
+        If the arrays do not have shapes (N, 9, 9), (N, 9, 9) and (N,), or seconds
+        does not have length N
+    """
+
+    cdef Py_ssize_t n = boards.shape[0]
+    if (
+        boards.shape[1] != 9 or boards.shape[2] != 9
+        or out.shape[0] != n or out.shape[1] != 9 or out.shape[2] != 9
+        or status.shape[0] != n
+    ):
+        raise ValueError('Arrays must have shapes (N, 9, 9), (N, 9, 9) and (N,)')
+    cdef bint timed = seconds is not None
+    if timed and seconds.shape[0] != n:
+        raise ValueError('Seconds array must have length N')
+    cdef bint lcv = _lcv_flag(value_order)
+    cdef bint degree = _degree_flag(tie_break)
+    cdef search_stats counts = search_stats(0, 0, 0)
+    cdef unit_tables* tables = _tables(units)
+    cdef search_state state
+    cdef int failed = 0
+    cdef Py_ssize_t k
+    cdef double start_time = 0
+    with nogil:
+        for k in range(n):
+            if timed:
+                start_time = _monotonic()
+            if _state_load(&state, &boards[k, 0, 0], tables) == LOADED and _run_search(
+                &state, tables, lcv, degree, forward_check, &counts
+            ):
+                memcpy(&out[k, 0, 0], state.cells, 81 * sizeof(int))
+                status[k] = 1
+            else:
+                memset(&out[k, 0, 0], 0, 81 * sizeof(int))
+                status[k] = 0
+                failed += 1
+            if timed:
+                seconds[k] = _monotonic() - start_time
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + counts.nodes
+        stats["backtracks"] = stats.get("backtracks", 0) + counts.backtracks
+        stats["wipeouts"] = stats.get("wipeouts", 0) + counts.wipeouts
+    return failed
@@ -1,16 +1,30 @@
 """
 Setup module to compile .pyx cython file
 To compile the cython file, run: python setup.py build_ext --inplace
+
+To compile a profiling build (so that the bt_mrv functions show up in cProfile
+output, e.g. with :code:`src/main.py input.txt --profile out.prof`), set the
+BT_MRV_PROFILE environment variable:
+BT_MRV_PROFILE=1 python setup.py build_ext --inplace --force
+The profiling build enables the cython profile and linetrace directives and is
+noticeably slower, so rebuild without BT_MRV_PROFILE for production use.
 """
 
+import os
+
 from setuptools import setup
 from setuptools import Extension
 from Cython.Distutils import build_ext
 
+PROFILE = os.environ.get("BT_MRV_PROFILE", "0") == "1"
+
 ext_modules = [Extension("bt_mrv", ["bt_mrv.pyx"])]
 
 for e in ext_modules:
     e.cython_directives = {"embedsignature": True}
+    if PROFILE:
+        e.cython_directives.update({"profile": True, "linetrace": True})
+        e.define_macros = [("CYTHON_TRACE", "1")]
 
 setup(
     name="Cythonised backtracking with MRV which takes c arrays",
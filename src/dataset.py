@@ -0,0 +1,341 @@
+"""
+This script reads puzzle datasets in the widely used :code:`quizzes,solutions` CSV
+layout (one puzzle per line as two 81-digit strings, row by row, :code:`0` or
+:code:`.` for empty cells, with an optional header line) and runs them through a
+solver backend, verifying every result against the reference solution. Usage:
+:code:`python src/dataset.py sudoku.csv [--backend sat] [--limit N]`. This is the
+acceptance test for new solver builds.
+
+Rows are streamed in chunks: the lines of a chunk are joined into a single bytes
+object which is viewed with :code:`np.frombuffer()` and converted to (N, 9, 9)
+arrays with one vectorised subtraction, so parsing does not create a Python object
+per cell and memory use is bounded by the chunk size. With the :code:`bt_mrv`
+backend, every chunk is then solved by a single :code:`bt_mrv.solve_batch()` call.
+
+Long runs can be followed with :code:`--progress` (a live progress line) and
+:code:`--metrics FILE` (metrics in the Prometheus text format, rewritten every
+:code:`--metrics-interval` seconds, see the :code:`metrics` module).
+"""
+
+import argparse
+import itertools
+import time
+from typing import BinaryIO, Iterator, Union
+
+import numpy as np
+
+try:
+    from .backends import solve, available_backends, get_solver
+    from .metrics import BatchMetrics, MetricsReporter
+    from .utils import verify_solutions
+except ImportError:
+    from backends import solve, available_backends, get_solver
+    from metrics import BatchMetrics, MetricsReporter
+    from utils import verify_solutions
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+# Length of a data line without the line ending
+_LINE_LENGTH = 81 + 1 + 81
+
+
+def _row_error(message: str, row: int, line_numbers: list[int] = None) -> ValueError:
+    """Error for a malformed row, located by its line number if known."""
+    if line_numbers is None:
+        return ValueError(f"{message} (row {row})")
+    return ValueError(f"{message} (line {line_numbers[row]})")
+
+
+def parse_rows(
+    lines: list[bytes], line_numbers: list[int] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert :code:`quizzes,solutions` lines (without line endings) into arrays.
+
+    Parameters
+    ----------
+    lines : list[bytes]
+        Data lines of 163 characters each
+    line_numbers : list[int]
+        Optional line numbers of the lines in their file, used in error messages
+
+    Returns
+    ---------
+    tuple[np.ndarray, np.ndarray]
+        Puzzles and solutions as arrays of shape (N, 9, 9) and dtype :code:`np.intc`
+
+    Raises
+    ---------
+    ValueError
+        If a line does not consist of two 81-digit strings separated by a comma (the
+        message gives the line number, or the row index, of the first such line)
+    """
+    lengths = [len(line) for line in lines]
+    if any(length != _LINE_LENGTH for length in lengths):
+        row = next(k for k, length in enumerate(lengths) if length != _LINE_LENGTH)
+        raise _row_error(
+            "Each row must consist of two 81 digit strings", row, line_numbers
+        )
+    chars = np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(-1, _LINE_LENGTH)
+    bad = chars[:, 81] != ord(",")
+    if bad.any():
+        raise _row_error(
+            "Each row must consist of two 81 digit strings",
+            int(np.argmax(bad)),
+            line_numbers,
+        )
+    # "." marks an empty cell like "0"
+    digits = np.where(chars == ord("."), ord("0"), chars).astype(np.intc) - ord("0")
+    digits = np.delete(digits, 81, axis=1)
+    bad = np.any((digits < 0) | (digits > 9), axis=1)
+    if bad.any():
+        raise _row_error(
+            "Sudoku must only contain values from 0-9",
+            int(np.argmax(bad)),
+            line_numbers,
+        )
+    quizzes = np.ascontiguousarray(digits[:, :81]).reshape(-1, 9, 9)
+    solutions = np.ascontiguousarray(digits[:, 81:]).reshape(-1, 9, 9)
+    return quizzes, solutions
+
+
+def read_chunks(
+    source: Union[str, BinaryIO], chunk_size: int = 65536
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream a :code:`quizzes,solutions` CSV file in chunks. A first line which does
+    not start with a digit or :code:`.` is skipped as the header, and blank lines
+    are skipped; any other line must be a data row.
+
+    Parameters
+    ----------
+    source : str or BinaryIO
+        Path of the CSV file, or a binary stream
+    chunk_size : int
+        Maximum number of puzzles per chunk
+
+    Yields
+    ---------
+    tuple[np.ndarray, np.ndarray]
+        Puzzles and solutions of a chunk (see :code:`parse_rows()`)
+
+    Raises
+    ---------
+    ValueError
+        If chunk_size is not positive, or a row is malformed (the message gives its
+        line number, counting from 1)
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    stream = open(source, "rb") if isinstance(source, str) else source
+    line_number = 0
+    try:
+        while True:
+            lines = [
+                line.rstrip(b"\r\n") for line in itertools.islice(stream, chunk_size)
+            ]
+            if not lines:
+                break
+            numbers = list(range(line_number + 1, line_number + 1 + len(lines)))
+            line_number += len(lines)
+            # The header is the first line, if it does not start like a data row
+            if numbers[0] == 1 and not (lines[0][:1].isdigit() or lines[0][:1] == b"."):
+                numbers, lines = numbers[1:], lines[1:]
+            if not all(lines):
+                numbers = [number for number, line in zip(numbers, lines) if line]
+                lines = [line for line in lines if line]
+            if lines:
+                yield parse_rows(lines, numbers)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def load_dataset(
+    source: Union[str, BinaryIO], limit: int = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read a whole :code:`quizzes,solutions` CSV file (or its first :code:`limit`
+    puzzles) into two arrays of shape (N, 9, 9).
+    """
+    quizzes, solutions = [], []
+    n = 0
+    for chunk_quizzes, chunk_solutions in read_chunks(source):
+        quizzes.append(chunk_quizzes)
+        solutions.append(chunk_solutions)
+        n += len(chunk_quizzes)
+        if limit is not None and n >= limit:
+            break
+    if not quizzes:
+        return np.zeros((0, 9, 9), np.intc), np.zeros((0, 9, 9), np.intc)
+    return (
+        np.concatenate(quizzes)[:limit],
+        np.concatenate(solutions)[:limit],
+    )
+
+
+def solve_chunk(
+    quizzes: np.ndarray, backend: str = "bt_mrv", metrics: BatchMetrics = None
+) -> np.ndarray:
+    """
+    Solve every puzzle of an (N, 9, 9) array into a preallocated (N, 9, 9) array.
+    Puzzles which cannot be solved are left as all zeros. Every puzzle is recorded
+    in the metrics (if given), with the rest of the chunk as the queue depth. With
+    :code:`bt_mrv`, the whole chunk is solved by one :code:`bt_mrv.solve_batch()`
+    call (and recorded once, with the search nodes); the other backends solve one
+    puzzle at a time.
+
+    Raises
+    ---------
+    ValueError
+        If backend is unknown or not available
+    """
+    # Unknown or unavailable backends raise here, not as a failure of every puzzle
+    get_solver(backend)
+    solved = np.zeros(quizzes.shape, dtype=np.intc)
+    if metrics is not None:
+        metrics.set_queued(len(quizzes))
+    if backend == "bt_mrv":
+        boards = np.ascontiguousarray(quizzes, dtype=np.intc)
+        status = np.zeros(len(quizzes), dtype=np.uint8)
+        if metrics is None:
+            bt.solve_batch(boards, solved, status)
+        else:
+            stats = {}
+            seconds = np.zeros(len(quizzes))
+            failed = bt.solve_batch(
+                boards, solved, status, stats=stats, seconds=seconds
+            )
+            metrics.record(seconds, failed=failed, nodes=stats["nodes"])
+        return solved
+    for k in range(len(quizzes)):
+        start_time = time.perf_counter()
+        failed = 0
+        try:
+            solve(quizzes[k], backend, out=solved[k])
+        except ValueError:
+            solved[k] = 0
+            failed = 1
+        if metrics is not None:
+            metrics.record([time.perf_counter() - start_time], failed)
+    return solved
+
+
+def solve_and_verify(
+    source: Union[str, BinaryIO],
+    backend: str = "bt_mrv",
+    chunk_size: int = 65536,
+    limit: int = None,
+    metrics: BatchMetrics = None,
+) -> dict:
+    """
+    Solve every puzzle of a :code:`quizzes,solutions` CSV file and compare the
+    results with the reference solutions.
+
+    Parameters
+    ----------
+    source : str or BinaryIO
+        Path of the CSV file, or a binary stream
+    backend : str
+        Name of the solver backend (see :code:`backends`)
+    chunk_size : int
+        Number of puzzles read and solved at a time
+    limit : int
+        Maximum number of puzzles to solve (all if None)
+    metrics : metrics.BatchMetrics
+        Optional metrics updated after every chunk
+
+    Returns
+    ---------
+    dict
+        :code:`"n"` (puzzles solved), :code:`"mismatches"` (results differing from
+        the reference solution, including unsolved puzzles), :code:`"mismatch_rows"`
+        (their 0-based indices), :code:`"invalid"` (results which are not correct
+        solutions of their puzzle, see :code:`utils.verify_solutions()`; a result may
+        be correct but differ from the reference if the puzzle has several
+        solutions), :code:`"seconds"` (wall time including parsing)
+        and :code:`"puzzles_per_second"`
+    """
+    n = 0
+    mismatch_rows = []
+    invalid = 0
+    start = time.perf_counter()
+    for quizzes, solutions in read_chunks(source, chunk_size):
+        if limit is not None:
+            quizzes, solutions = quizzes[: limit - n], solutions[: limit - n]
+        solved = solve_chunk(quizzes, backend, metrics)
+        bad = np.flatnonzero(np.any(solved != solutions, axis=(1, 2)))
+        mismatch_rows.extend((bad + n).tolist())
+        invalid += int(np.count_nonzero(~verify_solutions(solved, quizzes)))
+        n += len(quizzes)
+        if limit is not None and n >= limit:
+            break
+    seconds = time.perf_counter() - start
+    return {
+        "n": n,
+        "mismatches": len(mismatch_rows),
+        "mismatch_rows": mismatch_rows,
+        "invalid": invalid,
+        "seconds": seconds,
+        "puzzles_per_second": n / seconds if seconds > 0 else float("inf"),
+    }
+
+
+def main():
+    """
+    Parse command line arguments, solve and verify a dataset and print the result.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve and verify a quizzes,solutions CSV dataset"
+    )
+    parser.add_argument("dataset", help="Path of the CSV file")
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=available_backends(),
+        default=available_backends()[0],
+        help="Solver backend (default: fastest available)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--limit", type=int, default=None, metavar="N")
+    parser.add_argument(
+        "--progress", action="store_true", help="Show a live progress line"
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        default=None,
+        help="Write live metrics to FILE in the Prometheus text format",
+    )
+    parser.add_argument("--metrics-interval", type=float, default=5.0, metavar="S")
+    args = parser.parse_args()
+
+    if args.progress or args.metrics is not None:
+        metrics = BatchMetrics(total=args.limit)
+        with MetricsReporter(
+            metrics, args.metrics, args.metrics_interval, progress=args.progress
+        ):
+            result = solve_and_verify(
+                args.dataset, args.backend, args.chunk_size, args.limit, metrics
+            )
+    else:
+        result = solve_and_verify(
+            args.dataset, args.backend, args.chunk_size, args.limit
+        )
+    print(
+        f"{result['n']} puzzles in {result['seconds']:.2f} s "
+        f"({result['puzzles_per_second']:.0f} puzzles/s), "
+        f"{result['mismatches']} mismatches, {result['invalid']} invalid"
+    )
+    if result["mismatches"]:
+        print(f"Mismatched rows: {result['mismatch_rows'][:20]}")
+
+
+if __name__ == "__main__":
+    main()
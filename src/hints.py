@@ -0,0 +1,253 @@
+"""
+This module contains a hint API which returns the next logically deducible placement
+for a sudoku board, together with the technique which justifies it, without running
+a backtracking search.
+
+:code:`HintState` keeps the board and a bitmask of the candidates of every cell (bit
+:code:`v` set if value :code:`v` is still possible), which is updated incrementally
+when values are placed, so consecutive hints only pay for the deduction itself. The
+techniques are tried from simplest to hardest:
+
+| :code:`"naked single"`: a cell has a single candidate left.
+| :code:`"hidden single"`: a value has a single possible cell left in a row, column
+  or block.
+| :code:`"pointing"`: the candidates for a value in a block all lie in one row (or
+  column), so the value is eliminated from the rest of that row (or column).
+| :code:`"claiming"`: the candidates for a value in a row (or column) all lie in one
+  block, so the value is eliminated from the rest of that block.
+
+Pointing and claiming only eliminate candidates. They are applied (and recorded in
+the hint) until a single appears, or no technique applies, in which case no hint is
+returned.
+"""
+
+from collections import namedtuple
+
+try:
+    from .tables import UNITS, CELL_UNITS, PEERS
+    from .trail import ALL_VALUES
+except ImportError:
+    from tables import UNITS, CELL_UNITS, PEERS
+    from trail import ALL_VALUES
+
+# Names of the units (indices as in tables.UNITS)
+UNIT_NAMES = tuple(
+    f"{kind} {k}" for kind in ("row", "column", "block") for k in range(9)
+)
+
+# For every unit, the units of the other kind (lines for a block, blocks for a line)
+# which it intersects in 3 cells
+CROSSING_UNITS = tuple(
+    tuple(
+        sorted({v for idx in UNITS[u] for v in CELL_UNITS[idx] if (v < 18) != (u < 18)})
+    )
+    for u in range(27)
+)
+
+Hint = namedtuple("Hint", ["i", "j", "value", "technique", "unit", "eliminations"])
+Hint.__doc__ = """
+Placement of :code:`value` in cell :code:`[i][j]` justified by :code:`technique` (in
+:code:`unit` for a hidden single, None for a naked single). :code:`eliminations` lists
+the pointing and claiming steps needed first, as tuples
+:code:`(technique, unit, value, cells)` where :code:`cells` are the (row, column)
+pairs from which the value was eliminated.
+"""
+
+
+class HintState:
+    """
+    Sudoku board with incrementally maintained candidate bitmasks.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board (not modified)
+
+    Attributes
+    ----------
+    board : list[int]
+        Values of the 81 cells (flat index :code:`i * 9 + j`, 0 for empty cells)
+    candidates : list[int]
+        Candidate bitmask of every cell (0 for filled cells)
+
+    Raises
+    ----------
+    ValueError
+        If the board is not 9x9
+    """
+
+    def __init__(self, sudoku_board):
+        board = [int(val) for row in sudoku_board for val in row]
+        if len(board) != 81:
+            raise ValueError("Input grid must be 9x9")
+        self._reset(board)
+
+    def _reset(self, board: list[int]) -> None:
+        """Recompute all candidates from the placed values."""
+        self.board = [0] * 81
+        self.candidates = [ALL_VALUES] * 81
+        for idx, val in enumerate(board):
+            if val != 0:
+                self._place(idx, val)
+
+    def _place(self, idx: int, val: int) -> None:
+        """Place a value and remove it from the candidates of the peers."""
+        self.board[idx] = val
+        self.candidates[idx] = 0
+        bit = ~(1 << val)
+        candidates = self.candidates
+        for peer in PEERS[idx]:
+            candidates[peer] &= bit
+
+    def place(self, i: int, j: int, val: int) -> None:
+        """
+        Place :code:`val` in cell :code:`[i][j]`, updating the candidates of its
+        peers. Placing 0 clears the cell, which recomputes all candidates (and
+        discards eliminations made by pointing and claiming).
+
+        Raises
+        ---------
+        ValueError
+            If indices or value are out of range
+        """
+        if not (0 <= i <= 8 and 0 <= j <= 8):
+            raise ValueError("Row and column indices must be between 0-8")
+        if not 0 <= val <= 9:
+            raise ValueError("Value must be between 0-9")
+        idx = i * 9 + j
+        if val == 0 or self.board[idx] != 0:
+            board = list(self.board)
+            board[idx] = val
+            self._reset(board)
+        else:
+            self._place(idx, val)
+
+    def apply(self, hint: Hint) -> None:
+        """Place the value of a hint."""
+        self.place(hint.i, hint.j, hint.value)
+
+    def _check(self) -> None:
+        """Raise a ValueError if an empty cell has no candidates left."""
+        for idx in range(81):
+            if self.board[idx] == 0 and self.candidates[idx] == 0:
+                raise ValueError("Sudoku puzzle cannot be solved.")
+
+    def _naked_single(self):
+        """Returns (cell, value) of the first cell with a single candidate."""
+        for idx, mask in enumerate(self.candidates):
+            if mask != 0 and (mask & (mask - 1)) == 0:
+                return idx, mask.bit_length() - 1
+        return None
+
+    def _hidden_single(self):
+        """Returns (cell, value, unit) of the first value with a single cell left."""
+        candidates = self.candidates
+        for u, unit in enumerate(UNITS):
+            seen_once = 0
+            seen_twice = 0
+            for idx in unit:
+                mask = candidates[idx]
+                seen_twice |= seen_once & mask
+                seen_once |= mask
+            single = seen_once & ~seen_twice
+            if single:
+                val = (single & -single).bit_length() - 1
+                for idx in unit:
+                    if candidates[idx] >> val & 1:
+                        return idx, val, u
+        return None
+
+    def _eliminate(self, technique, source, target, val):
+        """
+        If all candidates for :code:`val` in unit :code:`source` lie in unit
+        :code:`target`, remove :code:`val` from the other cells of :code:`target`
+        and return the elimination step (None if nothing was eliminated).
+        """
+        candidates = self.candidates
+        inside = [idx for idx in UNITS[source] if candidates[idx] >> val & 1]
+        if len(inside) < 2 or any(target not in CELL_UNITS[idx] for idx in inside):
+            return None
+        removed = [
+            idx
+            for idx in UNITS[target]
+            if candidates[idx] >> val & 1 and source not in CELL_UNITS[idx]
+        ]
+        if not removed:
+            return None
+        for idx in removed:
+            candidates[idx] &= ~(1 << val)
+        cells = tuple(divmod(idx, 9) for idx in removed)
+        return technique, UNIT_NAMES[source], val, cells
+
+    def _intersection_step(self):
+        """
+        Apply the first pointing or claiming elimination found and return it (None
+        if no elimination applies).
+        """
+        for val in range(1, 10):
+            for box in range(18, 27):
+                for line in CROSSING_UNITS[box]:
+                    step = self._eliminate("pointing", box, line, val)
+                    if step is not None:
+                        return step
+            for line in range(18):
+                for box in CROSSING_UNITS[line]:
+                    step = self._eliminate("claiming", line, box, val)
+                    if step is not None:
+                        return step
+        return None
+
+    def next_hint(self) -> Hint:
+        """
+        Returns the next deducible placement, or None if the board is complete or
+        no technique applies. Eliminations made by pointing and claiming are kept
+        in the candidates.
+
+        Returns
+        ---------
+        Hint
+            Placement and the technique which justifies it
+
+        Raises
+        ---------
+        ValueError
+            If an empty cell has no candidates left (the board cannot be solved)
+        """
+        eliminations = []
+        while True:
+            self._check()
+            single = self._naked_single()
+            if single is not None:
+                idx, val = single
+                i, j = divmod(idx, 9)
+                return Hint(i, j, val, "naked single", None, tuple(eliminations))
+            single = self._hidden_single()
+            if single is not None:
+                idx, val, u = single
+                i, j = divmod(idx, 9)
+                return Hint(
+                    i, j, val, "hidden single", UNIT_NAMES[u], tuple(eliminations)
+                )
+            step = self._intersection_step()
+            if step is None:
+                return None
+            eliminations.append(step)
+
+
+def next_hint(sudoku_board) -> Hint:
+    """
+    Returns the next deducible placement for :code:`sudoku_board` (see
+    :code:`HintState.next_hint()`). To get several hints in a row, keep a
+    :code:`HintState` and :code:`apply()` the hints instead.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board
+
+    Returns
+    ---------
+    Hint
+        Placement and the technique which justifies it, or None
+    """
+    return HintState(sudoku_board).next_hint()
@@ -4,7 +4,12 @@ It utilizes the backtracking algorithm with minimum remaining value (MRV) heuris
 The algorithm is from the :code:`backtracking_mrv` module and various utility functions
 from the :code:`utils` module are used to to solve sudoku puzzles. Usage:
 :code:`src/main.py input.txt` where :code:`input.txt` is the path to the file
-containing the sudoku puzzle to be solved.
+containing the sudoku puzzle to be solved. Other solver backends (see the
+:code:`backends` module) can be selected with :code:`--backend`, e.g.
+:code:`src/main.py input.txt --backend sat`. A cProfile profile of the run can be
+written with :code:`--profile out.prof`. Sudoku variants (see the :code:`variants`
+module) are selected with :code:`--variant`, e.g. :code:`--variant x` or
+:code:`--variant jigsaw --regions regions.txt`.
 
 | **Author:** William Purvis
 | **Created:** 25/11/2023
@@ -14,36 +19,67 @@ containing the sudoku puzzle to be solved.
 import sys
 import os
 import time
+import cProfile
+import pstats
 
 import argparse
 
 from utils import parse_grid, display_sudoku, validate_board, highlight_errors
-import cython.bt_mrv as bt
+from parallel import solve_parallel
+from backends import solve, BACKENDS
+from variants import VARIANTS, VARIANT_BACKENDS, get_variant
+from variants import solve as solve_variant
 
 
 def parse_arguments():
     """
     Parse command line arguments.
 
+    Only 1 input file can be passed on the CL (argparse exits with an error
+    otherwise).
+
     Returns
     ----------
         args (argparse.Namespace): Parsed command line arguments.
-
-    Raises
-    ----------
-    ValueError
-        If more than 1 argument is passed on CL.
     """
     parser = argparse.ArgumentParser(description="wp289's Sudoku Solver")
     parser.add_argument("input_file", help="Input sudoku as a text file")
+    parser.add_argument(
+        "-p",
+        "--parallel",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Solve with parallel speculative search using N worker processes",
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=BACKENDS,
+        default="bt_mrv",
+        help="Solver backend (default: bt_mrv)",
+    )
+    parser.add_argument(
+        "--variant",
+        choices=tuple(VARIANTS) + ("jigsaw",),
+        default="standard",
+        help="Sudoku variant (default: standard)",
+    )
+    parser.add_argument(
+        "--regions",
+        metavar="FILE",
+        default=None,
+        help="Region map of the jigsaw variant (9 lines of 9 region labels)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        default=None,
+        help="Write a cProfile (pstats) profile of parsing, validation, solving "
+        "and rendering to FILE",
+    )
     args = parser.parse_args()
 
-    # check only 1 input file is provided
-    if len(vars(args)) != 1:
-        raise ValueError(
-            "Invalid number of arguments. Please only upload 1 sudoku file."
-        )
-
     return args
 
 
@@ -105,6 +141,50 @@ def get_user_input():
         return False
 
 
+def run_profiled(profiler, func, *args, **kwargs):
+    """
+    Call :code:`func(*args, **kwargs)` with :code:`profiler` enabled, so that only
+    the work done by the program (and not e.g. waiting for user input) is profiled.
+
+    Parameters
+    ----------
+    profiler : cProfile.Profile
+        Profiler to enable during the call. The function is called without profiling
+        if :code:`profiler` is None.
+    func : callable
+        Function to call
+
+    Returns
+    ----------
+        Return value of :code:`func`
+    """
+    if profiler is None:
+        return func(*args, **kwargs)
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+
+
+def write_profile(profiler, filename):
+    """
+    Write the profile to :code:`filename` in pstats format (readable by
+    :code:`python -m pstats`, snakeviz, flameprof, gprof2dot, ...) and print the
+    functions with the highest cumulative time.
+
+    Parameters
+    ----------
+    profiler : cProfile.Profile
+        Profiler to write out
+    filename : str
+        Path of the output file
+    """
+    profiler.dump_stats(filename)
+    print(f"\nProfile written to {filename}. Top functions by cumulative time:")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(10)
+
+
 def main():
     """
     Main function that handles the execution of the Sudoku solver program.
@@ -123,28 +203,52 @@ def main():
             If there is an error in the input Sudoku file.
 
     """
+    profiler = None
     try:
-        input_sudoku_path = parse_arguments().input_file
+        args = parse_arguments()
+        if args.profile is not None:
+            profiler = cProfile.Profile()
+        input_sudoku_path = args.input_file
         is_valid_file(input_sudoku_path)
         # Display success message
         with open(input_sudoku_path, "r") as f:
             input_sudoku = f.read()
         # Parse input sudoku (raises error if incorrect input)
-        sudoku_board = parse_grid(input_sudoku)
+        sudoku_board = run_profiled(profiler, parse_grid, input_sudoku)
+        variant = get_variant(args.variant, args.regions)
+        if variant.name != "standard" and (
+            args.parallel is not None or args.backend not in VARIANT_BACKENDS
+        ):
+            raise ValueError(
+                f"Variants can only be solved with the backends {VARIANT_BACKENDS}"
+            )
         print(f"Uploaded sudoku:\n\n{input_sudoku}")
         if get_user_input():
             # Check if sudoku is valid
-            is_valid, invalid_cells = validate_board(sudoku_board)
+            is_valid, invalid_cells = run_profiled(
+                profiler, validate_board, sudoku_board, variant.tables
+            )
             if not is_valid:
                 print("\nInvalid sudoku!\nInvalid cells highlighted in red:\n")
                 highlight_errors(sudoku_board, invalid_cells)
                 sys.exit()
             # Solve sudoku & display time taken
             start_time = time.time()
-            solved_sudoku_array = bt.solved_MRV(sudoku_board, 0, 0)
+            if args.parallel is not None:
+                solved_sudoku_array = run_profiled(
+                    profiler, solve_parallel, sudoku_board, processes=args.parallel
+                )
+            elif variant.name != "standard":
+                solved_sudoku_array = run_profiled(
+                    profiler, solve_variant, sudoku_board, variant, args.backend
+                )
+            else:
+                solved_sudoku_array = run_profiled(
+                    profiler, solve, sudoku_board, args.backend
+                )
             end_time = time.time()
-            solved_sudoku = [list(row) for row in solved_sudoku_array]
-            print(f"Solved sudoku:\n\n{display_sudoku(solved_sudoku)}")
+            solved_str = run_profiled(profiler, display_sudoku, solved_sudoku_array)
+            print(f"Solved sudoku:\n\n{solved_str}")
             print(f"Solved in {(end_time - start_time):.4f} seconds.")
         else:
             # Exit program
@@ -154,6 +258,9 @@ def main():
         print(f"Error: {e}")
     except ValueError as e:
         print(f"Error: {e}")
+    finally:
+        if profiler is not None:
+            write_profile(profiler, args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+This module contains a parallel (speculative) version of the backtracking algorithm
+with MRV heuristics for solving a single hard sudoku on a multi-core machine.
+
+The search tree is first expanded for a few levels using :code:`find_empty_cell_MRV()`
+and :code:`validate_cell()` from :code:`backtracking_mrv`. Each board on the resulting
+frontier is an independent subproblem which is handed to a pool of worker processes.
+As soon as one worker finds a solution, the pool is terminated, which cancels all
+other (running and pending) subproblems.
+
+Workers use the cythonised :code:`bt_mrv` module when it has been compiled, and fall
+back to the pure python :code:`solve_backtrack_MRV()` otherwise.
+"""
+
+import multiprocessing
+
+import numpy as np
+
+try:
+    from .backtracking_mrv import validate_cell, find_empty_cell_MRV
+    from .backtracking_mrv import solve_backtrack_MRV
+except ImportError:
+    from backtracking_mrv import validate_cell, find_empty_cell_MRV
+    from backtracking_mrv import solve_backtrack_MRV
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+
+def expand_frontier(sudoku_board: list[list[int]], depth: int) -> list[list[list[int]]]:
+    """
+    Expand the MRV search tree of :code:`sudoku_board` breadth-first for
+    :code:`depth` levels and return the boards on the frontier. Branches which reach
+    a cell with no valid values are pruned, and boards which are already solved are
+    carried over to the next level unchanged.
+
+    Parameters
+    ----------
+    sudoku_board : list[list[int]]
+        List of lists representing sudoku board (not modified)
+    depth : int
+        Number of levels of the search tree to expand
+
+    Returns
+    ---------
+    list[list[list[int]]]
+        List of boards, one per subproblem, in the order the sequential search would
+        visit them. Empty list if the search tree dies out before :code:`depth`.
+
+    Raises
+    ---------
+    ValueError
+        If depth is negative
+    """
+    if depth < 0:
+        raise ValueError("Depth must be a non-negative int")
+
+    frontier = [[list(row) for row in sudoku_board]]
+    for _ in range(depth):
+        next_frontier = []
+        for board in frontier:
+            empty_cell = find_empty_cell_MRV(board)
+            if empty_cell is None:  # solved, nothing left to branch on
+                next_frontier.append(board)
+                continue
+            i_e, j_e = empty_cell
+            for val in range(1, 10):
+                if validate_cell(board, val, i_e, j_e):
+                    child = [list(row) for row in board]
+                    child[i_e][j_e] = val
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    return frontier
+
+
+def _solve_subproblem(sudoku_board: list[list[int]]) -> list[list[int]]:
+    """
+    Worker function: solve a single subproblem with the fastest available backend.
+    Returns the solved board as a list of lists, or None if there is no solution.
+    """
+    if bt is not None:
+        board = np.array(sudoku_board, dtype=np.intc)
+        if bt.solve_backtrack_MRV(board, 0, 0):
+            return board.tolist()
+        return None
+
+    result = solve_backtrack_MRV(sudoku_board, 0, 0)
+    if result is False:
+        return None
+    return result
+
+
+def solve_parallel(
+    sudoku_board: np.ndarray, depth: int = 2, processes: int = None
+) -> np.ndarray:
+    """
+    **Parallel speculative backtracking with MRV**
+
+    Solve a sudoku by expanding the MRV search tree :code:`depth` levels with
+    :code:`expand_frontier()` and searching the resulting subproblems in a pool of
+    :code:`processes` worker processes. The first solution found is returned and all
+    other workers are cancelled.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board (not modified)
+    depth : int
+        Number of levels of the search tree to expand before farming out subproblems
+    processes : int
+        Number of worker processes. Defaults to :code:`os.cpu_count()`.
+
+    Returns
+    ---------
+    np.ndarray
+        2D numpy array of dtype :code:`np.intc` representing solved sudoku board
+
+    Raises
+    ---------
+    ValueError
+        If sudoku board cannot be solved.
+    """
+    frontier = expand_frontier(
+        [[int(val) for val in row] for row in sudoku_board], depth
+    )
+
+    # Nothing to farm out if the tree died out or the board was solved while expanding
+    if len(frontier) == 0:
+        raise ValueError("Sudoku puzzle cannot be solved.")
+    if len(frontier) == 1 or processes == 1:
+        for board in frontier:
+            result = _solve_subproblem(board)
+            if result is not None:
+                return np.array(result, dtype=np.intc)
+        raise ValueError("Sudoku puzzle cannot be solved.")
+
+    with multiprocessing.Pool(processes) as pool:
+        for result in pool.imap_unordered(_solve_subproblem, frontier):
+            if result is not None:
+                pool.terminate()  # cancel all other subproblems
+                return np.array(result, dtype=np.intc)
+
+    raise ValueError("Sudoku puzzle cannot be solved.")
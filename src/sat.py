@@ -0,0 +1,456 @@
+"""
+This module contains a self-contained SAT backend for solving sudoku puzzles: a
+compact sudoku-to-CNF encoder and a conflict-driven clause learning (CDCL) SAT
+solver. No external SAT solver is needed.
+
+| :code:`encode_sudoku()` converts a sudoku board into CNF. Only (cell, value) pairs
+  which are not ruled out by the givens get a variable, and clauses which the givens
+  already satisfy are left out, which keeps the formula small.
+| :code:`CDCLSolver` is a CDCL solver with two watched literals per clause, first-UIP
+  clause learning with non-chronological backjumping, VSIDS decision heuristics with
+  phase saving, and Luby restarts.
+| :code:`solved_SAT()` encodes, solves and decodes a sudoku board (like
+  :code:`solved_MRV()` in the cythonised :code:`bt_mrv` module).
+
+**References:**
+
+- `Een, N. & Sorensson, N. (2003). An Extensible SAT-solver (MiniSat).
+  <http://minisat.se/downloads/MiniSat.pdf>`_
+- `Lynce, I. & Ouaknine, J. (2006). Sudoku as a SAT Problem.
+  <https://www.cs.ox.ac.uk/people/joel.ouaknine/publications/sudoku06.pdf>`_
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+try:
+    from .tables import UNITS, CELL_UNITS
+except ImportError:
+    from tables import UNITS, CELL_UNITS
+
+# Number of conflicts per unit of the Luby restart sequence
+RESTART_BASE = 100
+# Multiplier applied to the VSIDS increment after every conflict (1 / decay factor)
+VAR_INC_FACTOR = 1 / 0.95
+
+
+def luby(i: int) -> int:
+    """
+    Returns the :code:`i`-th element (1-indexed) of the Luby sequence
+    1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+
+    Parameters
+    ----------
+    i : int
+        Index of the element (starting at 1)
+
+    Returns
+    ---------
+    int
+        :code:`i`-th element of the Luby sequence
+
+    Raises
+    ---------
+    ValueError
+        If i is not positive
+    """
+    if i < 1:
+        raise ValueError("Index must be a positive int")
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def encode_sudoku(sudoku_board) -> tuple[int, list[list[int]], dict]:
+    """
+    Encode a sudoku board as a CNF formula.
+
+    Variables are only created for pairs of empty cell and value which are not ruled
+    out by a given in the same row, column or 3 x 3 sub-grid. For every empty cell
+    there is an at-least-one clause over its values and pairwise at-most-one clauses,
+    and for every unit and every value which is not given in that unit there is an
+    at-least-one clause over the cells which can take the value and pairwise
+    at-most-one clauses. If the givens clash, or leave a cell or a value in a unit
+    with no options, the formula contains the empty clause.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board
+
+    Returns
+    ---------
+    n_vars : int
+        Number of variables (variables are numbered 1 to n_vars)
+    clauses : list[list[int]]
+        Clauses as lists of non-zero ints (DIMACS convention: :code:`-v` is the
+        negation of variable :code:`v`)
+    var_map : dict
+        Mapping of variable to the (row, column, value) it represents
+    """
+    board = [[int(val) for val in row] for row in sudoku_board]
+    units = [[divmod(idx, 9) for idx in unit] for unit in UNITS]
+    clauses = []
+
+    # Values placed in each unit by the givens (clashing givens make the CNF unsat)
+    unit_values = []
+    for unit in units:
+        values = [board[i][j] for i, j in unit if board[i][j] != 0]
+        if len(values) != len(set(values)):
+            clauses.append([])
+        unit_values.append(set(values))
+
+    # One variable per candidate (cell, value) pair
+    var_of = {}
+    var_map = {}
+    for i in range(9):
+        for j in range(9):
+            if board[i][j] != 0:
+                continue
+            taken = set().union(*(unit_values[u] for u in CELL_UNITS[i * 9 + j]))
+            cell_vars = []
+            for val in range(1, 10):
+                if val not in taken:
+                    var = len(var_map) + 1
+                    var_of[(i, j, val)] = var
+                    var_map[var] = (i, j, val)
+                    cell_vars.append(var)
+            # Each cell has exactly one value
+            clauses.append(cell_vars)
+            clauses += [[-a, -b] for a, b in combinations(cell_vars, 2)]
+
+    # Each value appears exactly once in every unit
+    for unit_idx, unit in enumerate(units):
+        for val in range(1, 10):
+            if val in unit_values[unit_idx]:
+                continue
+            unit_vars = [var_of[(i, j, val)] for i, j in unit if (i, j, val) in var_of]
+            clauses.append(unit_vars)
+            clauses += [[-a, -b] for a, b in combinations(unit_vars, 2)]
+
+    return len(var_map), clauses, var_map
+
+
+class CDCLSolver:
+    """
+    Conflict-driven clause learning SAT solver.
+
+    Literals are non-zero ints (:code:`-v` is the negation of variable :code:`v`).
+    Every clause with two or more literals watches its first two literals; a clause
+    is only visited when one of its watched literals becomes false. Conflicts are
+    analysed to the first unique implication point (UIP), the learnt clause is added
+    to the formula and the search backjumps to the second highest decision level in
+    the learnt clause.
+
+    Parameters
+    ----------
+    n_vars : int
+        Number of variables (variables are numbered 1 to n_vars)
+    clauses : list[list[int]]
+        Clauses as lists of non-zero ints
+
+    Attributes
+    ----------
+    stats : dict
+        Number of :code:`"decisions"`, :code:`"propagations"`,
+        :code:`"conflicts"`, :code:`"learnt"` clauses and :code:`"restarts"`
+    """
+
+    def __init__(self, n_vars: int, clauses: list[list[int]]):
+        self.n_vars = n_vars
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * n_vars + 2)]
+        self.assigns = [0] * (n_vars + 1)  # 1 true, -1 false, 0 unassigned
+        self.level = [0] * (n_vars + 1)
+        self.reason = [None] * (n_vars + 1)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.activity = [0.0] * (n_vars + 1)
+        self.var_inc = 1.0
+        self.polarity = [False] * (n_vars + 1)
+        self.stats = {
+            "decisions": 0,
+            "propagations": 0,
+            "conflicts": 0,
+            "learnt": 0,
+            "restarts": 0,
+        }
+        self.ok = True
+        for clause in clauses:
+            self.add_clause(clause)
+
+    @staticmethod
+    def _index(lit: int) -> int:
+        """Index of a literal in the watch lists."""
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def _value(self, lit: int) -> int:
+        """Value of a literal: 1 true, -1 false, 0 unassigned."""
+        val = self.assigns[abs(lit)]
+        return val if lit > 0 else -val
+
+    def _enqueue(self, lit: int, reason) -> None:
+        """Assign a literal at the current decision level."""
+        var = abs(lit)
+        self.assigns[var] = 1 if lit > 0 else -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _attach(self, clause_idx: int) -> None:
+        """Watch the first two literals of a clause."""
+        clause = self.clauses[clause_idx]
+        self.watches[self._index(clause[0])].append(clause_idx)
+        self.watches[self._index(clause[1])].append(clause_idx)
+
+    def add_clause(self, clause: list[int]) -> bool:
+        """
+        Add a clause to the formula (only before :code:`solve()` is called).
+
+        Parameters
+        ----------
+        clause : list[int]
+            Clause as a list of non-zero ints
+
+        Returns
+        ---------
+        bool
+            False if the formula is now known to be unsatisfiable, True otherwise
+        """
+        if not self.ok:
+            return False
+        lits = []
+        for lit in clause:
+            if -lit in lits or self._value(lit) == 1:
+                return True  # tautology or already satisfied
+            if lit not in lits and self._value(lit) == 0:
+                lits.append(lit)
+
+        if len(lits) == 0:
+            self.ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self.clauses.append(lits)
+            self._attach(len(self.clauses) - 1)
+        return self.ok
+
+    def _propagate(self):
+        """
+        Unit propagation with two watched literals. Returns the index of a conflict
+        clause, or None if there is no conflict.
+        """
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            self.stats["propagations"] += 1
+            watch_list = self.watches[self._index(false_lit)]
+            kept = []
+            conflict = None
+            for k, clause_idx in enumerate(watch_list, start=1):
+                clause = self.clauses[clause_idx]
+                # Make sure the false literal is clause[1]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self._value(clause[0]) == 1:
+                    kept.append(clause_idx)  # clause already satisfied
+                    continue
+
+                # Look for a new literal to watch
+                for m in range(2, len(clause)):
+                    if self._value(clause[m]) != -1:
+                        clause[1], clause[m] = clause[m], clause[1]
+                        self.watches[self._index(clause[1])].append(clause_idx)
+                        break
+                else:
+                    kept.append(clause_idx)
+                    if self._value(clause[0]) == -1:
+                        conflict = clause_idx
+                        kept += watch_list[k:]  # keep unvisited watches
+                        break
+                    self._enqueue(clause[0], clause_idx)  # unit clause
+
+            self.watches[self._index(false_lit)] = kept
+            if conflict is not None:
+                self.qhead = len(self.trail)
+                return conflict
+        return None
+
+    def _bump(self, var: int) -> None:
+        """Increase the VSIDS activity of a variable."""
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:  # rescale to avoid overflow
+            self.activity = [act * 1e-100 for act in self.activity]
+            self.var_inc *= 1e-100
+
+    def _analyze(self, conflict: int) -> tuple[list[int], int]:
+        """
+        First-UIP conflict analysis. Returns the learnt clause (asserting literal
+        first, literal with the highest remaining level second) and the level to
+        backjump to.
+        """
+        seen = [False] * (self.n_vars + 1)
+        current_level = len(self.trail_lim)
+        learnt = [0]
+        counter = 0
+        lit = None
+        clause = self.clauses[conflict]
+        trail_idx = len(self.trail) - 1
+
+        while True:
+            for q in clause:
+                if q == lit:
+                    continue
+                var = abs(q)
+                if not seen[var] and self.level[var] > 0:
+                    seen[var] = True
+                    self._bump(var)
+                    if self.level[var] == current_level:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            # Next literal of the current level on the trail
+            while not seen[abs(self.trail[trail_idx])]:
+                trail_idx -= 1
+            lit = self.trail[trail_idx]
+            trail_idx -= 1
+            seen[abs(lit)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[abs(lit)]]
+
+        learnt[0] = -lit
+        if len(learnt) == 1:
+            return learnt, 0
+        max_k = max(range(1, len(learnt)), key=lambda k: self.level[abs(learnt[k])])
+        learnt[1], learnt[max_k] = learnt[max_k], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _backtrack(self, level: int) -> None:
+        """Undo all assignments above decision level :code:`level`."""
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = abs(lit)
+            self.polarity[var] = lit > 0  # phase saving
+            self.assigns[var] = 0
+            self.reason[var] = None
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch_var(self) -> int:
+        """Unassigned variable with the highest activity, or None if all assigned."""
+        best_var = None
+        best_act = -1.0
+        for var in range(1, self.n_vars + 1):
+            if self.assigns[var] == 0 and self.activity[var] > best_act:
+                best_var = var
+                best_act = self.activity[var]
+        return best_var
+
+    def solve(self) -> bool:
+        """
+        Run the CDCL search.
+
+        Returns
+        ---------
+        bool
+            True if the formula is satisfiable (see :code:`model()`), False otherwise
+        """
+        if not self.ok or self._propagate() is not None:
+            self.ok = False
+            return False
+
+        restart_idx = 1
+        conflict_limit = luby(restart_idx) * RESTART_BASE
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats["conflicts"] += 1
+                conflicts += 1
+                if len(self.trail_lim) == 0:
+                    self.ok = False
+                    return False
+                learnt, backjump_level = self._analyze(conflict)
+                self._backtrack(backjump_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.clauses.append(learnt)
+                    self._attach(len(self.clauses) - 1)
+                    self._enqueue(learnt[0], len(self.clauses) - 1)
+                self.stats["learnt"] += 1
+                self.var_inc *= VAR_INC_FACTOR
+                continue
+
+            if conflicts >= conflict_limit:  # Luby restart
+                self.stats["restarts"] += 1
+                self._backtrack(0)
+                restart_idx += 1
+                conflict_limit = luby(restart_idx) * RESTART_BASE
+                conflicts = 0
+                continue
+
+            var = self._pick_branch_var()
+            if var is None:
+                return True  # all variables assigned without conflict
+            self.stats["decisions"] += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(var if self.polarity[var] else -var, None)
+
+    def model(self) -> list[int]:
+        """
+        Returns the variables which are true in the satisfying assignment found by
+        :code:`solve()`.
+        """
+        return [var for var in range(1, self.n_vars + 1) if self.assigns[var] == 1]
+
+
+def solved_SAT(sudoku_board, stats: dict = None) -> np.ndarray:
+    """
+    Solve a sudoku with the built-in CDCL SAT solver. The board is encoded with
+    :code:`encode_sudoku()`, solved with :code:`CDCLSolver` and decoded again.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board (not modified)
+    stats : dict
+        Optional dictionary which is updated with the solver statistics (see
+        :code:`CDCLSolver`) and the size of the encoding (:code:`"vars"` and
+        :code:`"clauses"`)
+
+    Returns
+    ---------
+    np.ndarray
+        2D numpy array of dtype :code:`np.intc` representing solved sudoku board
+
+    Raises
+    ---------
+    ValueError
+        If sudoku board cannot be solved.
+    """
+    n_vars, clauses, var_map = encode_sudoku(sudoku_board)
+    solver = CDCLSolver(n_vars, clauses)
+    satisfiable = solver.solve()
+    if stats is not None:
+        stats.update(solver.stats, vars=n_vars, clauses=len(clauses))
+    if not satisfiable:
+        raise ValueError("Sudoku puzzle cannot be solved.")
+
+    solution = np.array(sudoku_board, dtype=np.intc)
+    for var in solver.model():
+        i, j, val = var_map[var]
+        solution[i][j] = val
+    return solution
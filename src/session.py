@@ -0,0 +1,201 @@
+"""
+This module contains an incremental solver session for interactive use, where the
+givens of a puzzle are edited a few cells at a time and the puzzle is re-solved
+after every edit.
+
+The session keeps the givens and the last solution. After an edit it first checks
+whether the last solution is still consistent with the new givens: removing a given,
+or adding the value the solution already has in that cell, needs no search at all.
+Otherwise the solution is repaired: the non-given cells of a region affected by the
+edit are cleared, and only that region is searched, with the rest of the last
+solution kept fixed. The first region is the cells holding the old or the new value
+of the edited cell (the repair is then a permutation of two digits). If it cannot be
+completed, the region is widened to the rows and columns of the cell's band and
+stack, and finally to the whole board (a search from the givens alone).
+
+| :code:`"reused"`: the last solution is still consistent, no search
+| :code:`"digits"`: the cells holding the old and new value were re-searched
+| :code:`"band"`: the 3 rows and 3 columns through the cell's block (and the cells
+  holding the old and new value) were re-searched
+| :code:`"full"`: the board was solved from the givens
+
+Note that for a puzzle with a unique solution, any new given which differs from the
+solution makes the puzzle unsolvable, which can only be shown by the full search.
+"""
+
+import numpy as np
+
+try:
+    from .backends import solve, available_backends
+    from .tables import PEERS, ROWS, COLS
+    from .utils import validate_board
+except ImportError:
+    from backends import solve, available_backends
+    from tables import PEERS, ROWS, COLS
+    from utils import validate_board
+
+
+def _band_masks() -> np.ndarray:
+    """
+    Returns boolean masks of shape (81, 81) of the band repair region (rows of the
+    cell's band and columns of its stack) of every cell.
+    """
+    band = np.zeros((81, 81), dtype=bool)
+    for idx in range(81):
+        i, j = divmod(idx, 9)
+        for k in range(3):
+            band[idx, list(ROWS[i // 3 * 3 + k])] = True
+            band[idx, list(COLS[j // 3 * 3 + k])] = True
+    return band
+
+
+_BAND = _band_masks()
+
+
+class SolverSession:
+    """
+    Incremental sudoku solver session.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing the initial givens (not
+        modified)
+    backend : str
+        Backend used for searches (see :code:`backends`). Defaults to :code:`bt_mrv`
+        if it is available and :code:`python_mrv` otherwise.
+
+    Attributes
+    ----------
+    last_mode : str
+        How the last solution was obtained: :code:`"reused"`, :code:`"digits"`,
+        :code:`"band"` or :code:`"full"` (None before the first solve)
+    stats : dict
+        Number of solutions obtained in each mode
+
+    Raises
+    ----------
+    ValueError
+        If the initial givens clash
+    """
+
+    def __init__(self, sudoku_board, backend: str = None):
+        if backend is None:
+            backend = "bt_mrv" if "bt_mrv" in available_backends() else "python_mrv"
+        self.backend = backend
+        self._givens = np.array(sudoku_board, dtype=np.intc)
+        is_valid, _ = validate_board(self._givens)
+        if not is_valid:
+            raise ValueError("Sudoku puzzle cannot be solved.")
+        self._solution = None
+        self.last_mode = None
+        self.stats = {"reused": 0, "digits": 0, "band": 0, "full": 0}
+
+    @property
+    def givens(self) -> np.ndarray:
+        """Copy of the current givens (0 for empty cells)."""
+        return self._givens.copy()
+
+    @property
+    def solution(self) -> np.ndarray:
+        """Copy of the last solution, or None if there is none."""
+        return None if self._solution is None else self._solution.copy()
+
+    def _search(self, mode: str, region: np.ndarray) -> bool:
+        """
+        Search for a solution keeping the last solution outside :code:`region` fixed
+        (the givens alone if region is None). Returns True if a solution was found.
+        """
+        if region is None:
+            board = self._givens.copy()
+        else:
+            # Clear the non-given cells of the region
+            board = self._solution.copy()
+            board.reshape(81)[region & (self._givens.reshape(81) == 0)] = 0
+        try:
+            self._solution = np.asarray(solve(board, self.backend), dtype=np.intc)
+        except ValueError:
+            return False
+        self.last_mode = mode
+        self.stats[mode] += 1
+        return True
+
+    def solve(self) -> np.ndarray:
+        """
+        Returns the solution for the current givens, searching only if there is no
+        valid last solution.
+
+        Returns
+        ---------
+        np.ndarray
+            2D numpy array representing solved sudoku board
+
+        Raises
+        ---------
+        ValueError
+            If the sudoku board cannot be solved
+        """
+        if self._solution is None and not self._search("full", None):
+            raise ValueError("Sudoku puzzle cannot be solved.")
+        return self.solution
+
+    def set_cell(self, i: int, j: int, val: int) -> np.ndarray:
+        """
+        Set the given of cell :code:`[i][j]` to :code:`val` (0 removes the given) and
+        return the solution of the edited puzzle, reusing or repairing the last
+        solution where possible.
+
+        Parameters
+        ----------
+        i : int
+            Row index of cell
+        j : int
+            Column index of cell
+        val : int
+            New given (1-9), or 0 to clear the cell
+
+        Returns
+        ---------
+        np.ndarray
+            2D numpy array representing solved sudoku board
+
+        Raises
+        ---------
+        ValueError
+            If indices or value are out of range, or if the edited puzzle cannot be
+            solved (the edit is kept, so it can be undone with another edit)
+        """
+        if not (0 <= i <= 8 and 0 <= j <= 8):
+            raise ValueError("Row and column indices must be between 0-8")
+        if not 0 <= val <= 9:
+            raise ValueError("Value must be between 0-9")
+
+        idx = i * 9 + j
+        self._givens[i, j] = val
+        flat_givens = self._givens.reshape(81)
+        if val != 0 and np.any(flat_givens[list(PEERS[idx])] == val):
+            self._solution = None  # clashing givens
+            raise ValueError("Sudoku puzzle cannot be solved.")
+
+        if self._solution is not None:
+            if val == 0 or self._solution[i, j] == val:
+                # Last solution is still consistent with the givens
+                self.last_mode = "reused"
+                self.stats["reused"] += 1
+                return self.solution
+            # Repair: search the cells holding the old or new value, then the band
+            old_val = self._solution[i, j]
+            digits = np.isin(self._solution.reshape(81), (old_val, val))
+            self._solution[i, j] = val
+            for mode, region in (("digits", digits), ("band", digits | _BAND[idx])):
+                if self._search(mode, region):
+                    return self.solution
+            self._solution = None
+
+        return self.solve()
+
+    def clear_cell(self, i: int, j: int) -> np.ndarray:
+        """
+        Remove the given of cell :code:`[i][j]` (same as :code:`set_cell(i, j, 0)`).
+        """
+        return self.set_cell(i, j, 0)
@@ -0,0 +1,317 @@
+"""
+This module contains a symmetry-aware deduplication stage for batches of sudoku
+boards. Many inputs of a batch are isomorphic: one can be turned into another by a
+validity-preserving transformation (see :code:`corpus.transform()`), i.e.
+permutations of the rows within a band, of the bands, of the columns within a stack
+and of the stacks, a transposition and a relabelling of the values. Isomorphic
+boards have isomorphic solutions, so each equivalence class only has to be solved
+once.
+
+:code:`canonical_form()` returns a representative which is the same for every member
+of a class: among all geometric transformations (transposition, row and column
+permutations), the one whose board, with the values relabelled 1, 2, 3, ... in order
+of first appearance (row by row, empty cells stay 0), is lexicographically smallest.
+It is found row by row: all column permutations are tried at once (as numpy arrays),
+and after each row only the partial transformations which give the smallest rows so
+far are kept, so the full group of 2 * 6 ** 8 transformations is never enumerated.
+The transformation is returned too, so a solution of the canonical board can be
+mapped back with :code:`untransform()`.
+
+Very sparse boards have too many symmetries to canonicalise (see
+:code:`MAX_CANDIDATES`) and are only relabelled, so isomorphic sparse boards may get
+different forms.
+
+:code:`solve_deduplicated()` canonicalises a batch, solves one board per class with
+any solver backend (or batch solver, e.g. :code:`batch.solve_batch()`) and maps the
+solution back to every member, reporting the deduplication ratio and the number of
+boards which were only relabelled.
+"""
+
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    from .backends import solve, available_backends
+except ImportError:
+    from backends import solve, available_backends
+
+Transform = namedtuple("Transform", ["transpose", "rows", "cols", "digits"])
+Transform.__doc__ = """
+Transformation of a board into its canonical form: optionally transpose the board,
+then take rows :code:`rows` and columns :code:`cols` (in that order) and relabel
+value :code:`v` as :code:`digits[v]` (:code:`digits` is a permutation of 0-9 with
+:code:`digits[0] == 0`).
+"""
+
+
+def _col_perms() -> np.ndarray:
+    """
+    Returns the 1296 validity-preserving column permutations (stack order and
+    column order within each stack) as an array of shape (1296, 9).
+    """
+    perms = []
+    for stacks in itertools.permutations(range(3)):
+        for within in itertools.product(itertools.permutations(range(3)), repeat=3):
+            perms.append([s * 3 + w for s, order in zip(stacks, within) for w in order])
+    return np.array(perms, dtype=np.intp)
+
+
+COL_PERMS = _col_perms()
+_BAND = np.arange(9) // 3
+# Base-10 weights used to compare relabelled rows as single integers
+_WEIGHTS = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+# Filled cells of a row as a 9-bit mask (first cell in the highest bit), and the mask
+# of every row under every column permutation: PERMUTED_MASKS[perm, mask]
+_BITS = 1 << np.arange(8, -1, -1)
+PERMUTED_MASKS = (
+    ((np.arange(512)[:, None] & _BITS) != 0)[:, COL_PERMS] @ _BITS
+).T.astype(np.int16)
+# Very sparse boards have so many symmetric transformations that the search would
+# keep too many partial transformations; these boards are not canonicalised
+MAX_CANDIDATES = 100_000
+
+
+def _relabel(values: np.ndarray, labels: np.ndarray, next_label: np.ndarray):
+    """
+    Relabel rows of values (shape (K, L)) in order of first appearance, extending the
+    labels (shape (K, 10)) and next free labels (shape (K,)) of every candidate in
+    place. Returns the relabelled rows.
+    """
+    out = np.empty_like(values)
+    idx = np.arange(values.shape[0])
+    for pos in range(values.shape[1]):
+        val = values[:, pos]
+        new = (val != 0) & (labels[idx, val] == 0)
+        labels[idx[new], val[new]] = next_label[new]
+        next_label += new
+        out[:, pos] = labels[idx, val]
+    return out
+
+
+def _identity_form(board: np.ndarray) -> tuple[np.ndarray, Transform]:
+    """
+    Returns the board with its values relabelled in order of first appearance and
+    the corresponding transformation (no geometric transformation). Used instead of
+    the canonical form for boards with too many symmetries: the result is still
+    isomorphic to the board, it is just not shared by the whole class.
+    """
+    labels = np.zeros((1, 10), dtype=np.intp)
+    next_label = np.ones(1, dtype=np.intp)
+    _relabel(board.reshape(1, 81).astype(np.intp), labels, next_label)
+    digits = labels[0]
+    missing = [val for val in range(1, 10) if digits[val] == 0]
+    digits[missing] = np.arange(next_label[0], 10)
+    trans = Transform(False, np.arange(9), np.arange(9), digits)
+    return transform(board, trans), trans
+
+
+def _canonical_form(sudoku_board) -> tuple[np.ndarray, Transform, bool]:
+    """
+    :code:`canonical_form()`, which also returns False as third value if the board
+    was only relabelled (too many symmetries) and True if the form is canonical.
+    """
+    board = np.asarray(sudoku_board)
+    if board.shape != (9, 9):
+        raise ValueError("Input grid must be 9x9")
+    if board.min() < 0 or board.max() > 9:
+        raise ValueError("Sudoku must only contain values from 0-9")
+    frames = np.stack([board, board.T]).astype(np.intp)
+
+    # First row: relabelled 1, 2, 3, ... whatever its values, so it only depends on
+    # which cells are filled. The smallest row has the smallest mask of filled cells.
+    masks = (frames != 0) @ _BITS
+    row_masks = PERMUTED_MASKS[:, masks.reshape(18)]
+    perm, first = np.nonzero(row_masks == row_masks.min())
+    transpose, row = np.divmod(first, 9)
+    rows = row[:, None]
+    values = frames[transpose[:, None], rows, COL_PERMS[perm]]
+    labels = np.zeros((len(perm), 10), dtype=np.intp)
+    next_label = np.ones(len(perm), dtype=np.intp)
+    canonical = np.zeros((9, 9), dtype=np.intc)
+    canonical[0] = _relabel(values, labels, next_label)[0]
+
+    for k in range(1, 9):
+        # Rows which may come next: any row of an unused band at the start of a
+        # band, otherwise the unused rows of the current band
+        used = np.zeros((len(rows), 9), dtype=bool)
+        np.put_along_axis(used, rows, True, axis=1)
+        if k % 3 == 0:
+            band_used = used.reshape(-1, 3, 3).any(axis=2)
+            allowed = ~band_used[:, _BAND]
+        else:
+            allowed = (_BAND == _BAND[rows[:, -1], None]) & ~used
+        cand, row = np.nonzero(allowed)
+        if len(cand) > MAX_CANDIDATES:
+            return (*_identity_form(board), False)
+
+        # Relabelled next row of every extended candidate
+        values = frames[transpose[cand, None], row[:, None], COL_PERMS[perm[cand]]]
+        labels = labels[cand]
+        next_label = next_label[cand]
+        relabelled = _relabel(values, labels, next_label)
+        keys = relabelled @ _WEIGHTS
+
+        # Keep the candidates with the smallest row
+        best = keys == keys.min()
+        canonical[k] = relabelled[np.argmax(best)]
+        transpose, perm = transpose[cand][best], perm[cand][best]
+        rows = np.column_stack([rows[cand][best], row[best]])
+        labels, next_label = labels[best], next_label[best]
+
+    # Complete the relabelling with the values which do not appear on the board
+    digits = labels[0].copy()
+    missing = [val for val in range(1, 10) if digits[val] == 0]
+    digits[missing] = np.arange(next_label[0], 10)
+    trans = Transform(
+        bool(transpose[0]), rows[0].copy(), COL_PERMS[perm[0]].copy(), digits
+    )
+    return canonical, trans, True
+
+
+def canonical_form(sudoku_board) -> tuple[np.ndarray, Transform]:
+    """
+    Returns the canonical form of a board under the sudoku symmetries (see module
+    docstring) and the transformation which maps the board to it. Boards with so
+    many symmetries that more than :code:`MAX_CANDIDATES` partial transformations
+    would have to be kept (e.g. boards with very few givens) are only relabelled.
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array (or list of lists) representing sudoku board, values 0-9
+
+    Returns
+    ---------
+    tuple[np.ndarray, Transform]
+        Canonical board as a 2D numpy array of dtype :code:`np.intc`, and the
+        transformation (see :code:`transform()`)
+
+    Raises
+    ---------
+    ValueError
+        If the board is not 9x9 or contains values outside of 0-9
+    """
+    return _canonical_form(sudoku_board)[:2]
+
+
+def canonical_key(sudoku_board) -> bytes:
+    """
+    Returns a hashable key (the canonical form as 81 bytes). Boards with equal keys
+    are always isomorphic, and isomorphic boards get equal keys unless they are
+    so sparse that they are only relabelled (see :code:`canonical_form()`).
+    """
+    canonical, _ = canonical_form(sudoku_board)
+    return canonical.astype(np.uint8).tobytes()
+
+
+def transform(sudoku_board, trans: Transform) -> np.ndarray:
+    """
+    Apply a transformation (as returned by :code:`canonical_form()`) to a board.
+    """
+    board = np.asarray(sudoku_board)
+    if trans.transpose:
+        board = board.T
+    return trans.digits[board[np.ix_(trans.rows, trans.cols)]].astype(np.intc)
+
+
+def untransform(sudoku_board, trans: Transform) -> np.ndarray:
+    """
+    Apply the inverse of a transformation to a board, e.g. to map the solution of
+    a canonical board back to the original board.
+    """
+    inverse_digits = np.argsort(trans.digits)
+    board = np.zeros((9, 9), dtype=np.intc)
+    board[np.ix_(trans.rows, trans.cols)] = inverse_digits[np.asarray(sudoku_board)]
+    return board.T.copy() if trans.transpose else board
+
+
+def _solve_each(boards: np.ndarray, backend: str) -> tuple[np.ndarray, np.ndarray]:
+    """Solve the boards one by one with a backend (batch solver interface)."""
+    out = np.zeros(boards.shape, dtype=np.intc)
+    status = np.zeros(len(boards), dtype=bool)
+    for k in range(len(boards)):
+        try:
+            solve(boards[k], backend, out=out[k])
+            status[k] = True
+        except ValueError:
+            out[k] = 0
+    return out, status
+
+
+def solve_deduplicated(
+    boards: np.ndarray, backend: str = None, batch_solver=None
+) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    **Symmetry-aware batch solving**
+
+    Group the boards of a batch into equivalence classes under the sudoku
+    symmetries, solve the canonical board of every class once, and map the solution
+    back to every member of the class.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Integer array of shape (N, 9, 9) of sudoku boards (not modified)
+    backend : str
+        Backend used to solve the canonical boards (see :code:`backends`). Defaults
+        to :code:`bt_mrv` if it is available and :code:`python_mrv` otherwise.
+    batch_solver : callable
+        Optional batch solver used instead of :code:`backend`, taking an (K, 9, 9)
+        array and returning the solved boards and a boolean status per board (e.g.
+        :code:`batch.solve_batch()` or :code:`threaded.ThreadPoolSolver.solve_batch`)
+
+    Returns
+    ---------
+    tuple[np.ndarray, np.ndarray, dict]
+        Solved boards as an (N, 9, 9) array of dtype :code:`np.intc` (all zeros for
+        boards which could not be solved), a boolean array of shape (N,) which is
+        True for the solved boards, and statistics: :code:`"boards"` (N),
+        :code:`"classes"` (number of boards solved), :code:`"ratio"` (boards per
+        class) and :code:`"relabelled"` (boards which were only relabelled instead
+        of canonicalised; isomorphic ones among them are solved separately, so
+        :code:`"classes"` is then an upper bound on the number of classes)
+
+    Raises
+    ---------
+    ValueError
+        If boards do not have shape (N, 9, 9) or contain values outside of 0-9
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError("Boards must have shape (N, 9, 9)")
+    if batch_solver is None:
+        if backend is None:
+            backend = "bt_mrv" if "bt_mrv" in available_backends() else "python_mrv"
+        batch_solver = lambda canonical: _solve_each(canonical, backend)  # noqa: E731
+
+    classes = {}
+    members = []
+    canonical_boards = []
+    relabelled = 0
+    for board in boards:
+        canonical, trans, exact = _canonical_form(board)
+        relabelled += not exact
+        key = canonical.astype(np.uint8).tobytes()
+        if key not in classes:
+            classes[key] = len(canonical_boards)
+            canonical_boards.append(canonical)
+        members.append((classes[key], trans))
+
+    n = len(boards)
+    out = np.zeros((n, 9, 9), dtype=np.intc)
+    status = np.zeros(n, dtype=bool)
+    if canonical_boards:
+        solved, solved_status = batch_solver(np.array(canonical_boards, dtype=np.intc))
+        for k, (cls, trans) in enumerate(members):
+            if solved_status[cls]:
+                out[k] = untransform(solved[cls], trans)
+                status[k] = True
+    stats = {
+        "boards": n,
+        "classes": len(canonical_boards),
+        "ratio": n / len(canonical_boards) if canonical_boards else 1.0,
+        "relabelled": relabelled,
+    }
+    return out, status, stats
@@ -0,0 +1,125 @@
+"""
+This module contains precomputed lookup tables describing the structure of a sudoku
+board, shared by the solvers and validators. Cells are identified either by their
+flat index :code:`i * 9 + j` (0-80) or by their row and column indices
+:code:`(i, j)`. Computing the tables once at import time removes the block index
+arithmetic (:code:`// 3`) and nested loops from the innermost loops of the search.
+
+| :code:`UNITS`: the 27 units (9 rows, 9 columns, 9 blocks) as tuples of 9 flat
+  indices. Units 0-8 are the rows, 9-17 the columns and 18-26 the blocks.
+| :code:`CELL_UNITS`: for every flat index, the indices (into :code:`UNITS`) of its
+  row, column and block.
+| :code:`CELL_BOX`: for every flat index, the index (0-8) of its 3 x 3 block.
+| :code:`PEERS`: for every flat index, the 20 flat indices of the other cells which
+  share a row, column or block with it (row first, then column, then the rest of
+  the block).
+| :code:`PEER_POSITIONS`: :code:`PEERS` as (row, column) pairs, indexed by
+  :code:`[i][j]` for use with list of lists boards.
+
+The same tables can be built for any list of units with :code:`UnitTables`, so that
+the solvers handle sudoku variants with extra or irregular units (see
+:code:`variants`). :code:`STANDARD_TABLES` holds the tables of the standard rules.
+
+The cythonised :code:`bt_mrv` module builds the same tables as C arrays
+(:code:`bt_mrv.UnitTables`).
+"""
+
+ROWS = tuple(tuple(i * 9 + j for j in range(9)) for i in range(9))
+COLS = tuple(tuple(i * 9 + j for i in range(9)) for j in range(9))
+BOXES = tuple(
+    tuple((b_i + i) * 9 + b_j + j for i in range(3) for j in range(3))
+    for b_i in range(0, 9, 3)
+    for b_j in range(0, 9, 3)
+)
+UNITS = ROWS + COLS + BOXES
+
+CELL_BOX = tuple((idx // 9) // 3 * 3 + (idx % 9) // 3 for idx in range(81))
+CELL_UNITS = tuple((idx // 9, 9 + idx % 9, 18 + CELL_BOX[idx]) for idx in range(81))
+
+
+def _peers(idx: int) -> tuple[int, ...]:
+    """
+    Flat indices of the 20 peers of cell :code:`idx` (row, column, rest of block).
+    """
+    row, col, box = (UNITS[u] for u in CELL_UNITS[idx])
+    peers = [p for p in row if p != idx] + [p for p in col if p != idx]
+    peers += [p for p in box if p not in row and p not in col]
+    return tuple(peers)
+
+
+PEERS = tuple(_peers(idx) for idx in range(81))
+PEER_POSITIONS = tuple(
+    tuple(tuple(divmod(p, 9) for p in PEERS[i * 9 + j]) for j in range(9))
+    for i in range(9)
+)
+
+
+class UnitTables:
+    """
+    Lookup tables of a list of units, i.e. groups of 9 cells which must contain the
+    values 1-9 once each. The peers of a cell are the other cells of its units, in
+    unit order. Build it once per sudoku variant: the tables are computed in the
+    constructor.
+
+    Parameters
+    ----------
+    units : sequence
+        Units as sequences of 9 flat cell indices (:code:`i * 9 + j`)
+
+    Attributes
+    ----------
+    units : tuple[tuple[int, ...], ...]
+        The units as tuples of 9 flat indices
+    cell_units : tuple[tuple[int, ...], ...]
+        For every flat index, the indices (into :code:`units`) of its units
+    cell_units3 : tuple[tuple[int, int, int], ...]
+        The first 3 of :code:`cell_units` (padded with :code:`len(units)`, an extra
+        unit which stays empty), which can be unpacked without a loop
+    cell_units_rest : tuple[tuple[int, ...], ...]
+        The rest of :code:`cell_units` (empty for the standard rules)
+    peers : tuple[tuple[int, ...], ...]
+        For every flat index, the flat indices of its peers
+    peer_positions : tuple
+        :code:`peers` as (row, column) pairs, indexed by :code:`[i][j]`
+    unit_positions : tuple
+        :code:`units` as (row, column) pairs
+
+    Raises
+    ----------
+    ValueError
+        If a unit does not consist of 9 distinct cells (0-80)
+    """
+
+    def __init__(self, units):
+        self.units = tuple(tuple(int(idx) for idx in unit) for unit in units)
+        for unit in self.units:
+            if len(unit) != 9 or len(set(unit)) != 9 or min(unit) < 0 or max(unit) > 80:
+                raise ValueError("Each unit must consist of 9 distinct cells (0-80)")
+        cell_units = [[] for _ in range(81)]
+        for u, unit in enumerate(self.units):
+            for idx in unit:
+                cell_units[idx].append(u)
+        self.cell_units = tuple(tuple(units) for units in cell_units)
+        padding = (len(self.units),) * 3
+        self.cell_units3 = tuple((units + padding)[:3] for units in self.cell_units)
+        self.cell_units_rest = tuple(units[3:] for units in self.cell_units)
+        peers = []
+        for idx in range(81):
+            cell_peers = {}
+            for u in self.cell_units[idx]:
+                cell_peers.update((p, None) for p in self.units[u] if p != idx)
+            peers.append(tuple(cell_peers))
+        self.peers = tuple(peers)
+        self.peer_positions = tuple(
+            tuple(tuple(divmod(p, 9) for p in self.peers[i * 9 + j]) for j in range(9))
+            for i in range(9)
+        )
+        self.unit_positions = tuple(
+            tuple(divmod(idx, 9) for idx in unit) for unit in self.units
+        )
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+
+STANDARD_TABLES = UnitTables(UNITS)
@@ -0,0 +1,225 @@
+"""
+This module contains a thread pool solver for applications which embed the solver in
+a threaded server, where spawning worker processes is awkward.
+
+:code:`ThreadPoolSolver` follows the :code:`concurrent.futures` executor interface
+(:code:`submit()`, :code:`map()`, :code:`shutdown()`, context manager). The work is
+done by the cythonised :code:`bt_mrv` kernels, which release the GIL for the whole
+search: :code:`bt_mrv.solve_into()` for single boards and :code:`bt_mrv.solve_batch()`
+for slices of an (N, 9, 9) array. The threads therefore run on all cores at once and
+share the input and output arrays without any copies or inter-process communication.
+:code:`solve_batch()` can record its progress in a :code:`metrics.BatchMetrics`.
+Requires the compiled :code:`cython/bt_mrv` extension.
+"""
+
+import math
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator
+
+import numpy as np
+
+try:
+    from .utils import validate_boards
+except ImportError:
+    from utils import validate_boards
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+
+def _solve_board(sudoku_board: np.ndarray, value_order: str, tie_break: str):
+    """Solve a copy of a board into a new array (raises ValueError if unsolvable)."""
+    board = np.ascontiguousarray(sudoku_board, dtype=np.intc)
+    out = np.empty((9, 9), dtype=np.intc)
+    bt.solve_into(board, out, value_order, tie_break)
+    return out
+
+
+def _solve_chunk(
+    boards: np.ndarray,
+    out: np.ndarray,
+    status: np.ndarray,
+    value_order: str,
+    tie_break: str,
+    metrics,
+) -> int:
+    """
+    Solve a chunk of boards with :code:`bt_mrv.solve_batch()` and record it (with
+    the solve time of every board) in the metrics (if not None). Returns the number
+    of boards which could not be solved.
+    """
+    if metrics is None:
+        return bt.solve_batch(boards, out, status, value_order, tie_break)
+    stats = {}
+    seconds = np.zeros(len(boards))
+    failed = bt.solve_batch(
+        boards, out, status, value_order, tie_break, stats=stats, seconds=seconds
+    )
+    metrics.record(seconds, failed=failed, nodes=stats["nodes"])
+    return failed
+
+
+class ThreadPoolSolver:
+    """
+    Sudoku solver running the GIL-free :code:`bt_mrv` search in a pool of threads.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of threads. Defaults to :code:`os.cpu_count()`.
+    value_order : str
+        Value ordering policy of the search (see :code:`bt_mrv.VALUE_ORDERS`)
+    tie_break : str
+        MRV tie-breaking policy of the search (see :code:`bt_mrv.TIE_BREAKS`)
+
+    Raises
+    ----------
+    ValueError
+        If the :code:`bt_mrv` extension has not been compiled, or max_workers is not
+        positive
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        value_order: str = "natural",
+        tie_break: str = "scan",
+    ):
+        if bt is None:
+            raise ValueError(
+                "Backend bt_mrv is not available (compile it with: "
+                "cd src/cython && python setup.py build_ext --inplace)"
+            )
+        if max_workers is None:
+            max_workers = os.cpu_count()
+        if max_workers < 1:
+            raise ValueError("Number of workers must be positive")
+        self.max_workers = max_workers
+        self.value_order = value_order
+        self.tie_break = tie_break
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="sudoku")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+        return False
+
+    def submit(self, sudoku_board) -> Future:
+        """
+        Schedule a board to be solved.
+
+        Parameters
+        ----------
+        sudoku_board : np.ndarray
+            2D numpy array (or list of lists) representing sudoku board (not
+            modified)
+
+        Returns
+        ---------
+        Future
+            Future whose result is the solved board as a 2D numpy array of dtype
+            :code:`np.intc` (the future raises ValueError if the board cannot be
+            solved)
+        """
+        return self._executor.submit(
+            _solve_board, sudoku_board, self.value_order, self.tie_break
+        )
+
+    def map(self, boards: Iterable, timeout: float = None) -> Iterator[np.ndarray]:
+        """
+        Solve boards concurrently and return the solved boards in order (as
+        :code:`concurrent.futures.Executor.map()`).
+        """
+        solve = partial(
+            _solve_board, value_order=self.value_order, tie_break=self.tie_break
+        )
+        return self._executor.map(solve, boards, timeout=timeout)
+
+    def solve_batch(
+        self, boards: np.ndarray, chunk_size: int = None, metrics=None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Solve every board of an (N, 9, 9) array, splitting it into chunks which are
+        solved by :code:`bt_mrv.solve_batch()` in the threads, directly into one
+        preallocated output array. Boards with values outside 0-9 or clashing givens
+        (see :code:`utils.validate_boards()`) are marked as failed without being
+        solved.
+
+        Parameters
+        ----------
+        boards : np.ndarray
+            Integer array of shape (N, 9, 9) of sudoku boards (not modified)
+        chunk_size : int
+            Number of boards per task. Defaults to about 4 tasks per thread.
+        metrics : metrics.BatchMetrics
+            Optional metrics updated as the chunks are solved
+
+        Returns
+        ---------
+        tuple[np.ndarray, np.ndarray]
+            Solved boards as an (N, 9, 9) array of dtype :code:`np.intc` (all zeros
+            for boards which could not be solved or are not valid), and a boolean
+            array of shape (N,) which is True for the solved boards
+
+        Raises
+        ---------
+        ValueError
+            If boards do not have shape (N, 9, 9), or chunk_size is not positive
+        """
+        boards = np.ascontiguousarray(boards, dtype=np.intc)
+        if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+            raise ValueError("Boards must have shape (N, 9, 9)")
+        n = boards.shape[0]
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(n / (4 * self.max_workers)))
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+
+        valid = validate_boards(boards)
+        if not valid.all():
+            out = np.zeros(boards.shape, dtype=np.intc)
+            status = np.zeros(n, dtype=bool)
+            if metrics is not None:
+                invalid = n - int(valid.sum())
+                metrics.record(np.zeros(invalid), failed=invalid)
+            out[valid], status[valid] = self.solve_batch(
+                boards[valid], chunk_size, metrics
+            )
+            return out, status
+
+        out = np.zeros(boards.shape, dtype=np.intc)
+        status = np.zeros(n, dtype=np.uint8)
+        if metrics is not None:
+            metrics.set_queued(n)
+        futures = []
+        for start in range(0, n, chunk_size):
+            stop = start + chunk_size
+            futures.append(
+                self._executor.submit(
+                    _solve_chunk,
+                    boards[start:stop],
+                    out[start:stop],
+                    status[start:stop],
+                    self.value_order,
+                    self.tie_break,
+                    metrics,
+                )
+            )
+        for future in futures:
+            future.result()
+        return out, status.astype(bool)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the threads (see :code:`concurrent.futures.Executor.shutdown()`).
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,206 @@
+"""
+This module contains a trail (undo log) for the state of the backtracking search, and
+the board state used by the MRV search in :code:`backtracking_mrv`.
+
+Instead of copying the search state at every node, every change is made through
+:code:`Trail.set()`, which records the old value. Before trying a value the search
+takes a :code:`Trail.mark()`, and on backtracking :code:`Trail.undo()` restores every
+change made since the mark, most recent first. Memory use is proportional to the
+number of changes on the current path (at most 4 per assigned cell), and no state is
+copied.
+
+:code:`BoardState` holds a board (list of lists, modified in place) together with a
+bitmask of the values placed in each unit (bit :code:`v` set if value :code:`v` is
+in the unit), so the candidates of a cell are found with one OR per unit of the cell
+(three for the standard rules) instead of scanning its peers. The units are given by
+a :code:`tables.UnitTables` (the standard rows, columns and blocks by default), so
+sudoku variants are solved by the same search. The cythonised :code:`bt_mrv` module
+uses the same design with a fixed-size C trail.
+"""
+
+try:
+    from .tables import STANDARD_TABLES
+except ImportError:
+    from tables import STANDARD_TABLES
+
+# Bits 1-9 set: all values are candidates
+ALL_VALUES = 0x3FE
+
+
+class Trail:
+    """
+    Undo log of changes to mutable containers (lists or dicts).
+
+    Attributes
+    ----------
+    changes : list[tuple]
+        Recorded changes as :code:`(container, key, old_value)`, oldest first
+    """
+
+    def __init__(self):
+        self.changes = []
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def mark(self) -> int:
+        """
+        Returns a mark of the current position in the trail, to be passed to
+        :code:`undo()`.
+        """
+        return len(self.changes)
+
+    def set(self, container, key, value) -> None:
+        """
+        Set :code:`container[key] = value`, recording the old value.
+        """
+        self.changes.append((container, key, container[key]))
+        container[key] = value
+
+    def undo(self, mark: int = 0) -> None:
+        """
+        Undo all changes made since :code:`mark` (most recent first).
+        """
+        changes = self.changes
+        while len(changes) > mark:
+            container, key, old_value = changes.pop()
+            container[key] = old_value
+
+
+class BoardState:
+    """
+    Sudoku board with bitmasks of the values placed in each unit, changed through a
+    :code:`Trail`.
+
+    Parameters
+    ----------
+    sudoku_board : list[list[int]]
+        List of list with dimensions 9x9 representing sudoku board (modified in place)
+    units : UnitTables
+        Units of the sudoku variant (:code:`tables.STANDARD_TABLES` if None)
+
+    Attributes
+    ----------
+    board : list[list[int]]
+        The sudoku board
+    tables : UnitTables
+        Units of the sudoku variant
+    unit_used : list[int]
+        Bitmask of the values placed in each unit (indices as in
+        :code:`tables.units`, followed by the empty padding unit of
+        :code:`tables.cell_units3`)
+    trail : Trail
+        Undo log of all changes to :code:`board` and :code:`unit_used`
+    """
+
+    def __init__(self, sudoku_board: list[list[int]], units=None):
+        if units is None:
+            units = STANDARD_TABLES
+        self.board = sudoku_board
+        self.tables = units
+        self.cell_units = units.cell_units
+        self.cell_units3 = units.cell_units3
+        self.cell_units_rest = units.cell_units_rest
+        self.unit_used = [0] * (len(units) + 1)
+        self.trail = Trail()
+        for i in range(9):
+            for j in range(9):
+                val = sudoku_board[i][j]
+                if val != 0:
+                    for u in self.cell_units[i * 9 + j]:
+                        self.unit_used[u] |= 1 << val
+
+    def candidates(self, i: int, j: int) -> int:
+        """
+        Returns the bitmask of the values not yet placed in the units (row, column
+        and block for the standard rules) of cell :code:`[i][j]`.
+        """
+        idx = i * 9 + j
+        used = self.unit_used
+        u_1, u_2, u_3 = self.cell_units3[idx]
+        placed = used[u_1] | used[u_2] | used[u_3]
+        for u in self.cell_units_rest[idx]:
+            placed |= used[u]
+        return ALL_VALUES & ~placed
+
+    def place(self, i: int, j: int, val: int) -> None:
+        """
+        Place :code:`val` in (empty) cell :code:`[i][j]`, recording the changes on
+        the trail.
+        """
+        trail = self.trail
+        used = self.unit_used
+        bit = 1 << val
+        trail.set(self.board[i], j, val)
+        for u in self.cell_units[i * 9 + j]:
+            trail.set(used, u, used[u] | bit)
+
+    def _unit_sees(self, u: int, values: int) -> bool:
+        """
+        Returns True if every value of the bitmask :code:`values` is placed in unit
+        :code:`u` or is still a candidate of one of its empty cells.
+        """
+        board = self.board
+        seen = self.unit_used[u]
+        for p_i, p_j in self.tables.unit_positions[u]:
+            if seen & values == values:
+                return True
+            if board[p_i][p_j] == 0:
+                seen |= self.candidates(p_i, p_j)
+        return seen & values == values
+
+    def has_wipeout(self) -> bool:
+        """
+        Returns True if an empty cell has no candidates, or a value missing from a
+        unit has no empty cell of the unit left to go to (checks the whole board,
+        e.g. before a search with forward checking).
+        """
+        board = self.board
+        for i in range(9):
+            for j in range(9):
+                if board[i][j] == 0 and self.candidates(i, j) == 0:
+                    return True
+        return not all(self._unit_sees(u, ALL_VALUES) for u in range(len(self.tables)))
+
+    def wiped_out(self, i: int, j: int) -> bool:
+        """
+        Forward checking after placing a value in cell :code:`[i][j]`: returns True
+        if there is a domain wipeout, i.e. an empty peer of the cell has no
+        candidates left, or a value missing from a unit has no empty cell of the
+        unit left to go to.
+
+        Only the units which the placement can change are checked (assuming there
+        was no wipeout before it): the units of the cell, which lose the other
+        candidates of the cell, and the units of its empty peers, which can only
+        lose the placed value.
+        """
+        board = self.board
+        cell_units = self.cell_units
+        own_units = cell_units[i * 9 + j]
+        for u in own_units:
+            if not self._unit_sees(u, ALL_VALUES):
+                return True
+        bit = 1 << board[i][j]
+        checked = set(own_units)
+        for p_i, p_j in self.tables.peer_positions[i][j]:
+            if board[p_i][p_j] == 0:
+                if self.candidates(p_i, p_j) == 0:
+                    return True
+                for u in cell_units[p_i * 9 + p_j]:
+                    if u not in checked:
+                        checked.add(u)
+                        if not self._unit_sees(u, bit):
+                            return True
+        return False
+
+    def mark(self) -> int:
+        """
+        Returns a mark of the current state (see :code:`Trail.mark()`).
+        """
+        return self.trail.mark()
+
+    def undo(self, mark: int) -> None:
+        """
+        Restore the state at :code:`mark` (see :code:`Trail.undo()`).
+        """
+        self.trail.undo(mark)
@@ -5,13 +5,52 @@
   :code:`validate_board()` checks if a sudoku board is valid (*note*: a valid sudoku
    does not necessarily mean that the sudoku is solvable). If the board is invalid, the
     row and column of the invalid cells are returned.
+  :code:`verify_solutions()` checks many completed boards at once against the rules
+   and their original puzzles.
+  :code:`validate_boards()` checks many puzzles at once for values outside 0-9 and
+   clashing givens.
   :code:`highlight_errors()` highlights the invalid cells in red.
   :code:`display_sudoku()` converts a list of lists into a text-based
    suduko grid for display purposes.
+  :code:`render_boards()` and :code:`write_boards()` format many boards at once
+   (e.g. when dumping large numbers of solutions) using NumPy byte operations.
+
+Boards may be passed as numpy arrays or as memoryviews (e.g. the :code:`int[:, :]`
+returned by the cythonised solver), which are wrapped with :code:`np.asarray()`
+without copying. :code:`validate_board()` and :code:`verify_solutions()` check the
+units of a sudoku variant instead of the standard rules if given a
+:code:`tables.UnitTables` (see :code:`variants`).
 """
 
 import numpy as np
-from typing import Union
+from typing import Union, BinaryIO
+
+RENDER_STYLES = ("boxed", "line")
+
+try:
+    from .tables import UNITS
+except ImportError:
+    from tables import UNITS
+
+# Units as an array of flat indices, and for every unit the pairs of positions
+# (k_prev, k) with k_prev < k, used to find repeated values in a single pass
+_UNIT_INDEX = np.array(UNITS, dtype=np.intp)
+_EARLIER = np.tri(9, 9, -1, dtype=bool)
+
+
+def _unit_matrix(unit_index: np.ndarray) -> np.ndarray:
+    """
+    Unit membership matrix (cell x unit) of units given as an array of flat indices,
+    for verify_solutions(): multiplying the bits of the values of a board with it
+    gives the sum of the bits of every unit.
+    """
+    matrix = np.zeros((81, len(unit_index)), dtype=np.float32)
+    matrix[unit_index, np.arange(len(unit_index))[:, None]] = 1
+    return matrix
+
+
+_UNIT_MATRIX = _unit_matrix(_UNIT_INDEX)
+_ALL_BITS = 0x3FE
 
 
 def parse_grid(sudoku: str) -> np.array:
@@ -81,7 +120,30 @@ def parse_grid(sudoku: str) -> np.array:
     return sudoku_array
 
 
-def validate_board(sudoku: np.array) -> Union[bool, list[tuple[int, int]]]:
+def _as_board(sudoku) -> np.ndarray:
+    """
+    Returns a numpy view of a sudoku board given as a numpy array or memoryview,
+    without copying.
+
+    Raises
+    ---------
+    TypeError
+        If input is not a numpy array or memoryview
+    ValueError
+        If input is not 9x9
+    """
+    if not isinstance(sudoku, np.ndarray):
+        # Any object exporting the buffer protocol (memoryview, cython memoryview)
+        try:
+            sudoku = np.asarray(memoryview(sudoku))
+        except TypeError:
+            raise TypeError("Input must be a numpy array or memoryview")
+    if sudoku.shape != (9, 9):
+        raise ValueError("Input grid must be 9x9")
+    return sudoku
+
+
+def validate_board(sudoku: np.array, units=None) -> Union[bool, list[tuple[int, int]]]:
     """
     Given a 2D numpy array representing a sudoku board, check if the board is valid.
     Validity of sudoku is based off the following rules:
@@ -91,6 +153,9 @@ def validate_board(sudoku: np.array) -> Union[bool, list[tuple[int, int]]]:
     3) Each of the nine 3 x 3 sub-boxes of the grid must contain the digits 1-9 without
        repetition
 
+    or, for a sudoku variant, on its units (each must contain the digits 1-9 without
+    repetition).
+
     *Note*: a valid sudoku does not necessarily mean that the sudoku is solvable.
 
     If the board is valid, True is returned. If the board is invalid, False and the row
@@ -99,7 +164,10 @@ def validate_board(sudoku: np.array) -> Union[bool, list[tuple[int, int]]]:
     Parameters
     ----------
     sudoku : np.array
-        2D numpy array representing a sudoku board
+        2D numpy array (or memoryview) representing a sudoku board
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None), a
+        :code:`tables.UnitTables` or :code:`bt_mrv.UnitTables`
 
     Returns
     ---------
@@ -112,35 +180,22 @@ def validate_board(sudoku: np.array) -> Union[bool, list[tuple[int, int]]]:
     Raises
     ---------
     TypeError
-        If input is not a numpy array
+        If input is not a numpy array or memoryview
+    ValueError
+        If input is not 9x9
     """
     # Check if input is valid (type)
-    if type(sudoku) != np.ndarray:
-        raise TypeError("Input must be a numpy array")
-
-    # Convert numpy array to list of lists
-    sudoku_list = [list(row) for row in sudoku]
-
-    # Check validity of sudoku
-    rows = [set() for _ in range(9)]
-    cols = [set() for _ in range(9)]
-    block = [[set() for _ in range(3)] for _ in range(3)]
-    invalid_cells = []
-
-    for i in range(9):  # iterate over rows
-        for j in range(9):  # iterate over columns
-            element = sudoku_list[i][j]
-            if element == 0:
-                continue
-            if (
-                (element in rows[i])
-                or (element in cols[j])
-                or (element in block[i // 3][j // 3])
-            ):
-                invalid_cells.append((i, j))
-            rows[i].add(element)
-            cols[j].add(element)
-            block[i // 3][j // 3].add(element)
+    sudoku = _as_board(sudoku)
+
+    # Check validity of sudoku: a cell is invalid if its value already appears
+    # earlier in its row, column or block (units from precomputed table)
+    unit_index = _UNIT_INDEX if units is None else np.array(units.units, np.intp)
+    unit_vals = sudoku.reshape(81)[unit_index]
+    repeated = (unit_vals[:, :, None] == unit_vals[:, None, :]) & _EARLIER
+    repeated = repeated.any(axis=2) & (unit_vals != 0)
+    invalid = np.zeros(81, dtype=bool)
+    invalid[unit_index[repeated]] = True
+    invalid_cells = [divmod(int(idx), 9) for idx in np.flatnonzero(invalid)]
 
     if len(invalid_cells) == 0:
         return True, invalid_cells
@@ -148,6 +203,120 @@ def validate_board(sudoku: np.array) -> Union[bool, list[tuple[int, int]]]:
         return False, invalid_cells
 
 
+def validate_boards(boards: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+    """
+    Check many sudoku boards at once before solving them: a board is valid if all its
+    values are in 0-9 and no value is given twice in a row, column or block (the
+    check of :code:`validate_board()`, in bulk). Boards are processed in chunks of
+    :code:`chunk_size` to bound the size of the pairwise comparison.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Integer array of shape (9, 9) or (N, 9, 9) of sudoku boards
+    chunk_size : int
+        Number of boards checked at a time
+
+    Returns
+    ---------
+    np.ndarray
+        Boolean array of shape (N,), True for the valid boards
+
+    Raises
+    ---------
+    ValueError
+        If the array does not have shape (9, 9) or (N, 9, 9)
+    """
+    boards = np.asarray(boards)
+    if boards.shape[-2:] != (9, 9) or boards.ndim not in (2, 3):
+        raise ValueError("Boards must have shape (9, 9) or (N, 9, 9)")
+    boards = boards.reshape(-1, 81)
+
+    valid = np.empty(boards.shape[0], dtype=bool)
+    for start in range(0, boards.shape[0], chunk_size):
+        stop = start + chunk_size
+        chunk = boards[start:stop]
+        unit_vals = chunk[:, _UNIT_INDEX]
+        repeated = (unit_vals[..., :, None] == unit_vals[..., None, :]) & _EARLIER
+        repeated &= (unit_vals != 0)[..., None]
+        valid[start:stop] = np.all((chunk >= 0) & (chunk <= 9), axis=1) & ~np.any(
+            repeated, axis=(1, 2, 3)
+        )
+    return valid
+
+
+def verify_solutions(
+    boards: np.ndarray,
+    puzzles: np.ndarray = None,
+    chunk_size: int = 4096,
+    units=None,
+) -> np.ndarray:
+    """
+    Check whether completed sudoku boards are correct solutions, in bulk. A board is
+    correct if every row, column and block (or every unit of a sudoku variant)
+    contains the digits 1-9 exactly once and (if :code:`puzzles` is given) every
+    given of its puzzle is kept.
+
+    Every value :code:`v` is mapped to the bit :code:`2 ** v`, and the bits of all
+    27 units are summed with a single matrix product. A unit sums to :code:`0x3FE`
+    only if it holds the values 1-9 exactly once: :code:`0x3FE` has 9 bits set, so
+    any other sum of 9 powers of two (with repetitions, or values outside of 1-9)
+    differs from it. Boards are processed in chunks of :code:`chunk_size`, which
+    keeps the intermediate arrays in cache, so millions of boards are checked per
+    second.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Integer array of shape (9, 9) or (N, 9, 9) of completed boards
+    puzzles : np.ndarray
+        Integer array of the same shape of the original puzzles (0 for empty cells)
+    chunk_size : int
+        Number of boards checked at a time
+    units : UnitTables
+        Units of the sudoku variant (standard rules if None), a
+        :code:`tables.UnitTables` or :code:`bt_mrv.UnitTables`
+
+    Returns
+    ---------
+    np.ndarray
+        Boolean array of shape (N,), True for the correct solutions
+
+    Raises
+    ---------
+    ValueError
+        If the arrays do not have shape (9, 9) or (N, 9, 9), or their shapes differ
+    """
+    boards = np.asarray(boards)
+    if boards.shape[-2:] != (9, 9) or boards.ndim not in (2, 3):
+        raise ValueError("Boards must have shape (9, 9) or (N, 9, 9)")
+    boards = boards.reshape(-1, 81)
+    if puzzles is not None:
+        puzzles = np.asarray(puzzles)
+        if puzzles.size != boards.size:
+            raise ValueError("Boards and puzzles must have the same shape")
+        puzzles = puzzles.reshape(-1, 81)
+    if units is None:
+        unit_matrix = _UNIT_MATRIX
+    else:
+        unit_matrix = _unit_matrix(np.array(units.units, dtype=np.intp))
+
+    correct = np.empty(boards.shape[0], dtype=bool)
+    for start in range(0, boards.shape[0], chunk_size):
+        stop = start + chunk_size
+        chunk = boards[start:stop]
+        # Out of range values overflow to inf (or underflow to 0), which never sum
+        # to _ALL_BITS
+        with np.errstate(over="ignore", invalid="ignore"):
+            sums = np.exp2(chunk.astype(np.float32)) @ unit_matrix
+        ok = np.all(sums == _ALL_BITS, axis=1)
+        if puzzles is not None:
+            givens = puzzles[start:stop]
+            ok &= np.all((givens == 0) | (givens == chunk), axis=1)
+        correct[start:stop] = ok
+    return correct
+
+
 def highlight_errors(sudoku: np.array, invalid_cells: list[tuple[int, int]]) -> None:
     """
     Given a 2D numpy array representing a sudoku board and a list of invalid cells for
@@ -156,7 +325,7 @@ def highlight_errors(sudoku: np.array, invalid_cells: list[tuple[int, int]]) ->
     Parameters
     ----------
     sudoku : np.array
-        2D numpy array representing a sudoku board
+        2D numpy array (or memoryview) representing a sudoku board
     invalid_cells : list[tuple[int, int]]
         List of tuples containing the row and column of the invalid cells.
 
@@ -165,26 +334,13 @@ def highlight_errors(sudoku: np.array, invalid_cells: list[tuple[int, int]]) ->
     RED = "\033[91m"
     RESET = "\033[0m"
 
-    # Convert numpy array to list of lists
-    sudoku_list = [list(row) for row in sudoku]
-
-    # Convert list of lists into a string
-    sudoku_str = ""
-    for row in sudoku_list:
-        for idx, val in enumerate(row):
-            # Highlight invalid cells in red
-            if (sudoku_list.index(row), idx) in invalid_cells:
-                char_str = f"{RED}{val}{RESET}"
-            else:
-                char_str = str(val)
-            if idx == 2 or idx == 5:
-                sudoku_str += char_str + "|"
-            else:
-                sudoku_str += char_str
-        sudoku_str += "\n"
-        if row == sudoku_list[2] or row == sudoku_list[5]:
-            sudoku_str += "---+---+---\n"
-    print(sudoku_str)
+    # Render the board, then highlight invalid cells in red
+    chars = list(render_boards(_as_board(sudoku)).decode("ascii"))
+    positions = _TEMPLATES["boxed"][1]
+    for i, j in set(invalid_cells):
+        pos = positions[i * 9 + j]
+        chars[pos] = f"{RED}{chars[pos]}{RESET}"
+    print("".join(chars))
 
 
 def display_sudoku(board: list[list[int]]) -> str:
@@ -194,7 +350,8 @@ def display_sudoku(board: list[list[int]]) -> str:
     Parameters
     ----------
     board : list of list
-        List of list where elements can be accessed by row [i] & column [j]
+        List of list where elements can be accessed by row [i] & column [j]. A 2D
+        numpy array or memoryview of ints is also accepted (without conversion).
 
     Returns
     ---------
@@ -220,15 +377,23 @@ def display_sudoku(board: list[list[int]]) -> str:
     Raises
     ---------
     TypeError
-        If input is not a list of lists of ints
+        If input is not a list of lists of ints, or a numpy array or memoryview of
+        ints
     ValueError
         If input is not 9x9 or if cells contains values outside of 0-9
 
     """
+    # Arrays and memoryviews are rendered directly (render_boards checks values)
+    if not isinstance(board, list):
+        board = _as_board(board)
+        if not np.issubdtype(board.dtype, np.integer):
+            raise TypeError("Input must be an array of ints")
+        try:
+            return render_boards(board).decode("ascii")
+        except ValueError:
+            raise ValueError("Input must only contain ints from 0-9")
 
     # Check if input is valid (list of list)
-    if type(board) != list:
-        raise TypeError("Input must be a list")
     if type(board[0]) != list:
         raise TypeError("Input must be a list of lists")
 
@@ -247,16 +412,100 @@ def display_sudoku(board: list[list[int]]) -> str:
             if val < 0 or val > 9:
                 raise ValueError("Input must be a list of lists of ints from 0-9")
 
-    # Convert list of lists into a string
-    sudoku = ""
-    for row in board:
-        for val, idx in enumerate(row):
-            if val == 2 or val == 5:
-                sudoku += str(idx) + "|"
-            else:
-                sudoku += str(idx)
-        sudoku += "\n"
-        if row == board[2] or row == board[5]:
-            sudoku += "---+---+---\n"
+    return render_boards(np.array(board, dtype=np.uint8)).decode("ascii")
 
-    return sudoku
+
+def _render_template(style: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the byte template of one rendered board and the positions in it of the
+    81 cells (in row-major order) for the given style.
+    """
+    if style == "boxed":
+        text = (("000|000|000\n" * 3 + "---+---+---\n") * 3)[:-12]
+    elif style == "line":
+        text = "0" * 81 + "\n"
+    else:
+        raise ValueError(f"Style must be one of {RENDER_STYLES}")
+    template = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return template, np.flatnonzero(template == ord("0"))
+
+
+_TEMPLATES = {style: _render_template(style) for style in RENDER_STYLES}
+
+
+def render_boards(boards: np.ndarray, style: str = "boxed") -> bytes:
+    """
+    Format one or many sudoku boards as ASCII text in a single vectorised operation.
+    The cell digits are written into a tiled byte template, so the cost per board
+    is a few array copies instead of a string concatenation per cell.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Array of shape (9, 9) or (N, 9, 9) with values 0-9
+    style : str
+        :code:`"boxed"` for the grid format of :code:`display_sudoku()` (boards
+        are concatenated, each ending in a newline), or :code:`"line"` for one line
+        of 81 digits per board
+
+    Returns
+    ---------
+    bytes
+        ASCII text of all the boards
+
+    Raises
+    ---------
+    ValueError
+        If the boards do not have shape (9, 9) or (N, 9, 9), contain values outside
+        of 0-9, or style is unknown
+    """
+    if style not in RENDER_STYLES:
+        raise ValueError(f"Style must be one of {RENDER_STYLES}")
+    boards = np.asarray(boards)
+    if boards.shape[-2:] != (9, 9) or boards.ndim not in (2, 3):
+        raise ValueError("Boards must have shape (9, 9) or (N, 9, 9)")
+    boards = boards.reshape(-1, 81)
+    if boards.size and (boards.min() < 0 or boards.max() > 9):
+        raise ValueError("Boards must only contain values from 0-9")
+
+    template, positions = _TEMPLATES[style]
+    out = np.empty((boards.shape[0], template.size), dtype=np.uint8)
+    out[:] = template
+    out[:, positions] = boards + ord("0")
+    return out.tobytes()
+
+
+def write_boards(
+    boards: np.ndarray,
+    stream: BinaryIO,
+    style: str = "boxed",
+    chunk_size: int = 65536,
+) -> int:
+    """
+    Render sudoku boards with :code:`render_boards()` and write them to a binary
+    stream (e.g. :code:`sys.stdout.buffer` or a file opened with :code:`"wb"`).
+    Boards are rendered in chunks of :code:`chunk_size`, so memory use stays bounded
+    and there is a single write call per chunk.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Array of shape (9, 9) or (N, 9, 9) with values 0-9
+    stream : BinaryIO
+        Binary stream to write to
+    style : str
+        Output style, one of :code:`RENDER_STYLES` (see :code:`render_boards()`)
+    chunk_size : int
+        Number of boards rendered per write
+
+    Returns
+    ---------
+    int
+        Number of bytes written
+    """
+    boards = np.asarray(boards).reshape(-1, 9, 9)
+    written = 0
+    for start in range(0, boards.shape[0], chunk_size):
+        stop = start + chunk_size
+        written += stream.write(render_boards(boards[start:stop], style))
+    return written
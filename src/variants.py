@@ -0,0 +1,247 @@
+"""
+This module defines sudoku variants with extra or irregular units (groups of 9 cells
+which must contain the values 1-9 once each). The rules of a variant are only a list
+of units, so variants are solved by the same MRV search as standard sudoku, both
+the cythonised :code:`bt_mrv` search (at full speed) and the pure python one:
+
+| :code:`STANDARD`: rows, columns and 3 x 3 blocks.
+| :code:`X_SUDOKU` (:code:`"x"`): the two main diagonals are units too.
+| :code:`WINDOKU` (:code:`"windoku"`): four extra 3 x 3 windows, with top left
+  cells (1, 1), (1, 5), (5, 1) and (5, 5).
+| :code:`jigsaw()`: the blocks are replaced by 9 irregular regions of 9 cells, given
+  by a region map (see :code:`parse_regions()`).
+
+A :code:`Variant` precomputes the lookup tables of its units once, for the python
+search (:code:`tables.UnitTables`) and, if the extension has been compiled, for the
+C search (:code:`bt_mrv.UnitTables`). Build it once and reuse it for every board.
+
+Region maps are text files of 9 lines of 9 characters, one character (e.g. a letter
+or digit) per region, so that every region has 9 cells:
+
+::
+
+    AAABBBCCC
+    AABBBCCCD
+    ...
+
+Spaces are ignored, as are empty lines and lines starting with :code:`#`.
+"""
+
+import numpy as np
+
+try:
+    from .tables import UNITS, ROWS, COLS, UnitTables
+    from .backtracking_mrv import solve_backtrack_MRV
+except ImportError:
+    from tables import UNITS, ROWS, COLS, UnitTables
+    from backtracking_mrv import solve_backtrack_MRV
+
+try:
+    from .cython import bt_mrv as bt
+except ImportError:
+    try:
+        import cython.bt_mrv as bt
+    except ImportError:
+        bt = None
+
+# Extra units of the variants as tuples of flat indices
+DIAGONALS = (
+    tuple(k * 9 + k for k in range(9)),
+    tuple(k * 9 + 8 - k for k in range(9)),
+)
+WINDOWS = tuple(
+    tuple((w_i + i) * 9 + w_j + j for i in range(3) for j in range(3))
+    for w_i in (1, 5)
+    for w_j in (1, 5)
+)
+
+# Backends which can solve variants
+VARIANT_BACKENDS = ("bt_mrv", "python_mrv")
+
+
+class Variant:
+    """
+    Sudoku variant given by its units, with the lookup tables of the solvers.
+
+    Parameters
+    ----------
+    name : str
+        Name of the variant
+    units : sequence
+        Units as sequences of 9 flat cell indices (:code:`i * 9 + j`)
+
+    Attributes
+    ----------
+    name : str
+        Name of the variant
+    tables : tables.UnitTables
+        Lookup tables for the python search and validators
+    bt_tables : bt_mrv.UnitTables
+        C lookup tables for the cythonised search (None if the extension has not
+        been compiled)
+
+    Raises
+    ----------
+    ValueError
+        If a unit does not consist of 9 distinct cells (0-80)
+    """
+
+    def __init__(self, name: str, units):
+        self.name = name
+        self.tables = UnitTables(units)
+        self.bt_tables = None if bt is None else bt.UnitTables(self.tables.units)
+
+    def __repr__(self) -> str:
+        return f"Variant({self.name!r}, {len(self.tables)} units)"
+
+    @property
+    def units(self) -> tuple:
+        """The units as tuples of 9 flat indices."""
+        return self.tables.units
+
+
+STANDARD = Variant("standard", UNITS)
+X_SUDOKU = Variant("x", UNITS + DIAGONALS)
+WINDOKU = Variant("windoku", UNITS + WINDOWS)
+
+VARIANTS = {variant.name: variant for variant in (STANDARD, X_SUDOKU, WINDOKU)}
+
+
+def parse_regions(region_map: str) -> tuple[tuple[int, ...], ...]:
+    """
+    Parse a region map (see module docstring) into 9 regions.
+
+    Parameters
+    ----------
+    region_map : str
+        Text of the region map
+
+    Returns
+    ---------
+    tuple[tuple[int, ...], ...]
+        The 9 regions as tuples of 9 flat indices, in order of first appearance
+
+    Raises
+    ---------
+    ValueError
+        If the map is not 9 lines of 9 characters, or a region does not have
+        exactly 9 cells
+    """
+    lines = [line.replace(" ", "") for line in region_map.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if len(lines) != 9 or any(len(line) != 9 for line in lines):
+        raise ValueError("Region map must be 9 lines of 9 characters")
+    regions = {}
+    for i, line in enumerate(lines):
+        for j, label in enumerate(line):
+            regions.setdefault(label, []).append(i * 9 + j)
+    if len(regions) != 9 or any(len(cells) != 9 for cells in regions.values()):
+        raise ValueError("Region map must have 9 regions of 9 cells each")
+    return tuple(tuple(cells) for cells in regions.values())
+
+
+def load_regions(filename: str) -> tuple[tuple[int, ...], ...]:
+    """
+    Read a region map file (see :code:`parse_regions()`).
+    """
+    with open(filename, "r") as f:
+        return parse_regions(f.read())
+
+
+def jigsaw(regions, name: str = "jigsaw", extra_units=()) -> Variant:
+    """
+    Returns the jigsaw variant of a set of regions: rows, columns and the regions
+    (instead of the 3 x 3 blocks), plus any extra units (e.g. :code:`DIAGONALS`).
+
+    Parameters
+    ----------
+    regions : sequence or str
+        The 9 regions as sequences of 9 flat indices, or a region map
+    name : str
+        Name of the variant
+    extra_units : sequence
+        Further units as sequences of 9 flat indices
+
+    Raises
+    ---------
+    ValueError
+        If the regions do not partition the board into 9 regions of 9 cells
+    """
+    if isinstance(regions, str):
+        regions = parse_regions(regions)
+    regions = tuple(tuple(region) for region in regions)
+    cells = sorted(idx for region in regions for idx in region)
+    if len(regions) != 9 or cells != list(range(81)):
+        raise ValueError("Regions must partition the board into 9 regions of 9 cells")
+    return Variant(name, ROWS + COLS + regions + tuple(extra_units))
+
+
+def get_variant(name: str, region_file: str = None) -> Variant:
+    """
+    Returns a variant by name: one of :code:`VARIANTS`, or :code:`"jigsaw"` with the
+    regions read from :code:`region_file`.
+
+    Raises
+    ---------
+    ValueError
+        If the variant is unknown, or the region file is missing or invalid
+    """
+    if name == "jigsaw":
+        if region_file is None:
+            raise ValueError("The jigsaw variant needs a region map file")
+        return jigsaw(load_regions(region_file))
+    if name not in VARIANTS:
+        raise ValueError(f"Variant must be one of {tuple(VARIANTS) + ('jigsaw',)}")
+    return VARIANTS[name]
+
+
+def solve(
+    sudoku_board: np.ndarray,
+    variant: Variant,
+    backend: str = "bt_mrv",
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Solve a board of a sudoku variant (as :code:`backends.solve()`).
+
+    Parameters
+    ----------
+    sudoku_board : np.ndarray
+        2D numpy array of dtype :code:`np.intc` representing sudoku board (not
+        modified)
+    variant : Variant
+        The sudoku variant
+    backend : str
+        Name of the backend, one of :code:`VARIANT_BACKENDS`
+    out : np.ndarray
+        Optional 9x9 array of dtype :code:`np.intc` in which the solved board is
+        written
+
+    Returns
+    ---------
+    np.ndarray
+        2D numpy array representing solved sudoku board (:code:`out` if given)
+
+    Raises
+    ---------
+    ValueError
+        If the backend is unknown or not available, or if the sudoku board cannot be
+        solved.
+    """
+    if backend not in VARIANT_BACKENDS:
+        raise ValueError(f"Backend must be one of {VARIANT_BACKENDS} for variants")
+    if out is None:
+        out = np.empty((9, 9), dtype=np.intc)
+    if backend == "bt_mrv":
+        if variant.bt_tables is None:
+            raise ValueError(
+                "Backend bt_mrv is not available (compile it with: "
+                "cd src/cython && python setup.py build_ext --inplace)"
+            )
+        board = np.ascontiguousarray(sudoku_board, dtype=np.intc)
+        return np.asarray(bt.solve_into(board, out, units=variant.bt_tables))
+    board = [[int(val) for val in row] for row in sudoku_board]
+    if solve_backtrack_MRV(board, 0, 0, units=variant.tables) is False:
+        raise ValueError("Sudoku puzzle cannot be solved.")
+    out[...] = board
+    return out
@@ -0,0 +1,67 @@
+# Unit tests for available_backends, get_solver and solve functions in backends.py
+import numpy as np
+import pytest
+from src.backends import BACKENDS, available_backends, get_solver, solve
+
+
+def test_available_backends():
+    backends = available_backends()
+    assert "python_mrv" in backends and "sat" in backends
+    assert set(backends) <= set(BACKENDS)
+
+
+def test_get_solver_unknown_backend():
+    with pytest.raises(ValueError):
+        get_solver("invalid")
+
+
+def test_solve_all_backends():
+    sudoku_board = np.array(
+        [
+            [5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 9],
+        ],
+        dtype=np.intc,
+    )
+    expected_solution = [
+        [5, 3, 4, 6, 7, 8, 9, 1, 2],
+        [6, 7, 2, 1, 9, 5, 3, 4, 8],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    for backend in available_backends():
+        assert solve(sudoku_board.copy(), backend).tolist() == expected_solution
+
+
+def test_solve_into_output_buffer():
+    sudoku_board = np.zeros((9, 9), dtype=np.intc)
+    sudoku_board[0] = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    out = np.zeros((2, 9, 9), dtype=np.intc)
+    for backend in available_backends():
+        result = solve(sudoku_board, backend, out=out[1])
+        assert np.shares_memory(result, out)
+        assert out[1, 0, 8] == 9
+        assert sudoku_board[0, 8] == 0  # input left unchanged
+
+
+@pytest.mark.skipif(
+    "bt_mrv" not in available_backends(), reason="bt_mrv extension not compiled"
+)
+@pytest.mark.parametrize("value", [12, -3])
+def test_solve_bt_mrv_rejects_invalid_values(value):
+    sudoku_board = np.zeros((9, 9), dtype=np.intc)
+    sudoku_board[4, 4] = value
+    with pytest.raises(ValueError, match="0-9"):
+        solve(sudoku_board, "bt_mrv")
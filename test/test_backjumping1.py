@@ -0,0 +1,118 @@
+# Unit tests for the solve_backjump function and nogood table in backjumping.py
+import pytest
+from src.backjumping import _NogoodTable, solve_backjump
+from src.backtracking_mrv import solve_backtrack_MRV
+from src.utils import parse_grid
+
+
+def test_solve_backjump_valid_board():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    expected_solution = [
+        [5, 3, 4, 6, 7, 8, 9, 1, 2],
+        [6, 7, 2, 1, 9, 5, 3, 4, 8],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    stats = {}
+    assert solve_backjump(sudoku_board, 0, 0, stats=stats) == expected_solution
+    assert stats["nodes"] - stats["backtracks"] == 51
+
+
+def test_solve_backjump_hard_board():
+    # hard_sudoku1.txt: needs backtracking, so conflict sets are used
+    sudoku_board = [
+        [3, 8, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 4, 0, 0, 7, 8, 5],
+        [0, 0, 9, 0, 2, 0, 3, 0, 0],
+        [0, 6, 0, 0, 9, 0, 0, 0, 0],
+        [8, 0, 0, 3, 0, 2, 0, 0, 9],
+        [0, 0, 0, 0, 4, 0, 0, 7, 0],
+        [0, 0, 1, 0, 7, 0, 5, 0, 0],
+        [4, 9, 5, 0, 0, 6, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 9, 2],
+    ]
+    stats = {}
+    solution = solve_backjump([list(row) for row in sudoku_board], 0, 0, stats=stats)
+    for i in range(9):
+        assert sorted(solution[i]) == list(range(1, 10))  # rows
+        assert sorted(row[i] for row in solution) == list(range(1, 10))  # columns
+        for j in range(9):
+            if sudoku_board[i][j] != 0:
+                assert solution[i][j] == sudoku_board[i][j]  # givens kept
+    assert stats["backjumps"] > 0
+
+
+def test_solve_backjump_invalid_board():
+    grid = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 8],  # Duplicate value (8) in the last cell
+    ]
+    assert solve_backjump(grid, 0, 0) is False
+
+
+@pytest.mark.parametrize(
+    "grid, error",
+    [
+        ([[0] * 9] * 8, ValueError),
+        ([[0] * 9] * 8 + [[0] * 8 + [10]], ValueError),
+        ([[0] * 9] * 8 + [[0] * 8 + [1.5]], TypeError),
+        ("0" * 81, TypeError),
+    ],
+)
+def test_solve_backjump_bad_input(grid, error):
+    with pytest.raises(error):
+        solve_backjump(grid, 0, 0)
+
+
+def test_solve_backjump_bad_limits():
+    for kwargs in ({"max_nogood_size": -1}, {"max_nogoods": -1}):
+        with pytest.raises(ValueError):
+            solve_backjump([[0] * 9 for _ in range(9)], 0, 0, **kwargs)
+
+
+def test_nogood_table_bounded():
+    table = _NogoodTable(2)
+    for val in range(1, 5):
+        table.add(((0, 0, val), (1, 1, 5)))
+    assert len(table) == 2
+    assert len(table.index[(1, 1, 5)]) == 2
+    assert table.index[(0, 0, 1)] == []
+    board = [[0] * 9 for _ in range(9)]
+    board[0][0] = 4
+    assert table.culprits(board, 1, 1, 5) == {(0, 0)}
+    board[0][0] = 1  # dropped nogood
+    assert table.culprits(board, 1, 1, 5) is None
+    _NogoodTable(0).add(((0, 0, 1),))
+
+
+def test_solve_backjump_fewer_nodes_than_mrv():
+    with open("test/example_sudokus/hard_sudoku3.txt", "r") as f:
+        grid = parse_grid(f.read()).tolist()
+    stats, mrv_stats = {}, {}
+    solution = solve_backjump([list(row) for row in grid], 0, 0, stats=stats)
+    solve_backtrack_MRV([list(row) for row in grid], 0, 0, stats=mrv_stats)
+    assert solution is not False
+    assert stats["nodes"] < mrv_stats["nodes"]
+    assert stats["nogoods"] > 100  # more than the table holds
@@ -0,0 +1,95 @@
+# Unit tests for value ordering and tie-breaking heuristics in backtracking_mrv.py
+import pytest
+from src.backtracking_mrv import (
+    n_unfilled_peers,
+    order_values,
+    find_empty_cell_MRV,
+    solve_backtrack_MRV,
+)
+
+
+def test_n_unfilled_peers():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    assert n_unfilled_peers(sudoku_board, 0, 2) == 14
+    empty_board = [[0] * 9 for _ in range(9)]
+    assert n_unfilled_peers(empty_board, 4, 4) == 20
+
+
+def test_order_values():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    assert order_values(sudoku_board, 0, 2) == [1, 2, 4]
+    # 4 is possible in fewer unfilled peers than 2, so it constrains less
+    assert order_values(sudoku_board, 0, 2, "lcv") == [1, 4, 2]
+    with pytest.raises(ValueError):
+        order_values(sudoku_board, 0, 2, "invalid")
+
+
+def test_find_empty_cell_MRV_degree():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    assert find_empty_cell_MRV(sudoku_board) == (4, 4)
+    assert find_empty_cell_MRV(sudoku_board, "degree") == (6, 5)
+    with pytest.raises(ValueError):
+        find_empty_cell_MRV(sudoku_board, "invalid")
+
+
+def test_solve_backtrack_MRV_policies():
+    grid = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    expected_solution = [
+        [5, 3, 4, 6, 7, 8, 9, 1, 2],
+        [6, 7, 2, 1, 9, 5, 3, 4, 8],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    for value_order in ("natural", "lcv"):
+        for tie_break in ("scan", "degree"):
+            stats = {}
+            board = [list(row) for row in grid]
+            result = solve_backtrack_MRV(board, 0, 0, value_order, tie_break, stats)
+            assert result == expected_solution
+            # 51 empty cells: every placement which is not undone is in the solution
+            assert stats["nodes"] - stats["backtracks"] == 51
@@ -0,0 +1,50 @@
+# Unit tests for input checking and strict mode of solve_backtrack_MRV in
+# backtracking_mrv.py and solve_backtrack in backtracking.py
+import pytest
+from src.backtracking import check_board, solve_backtrack
+from src.backtracking_mrv import solve_backtrack_MRV
+
+board = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+
+def test_check_board():
+    check_board(board)
+    with pytest.raises(TypeError):
+        check_board("invalid")
+    with pytest.raises(TypeError):
+        check_board([list(map(str, row)) for row in board])
+    with pytest.raises(ValueError):
+        check_board(board[:8])
+    with pytest.raises(ValueError):
+        check_board([row[:-1] + [10] for row in board])
+
+
+def test_solvers_check_input_once():
+    with pytest.raises(TypeError):
+        solve_backtrack("invalid", 0, 0)
+    with pytest.raises(TypeError):
+        solve_backtrack_MRV([[float(val) for val in row] for row in board], 0, 0)
+    with pytest.raises(ValueError):
+        solve_backtrack_MRV([list(row) for row in board], 0, 0, value_order="x")
+
+
+def test_strict_mode_same_result():
+    expected = solve_backtrack_MRV([list(row) for row in board], 0, 0)
+    stats, strict_stats = {}, {}
+    result = solve_backtrack_MRV([list(row) for row in board], 0, 0, stats=stats)
+    assert result == expected
+    result = solve_backtrack_MRV(
+        [list(row) for row in board], 0, 0, stats=strict_stats, strict=True
+    )
+    assert result == expected and stats == strict_stats
+    assert solve_backtrack([list(row) for row in board], 0, 0, strict=True) == expected
@@ -0,0 +1,97 @@
+# Unit tests for the randomised search with restarts (solve_restarts) in
+# backtracking_mrv.py and the cythonised bt_mrv module
+import itertools
+
+import numpy as np
+import pytest
+from src.backtracking_mrv import restart_cutoffs, solve_restarts
+from src.backends import bt
+from src.utils import parse_grid, verify_solutions
+
+board = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+with open("test/example_sudokus/hard_sudoku1.txt") as f:
+    hard = parse_grid(f.read()).tolist()
+
+
+def test_restart_cutoffs():
+    luby = list(itertools.islice(restart_cutoffs("luby", 10), 7))
+    assert luby == [10, 10, 20, 10, 10, 20, 40]
+    geometric = list(itertools.islice(restart_cutoffs("geometric", 10, 2), 4))
+    assert geometric == [10, 20, 40, 80]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"restart": "never"}, {"base": 0}, {"factor": 0.5}, {"factor": 1.0}],
+)
+def test_restart_cutoffs_invalid(kwargs):
+    # Checked on the call, not on the first next()
+    with pytest.raises(ValueError):
+        restart_cutoffs(**kwargs)
+    with pytest.raises(ValueError):
+        solve_restarts([list(row) for row in board], **kwargs)
+
+
+@pytest.mark.parametrize("restart", ["luby", "geometric"])
+def test_solve_restarts(restart):
+    stats = {}
+    result = solve_restarts([list(row) for row in hard], 3, restart, 20, stats=stats)
+    assert verify_solutions(np.array(result), np.array(hard)).all()
+    assert stats["restarts"] > 0
+    assert stats["nodes"] >= stats["backtracks"]
+
+
+def test_solve_restarts_reproducible():
+    runs = []
+    for _ in range(2):
+        stats = {}
+        solve_restarts([list(row) for row in hard], seed=7, base=20, stats=stats)
+        runs.append(stats)
+    assert runs[0] == runs[1]
+    other = {}
+    solve_restarts([list(row) for row in hard], seed=8, base=20, stats=other)
+    assert other != runs[0]
+
+
+def test_solve_restarts_unsolvable():
+    unsolvable = [list(row) for row in board]
+    unsolvable[0][2] = 4
+    unsolvable[1][1] = 4
+    unsolvable[0][3] = 0
+    stats = {}
+    assert solve_restarts(unsolvable, base=1, stats=stats) is False
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+@pytest.mark.parametrize("restart", ["luby", "geometric"])
+def test_cython_matches_python(seed, restart):
+    stats = {}
+    solved = solve_restarts([list(row) for row in hard], seed, restart, 30, stats=stats)
+    cython_board = np.array(hard, dtype=np.intc)
+    cython_stats = bt.solve_restarts(cython_board, seed, restart, 30)
+    assert cython_stats["solved"]
+    for key in ("nodes", "backtracks", "restarts"):
+        assert cython_stats[key] == stats[key]
+    assert np.array_equal(cython_board, solved)
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+def test_cython_invalid_policy():
+    with pytest.raises(ValueError):
+        bt.solve_restarts(np.array(board, dtype=np.intc), restart="never")
+    # A factor of 1 would restart forever on a board needing more than base nodes
+    with pytest.raises(ValueError):
+        bt.solve_restarts(
+            np.zeros((9, 9), dtype=np.intc), restart="geometric", base=5, factor=1.0
+        )
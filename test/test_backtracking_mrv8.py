@@ -0,0 +1,144 @@
+# Unit tests for forward checking (forward_check=True) in backtracking_mrv.py, the
+# cythonised bt_mrv module and BoardState.wiped_out/has_wipeout in trail.py
+import random
+
+import numpy as np
+import pytest
+from src.backtracking_mrv import solve_backtrack_MRV
+from src.backends import bt
+from src.trail import BoardState
+from src.utils import parse_grid
+
+with open("test/example_sudokus/hard_sudoku1.txt") as f:
+    hard = parse_grid(f.read()).tolist()
+
+
+def empty_board():
+    return [[0] * 9 for _ in range(9)]
+
+
+def test_wiped_out_cell():
+    board = empty_board()
+    board[0][1:9] = [1, 2, 3, 4, 5, 6, 7, 8]
+    board[1][0] = 9
+    state = BoardState(board)
+    # Cell (0, 0) has no candidates left
+    assert state.wiped_out(1, 0)
+
+
+def test_wiped_out_unit():
+    # The 1s in blocks 0 and 1 leave no cell for a 1 in row 0 (cells (0, 6)-(0, 8)
+    # are filled), although every empty cell of the row still has candidates
+    board = empty_board()
+    board[1][0], board[2][3] = 1, 1
+    board[0][6:9] = [2, 3, 4]
+    state = BoardState(board)
+    assert all(state.candidates(0, j) != 0 for j in range(6))
+    assert state.wiped_out(0, 8)
+
+
+def test_not_wiped_out():
+    state = BoardState([list(row) for row in hard])
+    assert not state.wiped_out(0, 0)
+    assert not state.has_wipeout()
+
+
+def test_has_wipeout():
+    board = empty_board()
+    board[1][0], board[2][3] = 1, 1
+    board[0][6:9] = [2, 3, 4]
+    assert BoardState(board).has_wipeout()
+
+
+def test_wiped_out_matches_full_check():
+    # Random placements of candidates: the check of the changed units agrees with
+    # a check of the whole board as long as there was no wipeout before
+    rng = random.Random(0)
+    for _ in range(50):
+        state = BoardState([list(row) for row in hard])
+        while True:
+            empty = [
+                (i, j) for i in range(9) for j in range(9) if not state.board[i][j]
+            ]
+            if not empty:
+                break
+            i, j = rng.choice(empty)
+            values = [v for v in range(1, 10) if state.candidates(i, j) >> v & 1]
+            state.place(i, j, rng.choice(values))
+            assert state.wiped_out(i, j) == state.has_wipeout()
+            if state.has_wipeout():
+                break
+
+
+def test_forward_check_solves():
+    expected = solve_backtrack_MRV([list(row) for row in hard], 0, 0)
+    stats = {}
+    result = solve_backtrack_MRV(
+        [list(row) for row in hard], 0, 0, stats=stats, forward_check=True
+    )
+    assert result == expected
+    assert stats["wipeouts"] > 0
+
+
+@pytest.mark.parametrize("value_order", ["natural", "lcv"])
+@pytest.mark.parametrize("tie_break", ["scan", "degree"])
+def test_forward_check_prunes(value_order, tie_break):
+    plain, checked = {}, {}
+    solve_backtrack_MRV(
+        [list(row) for row in hard], 0, 0, value_order, tie_break, plain
+    )
+    solve_backtrack_MRV(
+        [list(row) for row in hard],
+        0,
+        0,
+        value_order,
+        tie_break,
+        checked,
+        forward_check=True,
+    )
+    assert checked["nodes"] <= plain["nodes"]
+    assert "wipeouts" not in plain
+
+
+def test_forward_check_unsolvable():
+    # Cells (0, 0) and (0, 1) can only take a 2
+    board = empty_board()
+    board[0][2:9] = [3, 4, 5, 6, 7, 8, 9]
+    board[1][0], board[2][1] = 1, 1
+    assert solve_backtrack_MRV(board, 0, 0, forward_check=True) is False
+
+
+def test_forward_check_wipeout_before_search():
+    board = empty_board()
+    board[1][0], board[2][3] = 1, 1
+    board[0][6:9] = [2, 3, 4]
+    stats = {}
+    assert solve_backtrack_MRV(board, 0, 0, stats=stats, forward_check=True) is False
+    assert stats["nodes"] == 0
+    if bt is not None:
+        cython_stats = bt.solve_with_stats(
+            np.array(board, dtype=np.intc), "natural", "scan", True
+        )
+        assert not cython_stats["solved"] and cython_stats["nodes"] == 0
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+@pytest.mark.parametrize("value_order", ["natural", "lcv"])
+@pytest.mark.parametrize("tie_break", ["scan", "degree"])
+def test_cython_matches_python(value_order, tie_break):
+    stats = {}
+    solved = solve_backtrack_MRV(
+        [list(row) for row in hard],
+        0,
+        0,
+        value_order,
+        tie_break,
+        stats,
+        forward_check=True,
+    )
+    board = np.array(hard, dtype=np.intc)
+    cython_stats = bt.solve_with_stats(board, value_order, tie_break, True)
+    assert cython_stats["solved"]
+    for key in ("nodes", "backtracks", "wipeouts"):
+        assert cython_stats[key] == stats[key]
+    assert board.tolist() == solved
@@ -0,0 +1,101 @@
+# Unit tests for the shared memory batch executor in batch.py
+import numpy as np
+import pytest
+from src.batch import solve_batch
+from src.metrics import BatchMetrics
+from src.utils import verify_solutions
+
+board = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+
+
+def make_batch(n):
+    # Transposes and relabellings of the board are valid puzzles too
+    boards = []
+    for k in range(n):
+        relabelled = np.where(board == 0, 0, (board + k - 1) % 9 + 1)
+        boards.append(relabelled.T if k % 2 else relabelled)
+    return np.array(boards, dtype=np.intc)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_solve_batch(processes):
+    boards = make_batch(7)
+    original = boards.copy()
+    out, status = solve_batch(boards, processes=processes, chunk_size=2)
+    assert out.shape == (7, 9, 9) and out.dtype == np.intc
+    assert status.all()
+    assert verify_solutions(out, boards).all()
+    assert np.array_equal(boards, original)
+
+
+def test_solve_batch_unsolvable():
+    boards = make_batch(3)
+    boards[1, 0, 2] = 5  # clashes with the 5 in the row
+    out, status = solve_batch(boards, processes=2)
+    assert status.tolist() == [True, False, True]
+    assert not out[1].any()
+
+
+def test_solve_batch_python_backend():
+    boards = make_batch(2)
+    out, status = solve_batch(boards, processes=2, backend="python_mrv")
+    assert status.all()
+    assert verify_solutions(out, boards).all()
+
+
+def test_solve_batch_empty():
+    out, status = solve_batch(np.zeros((0, 9, 9), dtype=np.intc))
+    assert out.shape == (0, 9, 9) and status.shape == (0,)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"processes": 0},
+        {"chunk_size": 0},
+        {"backend": "bogus"},
+        {"backend": "bogus", "processes": 2},
+    ],
+)
+def test_solve_batch_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        solve_batch(make_batch(2), **kwargs)
+
+
+def test_solve_batch_bad_shape():
+    with pytest.raises(ValueError):
+        solve_batch(board)
+
+
+@pytest.mark.parametrize(
+    "processes, backend", [(1, None), (2, None), (2, "python_mrv")]
+)
+def test_solve_batch_invalid_boards(processes, backend):
+    boards = make_batch(5)
+    boards[0, 0, 2] = 5  # clashing givens in row 0
+    boards[1, 0, 2] = 12
+    boards[3, 0, 2] = -3
+    boards[4] = 0
+    boards[4, 0, 0] = boards[4, 8, 0] = 7  # clash on an otherwise empty board
+    metrics = BatchMetrics()
+    out, status = solve_batch(
+        boards, processes=processes, backend=backend, metrics=metrics
+    )
+    assert status.tolist() == [False, False, True, False, False]
+    assert not out[[0, 1, 3, 4]].any()
+    assert verify_solutions(out[2], boards[2]).all()
+    snapshot = metrics.snapshot()
+    assert (snapshot["solved"], snapshot["failed"], snapshot["queued"]) == (1, 4, 0)
@@ -0,0 +1,85 @@
+# Node count regression tests for the MRV search heuristics (see benchmark.py)
+import json
+
+import pytest
+from src.benchmark import (
+    BASELINE_PATH,
+    baseline_groups,
+    compare_node_counts,
+    load_baseline,
+    record_node_counts,
+    regression_puzzles,
+    run_group,
+    save_baseline,
+)
+
+try:
+    from src.cython import bt_mrv as bt
+except ImportError:
+    bt = None
+
+baseline = load_baseline()
+puzzles = regression_puzzles()
+
+
+@pytest.mark.parametrize("group", sorted(baseline))
+def test_node_counts_not_regressed(group):
+    if group.startswith("cython/") and bt is None:
+        pytest.skip("bt_mrv extension not compiled")
+    counts = record_node_counts(puzzles, [group])
+    regressions = compare_node_counts({group: baseline[group]}, counts)
+    assert not regressions, (
+        "Node counts regressed (if intended, record a new baseline with "
+        "python src/benchmark.py --record-baseline):\n" + "\n".join(regressions[:20])
+    )
+
+
+def test_baseline_covers_puzzles():
+    assert list(baseline) == baseline_groups()
+    assert set(baseline["cython/natural/scan"]) == set(puzzles)
+    assert set(baseline["cython/restarts/luby"]) == set(puzzles)
+    for group in ("python/lcv/degree/forward_check", "python/backjump", "sat"):
+        assert "example/hard_sudoku3.txt" in baseline[group]
+
+
+def test_run_group():
+    sudoku_board = puzzles["example/hard_sudoku1.txt"]
+    nodes, backtracks = run_group(sudoku_board, "python/natural/scan")
+    assert nodes > backtracks > 0
+    assert run_group(sudoku_board, "python/natural/scan/forward_check")[0] <= nodes
+    for group in ("python/natural/scan/bogus", "python/restarts", "dlx"):
+        with pytest.raises(ValueError):
+            run_group(sudoku_board, group)
+
+
+def test_compare_node_counts():
+    old = {"g": {"a": [100, 10], "b": [50, 5]}}
+    assert compare_node_counts(old, {"g": {"a": [110, 11], "b": [40, 4]}}) == []
+    assert compare_node_counts(old, {"g": {"a": [20, 1], "b": [56, 5]}}) == [
+        "g b: nodes 50 -> 56"
+    ]
+    regressions = compare_node_counts(
+        old, {"g": {"a": [104, 12], "b": [50, 5]}}, tolerance=0.05
+    )
+    assert regressions == ["g a: backtracks 10 -> 12"]
+    assert compare_node_counts(old, {"g": {"a": [100, 10]}}) == ["g b: not recorded"]
+    sat = {"sat": {"a": [0, 0]}}
+    assert compare_node_counts(sat, {"sat": {"a": [1, 0]}}) == [
+        "sat a: decisions 0 -> 1"
+    ]
+
+
+def test_baseline_roundtrip(tmp_path):
+    counts = {"cython/natural/scan": {"x/0": [3, 1], "x/1": [4, 0]}, "p/l/d": {}}
+    path = tmp_path / "counts.json"
+    save_baseline(counts, str(path))
+    assert load_baseline(str(path)) == counts
+    data = json.loads(path.read_text())
+    data["corpus_version"] = 0
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        load_baseline(str(path))
+
+
+def test_baseline_path():
+    assert BASELINE_PATH.endswith("node_counts_v2.json")
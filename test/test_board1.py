@@ -0,0 +1,117 @@
+# Unit tests for the compact Board type in board.py
+import pickle
+import sys
+
+import numpy as np
+import pytest
+from src.backends import solve
+from src.board import Board
+from src.utils import parse_grid, verify_solutions
+
+try:
+    from src.cython import bt_mrv as bt
+except ImportError:
+    bt = None
+
+with open("test/example_sudokus/hard_sudoku1.txt", "r") as f:
+    board = parse_grid(f.read())
+
+
+def test_round_trips():
+    b = Board.from_array(board)
+    assert np.array_equal(b.array(), board)
+    assert np.array_equal(b.to_intc(), board)
+    assert b.to_intc().dtype == np.intc
+    assert b.tolist() == board.tolist()
+    assert Board.from_string(b.to_string()) == b
+    assert Board(b.tobytes()) == b
+    assert Board(board.ravel()) == b
+    assert pickle.loads(pickle.dumps(b)) == b
+    assert b.n_filled() == np.count_nonzero(board)
+
+
+def test_from_string_dots():
+    b = Board.from_string("." * 80 + "9")
+    assert b[8, 8] == 9
+    assert b.n_filled() == 1
+
+
+def test_views_share_bytes():
+    b = Board.from_array(board)
+    view = b.array()
+    view[0, 2] = 4
+    assert b[0, 2] == 4
+    b[0, 3] = 5
+    assert view[0, 3] == 5
+    assert memoryview(b.cells)[3] == 5
+
+
+def test_copy_and_keys():
+    b = Board.from_array(board)
+    c = b.copy()
+    c[0, 2] = 4
+    assert b != c
+    assert b.tobytes() != c.tobytes()
+    assert len({b.tobytes(), b.copy().tobytes()}) == 1
+    with pytest.raises(TypeError):
+        hash(b)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Board(bytes(80))
+    with pytest.raises(ValueError):
+        Board(bytes([10]) + bytes(80))
+    with pytest.raises(ValueError):
+        Board(np.full((9, 9), -1))
+    with pytest.raises(ValueError):
+        Board.from_array(np.zeros((3, 27), dtype=np.intc))
+    with pytest.raises(ValueError):
+        Board.from_string("x" * 81)
+    with pytest.raises(ValueError):
+        Board()[0, 0] = 10
+    with pytest.raises(ValueError, match="integer"):
+        Board(np.full(81, 1.7))
+
+
+@pytest.mark.parametrize("index", [(0, -1), (-1, 0), (0, 9), (9, 0)])
+def test_index_out_of_range(index):
+    b = Board.from_array(board)
+    with pytest.raises(ValueError, match="between 0-8"):
+        b[index]
+    with pytest.raises(ValueError, match="between 0-8"):
+        b[index] = 3
+    assert b == Board.from_array(board)
+
+
+def test_solve_with_backend():
+    b = Board.from_array(board)
+    solved = Board.from_array(solve(b.to_intc(), "python_mrv"))
+    assert verify_solutions(solved.to_intc(), board)[0]
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+def test_solve_cells_in_place():
+    b = Board.from_array(board)
+    assert bt.solve_cells(b.cells)
+    assert verify_solutions(b.array(), board)[0]
+    assert np.array_equal(b.array(), bt.solved_MRV(board.copy(), 0, 0))
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+def test_solve_cells_unsolvable():
+    # The first cell can only be 1, which is already in its column
+    unsolvable = Board.from_string("0" + "23456789" + "1" + "0" * 71)
+    before = unsolvable.tobytes()
+    assert not bt.solve_cells(unsolvable.cells)
+    assert unsolvable.tobytes() == before
+    with pytest.raises(ValueError):
+        bt.solve_cells(bytearray(80))
+    with pytest.raises(ValueError):
+        bt.solve_cells(bytearray([10] * 81))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="PEP 688 buffers")
+def test_board_buffer():
+    b = Board.from_array(board)
+    assert bytes(memoryview(b)) == b.tobytes()
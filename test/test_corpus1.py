@@ -0,0 +1,135 @@
+# Unit tests for the benchmark corpus generator in corpus.py
+import sys
+
+import numpy as np
+import pytest
+from src.backends import available_backends
+from src.corpus import (
+    CORPUS_PATH,
+    TIERS,
+    anti_backtracking,
+    corpus_report,
+    from_string,
+    generate_corpus,
+    is_unique,
+    load_corpus,
+    main,
+    random_transform,
+    remove_clues,
+    save_corpus,
+    to_string,
+    transform,
+    SEVENTEEN_CLUES,
+)
+from src.symmetry import canonical_key
+from src.utils import validate_board
+
+
+def test_transform_preserves_validity_and_uniqueness():
+    rng = np.random.default_rng(0)
+    puzzle = from_string(SEVENTEEN_CLUES[0])
+    for _ in range(5):
+        moved = transform(puzzle, *random_transform(rng))
+        assert validate_board(moved)[0]
+        assert (moved != 0).sum() == 17
+        assert is_unique(moved)
+
+
+def test_seventeen_clues_distinct():
+    puzzles = [from_string(digits) for digits in SEVENTEEN_CLUES]
+    assert len(puzzles) >= 20
+    assert all((puzzle != 0).sum() == 17 for puzzle in puzzles)
+    assert len({canonical_key(puzzle) for puzzle in puzzles}) == len(puzzles)
+
+
+def test_string_roundtrip():
+    puzzle = from_string(SEVENTEEN_CLUES[1])
+    assert to_string(puzzle) == SEVENTEEN_CLUES[1]
+
+
+def test_generate_corpus_deterministic():
+    first = generate_corpus(seed=7, per_tier=1)
+    second = generate_corpus(seed=7, per_tier=1)
+    assert [tier for tier, _, _ in first] == list(TIERS)
+    for (_, puzzle1, solution1), (_, puzzle2, solution2) in zip(first, second):
+        assert np.array_equal(puzzle1, puzzle2)
+        assert np.array_equal(solution1, solution2)
+
+
+def test_generated_puzzles_unique_and_consistent():
+    for tier, puzzle, solution in generate_corpus(seed=3, per_tier=1):
+        assert is_unique(puzzle), tier
+        givens = puzzle != 0
+        assert np.array_equal(puzzle[givens], solution[givens]), tier
+        assert validate_board(solution)[0], tier
+
+
+def test_remove_clues_minimal():
+    rng = np.random.default_rng(1)
+    solution = generate_corpus(seed=1, per_tier=1)[0][2]
+    puzzle = remove_clues(solution, rng)
+    flat = puzzle.reshape(81)
+    # No clue of a minimal puzzle can be removed
+    for idx in np.flatnonzero(flat)[:5]:
+        val = flat[idx]
+        flat[idx] = 0
+        assert not is_unique(puzzle)
+        flat[idx] = val
+
+
+def test_anti_backtracking_top_row():
+    _, puzzle, solution = generate_corpus(seed=5, per_tier=1)[2]
+    puzzle, solution = anti_backtracking(puzzle, solution)
+    assert list(solution[0]) == [9, 8, 7, 6, 5, 4, 3, 2, 1]
+    assert validate_board(solution)[0]
+    assert is_unique(puzzle)
+
+
+def test_save_load_roundtrip(tmp_path):
+    corpus = generate_corpus(seed=11, per_tier=1)
+    path = tmp_path / "corpus.csv"
+    save_corpus(corpus, path, seed=11)
+    loaded = load_corpus(path)
+    assert len(loaded) == len(corpus)
+    for (tier1, puzzle1, solution1), (tier2, puzzle2, solution2) in zip(corpus, loaded):
+        assert tier1 == tier2
+        assert np.array_equal(puzzle1, puzzle2)
+        assert np.array_equal(solution1, solution2)
+
+
+def test_load_version_mismatch(tmp_path):
+    path = tmp_path / "corpus.csv"
+    path.write_text(
+        "# sudoku benchmark corpus version=0 seed=1\ntier,puzzle,solution\n"
+    )
+    with pytest.raises(ValueError):
+        load_corpus(path)
+
+
+def test_shipped_corpus():
+    corpus = load_corpus(CORPUS_PATH)
+    assert {tier for tier, _, _ in corpus} == set(TIERS)
+    seventeen = [puzzle for tier, puzzle, _ in corpus if tier == "seventeen"]
+    classes = {canonical_key(puzzle) for puzzle in seventeen}
+    assert len(classes) == min(len(seventeen), len(SEVENTEEN_CLUES))
+
+
+def test_corpus_report():
+    corpus = generate_corpus(seed=2, per_tier=1)
+    results = corpus_report(corpus, ["python_mrv", "sat"])
+    assert len(results) == 2 * len(TIERS)
+    for result in results:
+        assert result["n"] == 1
+        assert result["mismatches"] == 0
+
+
+def test_report_cli_default_backends(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "corpus.csv"
+    save_corpus(generate_corpus(seed=3, per_tier=1)[:2], path, seed=3)
+    monkeypatch.setattr(sys, "argv", ["corpus.py", "report", str(path)])
+    main()
+    lines = capsys.readouterr().out.splitlines()[2:]
+    assert len(lines) == 2 * len(available_backends())
+    for line in lines:
+        assert line.split()[1] in available_backends()
+        assert line.split()[3] == "0"  # no mismatches
@@ -0,0 +1,98 @@
+# Unit tests for count_solutions and count_solutions_parallel functions in counting.py
+import pytest
+from src.counting import count_solutions, count_solutions_parallel
+
+
+def test_count_solutions_unique():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ]
+    assert count_solutions(sudoku_board) == 1
+    assert sudoku_board[0][2] == 0  # input is not modified
+
+
+def test_count_solutions_multiple():
+    # Solved board with the first two rows removed
+    sudoku_board = [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    # Each column keeps or swaps its two missing values: 4 of these combinations
+    # satisfy every row and box
+    assert count_solutions(sudoku_board) == 4
+
+
+def test_count_solutions_invalid_board():
+    sudoku_board = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 8],  # Duplicate value (8) in the last cell
+    ]
+    assert count_solutions(sudoku_board) == 0
+
+
+def test_count_solutions_limit():
+    empty_board = [[0] * 9 for _ in range(9)]
+    assert count_solutions(empty_board, limit=5) == 5
+    with pytest.raises(ValueError):
+        count_solutions(empty_board, limit=0)
+
+
+def test_count_solutions_parallel_matches_sequential():
+    # Solved board with the first row and part of the next two removed
+    sudoku_board = [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 3, 4, 8],
+        [0, 0, 0, 0, 0, 0, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    expected = count_solutions(sudoku_board)
+    assert count_solutions_parallel(sudoku_board, processes=3) == expected
+
+
+def test_count_solutions_parallel_limit():
+    empty_board = [[0] * 9 for _ in range(9)]
+    assert count_solutions_parallel(empty_board, limit=20, processes=2) == 20
+
+
+def test_count_solutions_full_grid():
+    solved_board = [
+        [5, 3, 4, 6, 7, 8, 9, 1, 2],
+        [6, 7, 2, 1, 9, 5, 3, 4, 8],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ]
+    assert count_solutions(solved_board) == 1
+    assert count_solutions_parallel(solved_board, processes=2) == 1
+    assert count_solutions_parallel(solved_board, limit=1, processes=2) == 1
@@ -0,0 +1,120 @@
+# Unit tests for the quizzes,solutions dataset loader in dataset.py
+import io
+import numpy as np
+import pytest
+from src.backends import available_backends
+from src.dataset import (
+    load_dataset,
+    parse_rows,
+    read_chunks,
+    solve_and_verify,
+    solve_chunk,
+)
+from src.metrics import BatchMetrics
+
+quiz = (
+    "004300209005009001070060043006002087190007400050083000600000105003508690042910300"
+)
+solution = (
+    "864371259325849761971265843436192587198657432257483916689734125713528694542916378"
+)
+wrong = solution[:-2] + "87"
+
+
+def make_csv(rows, header=True, ending="\n"):
+    lines = ["quizzes,solutions"] if header else []
+    lines += [f"{q},{s}" for q, s in rows]
+    return io.BytesIO((ending.join(lines) + ending).encode())
+
+
+def test_parse_rows():
+    quizzes, solutions = parse_rows([f"{quiz},{solution}".encode()])
+    assert quizzes.shape == (1, 9, 9) and solutions.shape == (1, 9, 9)
+    assert quizzes.dtype == np.intc
+    assert list(quizzes[0, 0]) == [0, 0, 4, 3, 0, 0, 2, 0, 9]
+    assert list(solutions[0, 8]) == [5, 4, 2, 9, 1, 6, 3, 7, 8]
+
+
+def test_parse_rows_dots():
+    quizzes, _ = parse_rows([f"{quiz.replace('0', '.')},{solution}".encode()])
+    assert list(quizzes[0, 0]) == [0, 0, 4, 3, 0, 0, 2, 0, 9]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [f"{quiz},{solution[:-1]}", f"{quiz};{solution}", f"{quiz[:-1]}x,{solution}"],
+)
+def test_parse_rows_malformed(line):
+    with pytest.raises(ValueError):
+        parse_rows([line.encode()])
+
+
+def test_read_chunks_sizes():
+    stream = make_csv([(quiz, solution)] * 5, ending="\r\n")
+    sizes = [len(quizzes) for quizzes, _ in read_chunks(stream, chunk_size=2)]
+    # The header line takes up a place in the first chunk
+    assert sum(sizes) == 5
+    assert max(sizes) <= 2
+
+
+def test_load_dataset_limit():
+    quizzes, solutions = load_dataset(make_csv([(quiz, solution)] * 4), limit=3)
+    assert quizzes.shape == (3, 9, 9) and solutions.shape == (3, 9, 9)
+
+
+def test_solve_and_verify():
+    stream = make_csv([(quiz, solution), (quiz, wrong), (quiz, solution)], False)
+    result = solve_and_verify(stream, backend="python_mrv", chunk_size=2)
+    assert result["n"] == 3
+    assert result["mismatches"] == 1
+    assert result["mismatch_rows"] == [1]
+    # The wrong reference solution is reported, but the solver's result is correct
+    assert result["invalid"] == 0
+    assert result["puzzles_per_second"] > 0
+
+
+def test_solve_and_verify_unsolvable():
+    unsolvable = "11" + quiz[2:]
+    result = solve_and_verify(make_csv([(unsolvable, solution)]), backend="sat")
+    assert result["mismatches"] == 1
+    assert result["invalid"] == 1
+
+
+def test_read_chunks_malformed_line_number():
+    rows = [f"{q},{s}" for q, s in [(quiz, solution)] * 4]
+    rows[2] = "# comment"
+    stream = io.BytesIO(("quizzes,solutions\n" + "\n".join(rows) + "\n").encode())
+    with pytest.raises(ValueError, match="line 4"):
+        list(read_chunks(stream, chunk_size=2))
+
+
+def test_read_chunks_bad_value_line_number():
+    stream = make_csv([(quiz, solution), (quiz, "x" + solution[1:])], header=False)
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_chunks(stream))
+
+
+def test_read_chunks_blank_lines():
+    stream = io.BytesIO(f"quizzes,solutions\n\n{quiz},{solution}\n\n".encode())
+    assert [len(quizzes) for quizzes, _ in read_chunks(stream)] == [1]
+
+
+@pytest.mark.skipif(
+    "bt_mrv" not in available_backends(), reason="bt_mrv extension not compiled"
+)
+def test_solve_chunk_bt_mrv_batch():
+    quizzes, solutions = parse_rows([f"{quiz},{solution}".encode()] * 3)
+    quizzes[1, 0, 0] = 12
+    metrics = BatchMetrics()
+    solved = solve_chunk(quizzes, "bt_mrv", metrics)
+    assert np.array_equal(solved[[0, 2]], solutions[[0, 2]])
+    assert not solved[1].any()
+    snapshot = metrics.snapshot()
+    assert (snapshot["solved"], snapshot["failed"]) == (2, 1)
+    assert snapshot["nodes"] > 0
+
+
+def test_solve_chunk_unknown_backend():
+    quizzes, _ = parse_rows([f"{quiz},{solution}".encode()])
+    with pytest.raises(ValueError):
+        solve_chunk(quizzes, "bogus")
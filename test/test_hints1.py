@@ -0,0 +1,75 @@
+# Unit tests for HintState class and next_hint function in hints.py
+import pytest
+from src.hints import HintState, next_hint
+
+board = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+solution = [
+    [5, 3, 4, 6, 7, 8, 9, 1, 2],
+    [6, 7, 2, 1, 9, 5, 3, 4, 8],
+    [1, 9, 8, 3, 4, 2, 5, 6, 7],
+    [8, 5, 9, 7, 6, 1, 4, 2, 3],
+    [4, 2, 6, 8, 5, 3, 7, 9, 1],
+    [7, 1, 3, 9, 2, 4, 8, 5, 6],
+    [9, 6, 1, 5, 3, 7, 2, 8, 4],
+    [2, 8, 7, 4, 1, 9, 6, 3, 5],
+    [3, 4, 5, 2, 8, 6, 1, 7, 9],
+]
+
+
+def test_next_hint_naked_single():
+    hint = next_hint(board)
+    # [4][4] can only be 5 (row 4, column 4 and the centre block hold the rest)
+    assert (hint.i, hint.j, hint.value) == (4, 4, 5)
+    assert hint.technique == "naked single" and hint.unit is None
+
+
+def test_hints_solve_board():
+    state = HintState(board)
+    while True:
+        hint = state.next_hint()
+        if hint is None:
+            break
+        assert solution[hint.i][hint.j] == hint.value
+        state.apply(hint)
+    assert state.board == [val for row in solution for val in row]
+
+
+def test_hint_pointing():
+    # hard_sudoku2.txt gets stuck on singles until pointing eliminations are made
+    puzzle = [
+        [8, 5, 0, 0, 0, 2, 4, 0, 0],
+        [7, 2, 0, 0, 0, 0, 0, 0, 9],
+        [0, 0, 4, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 0, 7, 0, 0, 2],
+        [3, 0, 5, 0, 0, 0, 9, 0, 0],
+        [0, 4, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 8, 0, 0, 7, 0],
+        [0, 1, 7, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 3, 6, 0, 4, 0],
+    ]
+    state = HintState(puzzle)
+    hint = state.next_hint()
+    while not hint.eliminations:
+        state.apply(hint)
+        hint = state.next_hint()
+    technique, unit, val, cells = hint.eliminations[0]
+    assert technique == "pointing" and unit == "block 3" and val == 2
+    assert cells == ((5, 3), (5, 4))
+    assert all(not state.candidates[i * 9 + j] >> val & 1 for i, j in cells)
+
+
+def test_hint_contradiction():
+    state = HintState([[1, 2, 3, 4, 5, 6, 7, 8, 0]] + [[0] * 9] * 8)
+    state.place(8, 8, 9)
+    with pytest.raises(ValueError):
+        state.next_hint()
@@ -0,0 +1,156 @@
+# Unit tests for the batch run metrics in metrics.py
+import io
+import math
+
+import numpy as np
+import pytest
+from src.batch import solve_batch
+from src.dataset import solve_chunk
+from src.metrics import (
+    BatchMetrics,
+    Histogram,
+    MetricsReporter,
+    progress_line,
+    to_prometheus,
+    write_prometheus,
+)
+
+try:
+    from src.cython import bt_mrv as bt
+except ImportError:
+    bt = None
+
+board = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+unsolvable = board.copy()
+unsolvable[0, 2] = 5
+
+
+def test_histogram():
+    hist = Histogram((0.1, 1.0, 10.0))
+    hist.observe(0.05, 3)
+    hist.observe(0.5)
+    hist.observe(100.0)
+    assert hist.count == 5
+    assert hist.sum == pytest.approx(100.65)
+    assert hist.cumulative() == [(0.1, 3), (1.0, 4), (10.0, 4), (math.inf, 5)]
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.8) == 1.0
+    assert hist.quantile(1.0) == 10.0
+    assert math.isnan(Histogram().quantile(0.5))
+    with pytest.raises(ValueError):
+        Histogram((1.0, 0.5))
+
+
+def test_record_and_snapshot():
+    metrics = BatchMetrics(total=10)
+    metrics.set_queued(10)
+    metrics.record([0.001, 0.001, 0.001, 0.3], failed=1, nodes=100)
+    metrics.record(np.array([0.2, 0.001]))
+    metrics.record([])
+    snap = metrics.snapshot()
+    assert (snap["solved"], snap["failed"]) == (5, 1)
+    assert snap["done"] == 6
+    assert snap["nodes"] == 100
+    assert snap["queued"] == 4
+    assert snap["latency_count"] == 6
+    assert snap["p50"] == 0.001
+    # The slow puzzle of a chunk is not averaged away
+    assert snap["p99"] == 0.5
+    assert snap["puzzles_per_second"] > 0
+
+
+def test_prometheus_text(tmp_path):
+    metrics = BatchMetrics()
+    metrics.record([0.001] * 3, failed=1, nodes=42)
+    text = to_prometheus(metrics, prefix="test")
+    lines = text.splitlines()
+    assert 'test_puzzles_total{status="solved"} 2' in lines
+    assert 'test_puzzles_total{status="failed"} 1' in lines
+    assert "timeout" not in text
+    assert "test_search_nodes_total 42" in lines
+    assert "# TYPE test_puzzle_latency_seconds histogram" in lines
+    assert 'test_puzzle_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_puzzle_latency_seconds_count 3" in lines
+    # Every sample line is "name{labels} value"
+    for line in lines:
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            assert name.startswith("test_")
+            float(value)
+
+    path = tmp_path / "sudoku.prom"
+    write_prometheus(metrics, str(path))
+    assert path.read_text().startswith("# HELP sudoku_puzzles_total")
+    assert [p.name for p in tmp_path.iterdir()] == ["sudoku.prom"]
+
+
+def test_progress_line():
+    metrics = BatchMetrics(total=8)
+    metrics.set_queued(8)
+    metrics.record([0.0025] * 4, failed=1)
+    line = progress_line(metrics, rate=12.5)
+    assert line.startswith("4/8 puzzles | 12.5/s (avg ")
+    assert "4 queued" in line
+    assert "1 failed" in line
+
+
+def test_reporter(tmp_path):
+    path = tmp_path / "sudoku.prom"
+    stream = io.StringIO()
+    metrics = BatchMetrics(total=3)
+    with MetricsReporter(
+        metrics, str(path), interval=0.01, progress=True, stream=stream
+    ):
+        solve_batch(np.array([board, unsolvable, board]), processes=1, metrics=metrics)
+    assert 'sudoku_puzzles_total{status="failed"} 1' in path.read_text()
+    assert stream.getvalue().endswith("\n")
+    assert stream.getvalue().split("\r")[-1].startswith("3/3 puzzles")
+    with pytest.raises(ValueError):
+        MetricsReporter(metrics, interval=0)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_metrics(processes):
+    boards = np.array([board, unsolvable] * 4)
+    metrics = BatchMetrics()
+    _, status = solve_batch(boards, processes=processes, chunk_size=3, metrics=metrics)
+    snap = metrics.snapshot()
+    assert snap["solved"] == 4
+    assert snap["failed"] == 4
+    assert snap["queued"] == 0
+    assert snap["latency_count"] == 8
+    assert snap["latency_sum"] > 0
+    if bt is not None:
+        assert snap["nodes"] > 0
+
+
+@pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+def test_threaded_metrics():
+    from src.threaded import ThreadPoolSolver
+
+    metrics = BatchMetrics()
+    with ThreadPoolSolver(2) as solver:
+        solver.solve_batch(np.array([board, unsolvable, board]), metrics=metrics)
+    snap = metrics.snapshot()
+    assert (snap["solved"], snap["failed"]) == (2, 1)
+    assert snap["nodes"] > 0
+
+
+def test_dataset_metrics():
+    metrics = BatchMetrics()
+    solve_chunk(np.array([board, unsolvable]), "python_mrv", metrics)
+    snap = metrics.snapshot()
+    assert (snap["solved"], snap["failed"], snap["queued"]) == (1, 1, 0)
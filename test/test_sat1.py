@@ -0,0 +1,114 @@
+# Unit tests for luby, encode_sudoku, CDCLSolver and solved_SAT in sat.py
+from itertools import combinations
+import numpy as np
+import pytest
+from src.sat import luby, encode_sudoku, CDCLSolver, solved_SAT
+
+
+def test_luby():
+    assert [luby(i) for i in range(1, 16)] == [
+        1,
+        1,
+        2,
+        1,
+        1,
+        2,
+        4,
+        1,
+        1,
+        2,
+        1,
+        1,
+        2,
+        4,
+        8,
+    ]
+    with pytest.raises(ValueError):
+        luby(0)
+
+
+def test_cdcl_solver_sat():
+    # (x1 or x2) and (not x1 or x3) and (not x2 or not x3) and (x1 or x3)
+    clauses = [[1, 2], [-1, 3], [-2, -3], [1, 3]]
+    solver = CDCLSolver(3, clauses)
+    assert solver.solve() is True
+    model = set(solver.model())
+    assert model == {1, 3}
+
+
+def test_cdcl_solver_unsat():
+    # Pigeonhole: 3 pigeons, 2 holes (x_ph = 2 * (p - 1) + h)
+    clauses = [[1, 2], [3, 4], [5, 6]]
+    for hole in (1, 2):
+        pigeons = [2 * p + hole for p in range(3)]
+        clauses += [[-a, -b] for a, b in combinations(pigeons, 2)]
+    solver = CDCLSolver(6, clauses)
+    assert solver.solve() is False
+    assert solver.stats["conflicts"] > 0
+
+
+def test_encode_sudoku_compact():
+    full_board = np.array(
+        [
+            [5, 3, 4, 6, 7, 8, 9, 1, 2],
+            [6, 7, 2, 1, 9, 5, 3, 4, 8],
+            [1, 9, 8, 3, 4, 2, 5, 6, 7],
+            [8, 5, 9, 7, 6, 1, 4, 2, 3],
+            [4, 2, 6, 8, 5, 3, 7, 9, 1],
+            [7, 1, 3, 9, 2, 4, 8, 5, 6],
+            [9, 6, 1, 5, 3, 7, 2, 8, 4],
+            [2, 8, 7, 4, 1, 9, 6, 3, 5],
+            [3, 4, 5, 2, 8, 6, 1, 7, 9],
+        ]
+    )
+    n_vars, clauses, var_map = encode_sudoku(full_board)
+    assert n_vars == 0 and clauses == []
+
+    full_board[0][0] = 0
+    n_vars, clauses, var_map = encode_sudoku(full_board)
+    assert n_vars == 1 and var_map == {1: (0, 0, 5)}
+
+
+def test_solved_SAT_valid_board():
+    sudoku_board = np.array(
+        [
+            [0, 0, 0, 0, 0, 0, 0, 1, 0],  # 17 clue puzzle
+            [4, 0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 2, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 5, 0, 4, 0, 7],
+            [0, 0, 8, 0, 0, 0, 3, 0, 0],
+            [0, 0, 1, 0, 9, 0, 0, 0, 0],
+            [3, 0, 0, 4, 0, 0, 2, 0, 0],
+            [0, 5, 0, 1, 0, 0, 0, 0, 0],
+            [0, 0, 0, 8, 0, 6, 0, 0, 0],
+        ],
+        dtype=np.intc,
+    )
+    stats = {}
+    solution = solved_SAT(sudoku_board, stats)
+    for k in range(9):
+        assert sorted(solution[k]) == list(range(1, 10))  # rows
+        assert sorted(solution[:, k]) == list(range(1, 10))  # columns
+        block = solution.reshape(3, 3, 3, 3).transpose(0, 2, 1, 3).reshape(9, 9)[k]
+        assert sorted(block) == list(range(1, 10))  # blocks
+    assert np.all((sudoku_board == 0) | (sudoku_board == solution))  # givens kept
+    assert stats["vars"] > 0
+
+
+def test_solved_SAT_invalid_board():
+    grid = np.array(
+        [
+            [5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 8],  # Duplicate value (8) in the last cell
+        ],
+        dtype=np.intc,
+    )
+    with pytest.raises(ValueError):
+        solved_SAT(grid)
@@ -0,0 +1,58 @@
+# Unit tests for SolverSession class in session.py
+import numpy as np
+import pytest
+from src.session import SolverSession
+from src.utils import validate_board
+
+board = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+
+def check_solution(session, solution):
+    givens = session.givens
+    assert validate_board(solution)[0] and np.all(solution != 0)
+    assert np.all(solution[givens != 0] == givens[givens != 0])
+
+
+def test_session_reuse():
+    session = SolverSession(board, backend="python_mrv")
+    solution = session.solve()
+    check_solution(session, solution)
+    assert session.last_mode == "full"
+
+    # Removing a given or adding a value the solution already has: no search
+    assert np.array_equal(session.clear_cell(0, 0), solution)
+    assert np.array_equal(session.set_cell(0, 2, int(solution[0, 2])), solution)
+    assert session.last_mode == "reused" and session.stats["reused"] == 2
+
+
+def test_session_repair():
+    session = SolverSession(np.zeros((9, 9), dtype=np.intc), backend="python_mrv")
+    solution = session.solve()
+    val = int(solution[0, 1])
+    new_solution = session.set_cell(0, 0, val)
+    check_solution(session, new_solution)
+    assert session.last_mode in ("digits", "band")
+    assert new_solution[0, 0] == val
+
+
+def test_session_unsolvable_edit():
+    session = SolverSession(board, backend="python_mrv")
+    session.solve()
+    with pytest.raises(ValueError):
+        session.set_cell(0, 2, 5)  # clashes with given [0][0]
+    assert session.solution is None
+    check_solution(session, session.clear_cell(0, 2))
+    with pytest.raises(ValueError):
+        session.set_cell(9, 0, 1)
+    with pytest.raises(ValueError):
+        SolverSession([[1] * 9] + [[0] * 9] * 8)
@@ -0,0 +1,110 @@
+# Unit tests for the symmetry-aware deduplication in symmetry.py
+import numpy as np
+import pytest
+from src.corpus import random_transform, transform as corpus_transform
+from src.symmetry import (
+    canonical_form,
+    canonical_key,
+    solve_deduplicated,
+    transform,
+    untransform,
+)
+from src.utils import verify_solutions
+
+board = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+
+
+def isomorphic_copies(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [corpus_transform(board, *random_transform(rng)) for _ in range(n)]
+
+
+def test_isomorphic_boards_share_key():
+    key = canonical_key(board)
+    for copy in isomorphic_copies(5):
+        assert canonical_key(copy) == key
+
+
+def test_different_boards_have_different_keys():
+    other = board.copy()
+    other[0, 2] = 4
+    assert canonical_key(other) != canonical_key(board)
+
+
+def test_transform_round_trip():
+    canonical, trans = canonical_form(board)
+    assert canonical.dtype == np.intc
+    assert np.array_equal(transform(board, trans), canonical)
+    assert np.array_equal(untransform(canonical, trans), board)
+
+
+def test_sparse_board():
+    # Too many symmetries: only relabelled, still isomorphic to the board
+    sparse = np.zeros((9, 9), dtype=np.intc)
+    sparse[4, 4] = 7
+    canonical, trans = canonical_form(sparse)
+    assert np.count_nonzero(canonical) == 1
+    assert np.array_equal(untransform(canonical, trans), sparse)
+
+
+def test_solve_deduplicated():
+    unsolvable = board.copy()
+    unsolvable[0, 2] = 5  # clashes with the 5 in the row
+    boards = np.array(isomorphic_copies(6) + [unsolvable], dtype=np.intc)
+    original = boards.copy()
+    out, status, stats = solve_deduplicated(boards)
+    assert stats == {"boards": 7, "classes": 2, "ratio": 3.5, "relabelled": 0}
+    assert status.tolist() == [True] * 6 + [False]
+    assert verify_solutions(out[:6], boards[:6]).all()
+    assert not out[6].any()
+    assert np.array_equal(boards, original)
+
+
+def test_solve_deduplicated_counts_relabelled():
+    # Isomorphic sparse boards are only relabelled, so they are not merged
+    sparse = np.zeros((3, 9, 9), dtype=np.intc)
+    sparse[0, 4, 4] = sparse[1, 0, 0] = 7
+    sparse[2, 0, 0] = 3
+    _, status, stats = solve_deduplicated(sparse, backend="python_mrv")
+    assert status.all()
+    assert stats["relabelled"] == 3
+    assert stats["classes"] == 2
+
+
+def test_solve_deduplicated_batch_solver():
+    calls = []
+
+    def batch_solver(canonical):
+        calls.append(len(canonical))
+        return solve_deduplicated(canonical, backend="python_mrv")[:2]
+
+    boards = np.array(isomorphic_copies(4), dtype=np.intc)
+    out, status, _ = solve_deduplicated(boards, batch_solver=batch_solver)
+    assert calls == [1]
+    assert status.all() and verify_solutions(out, boards).all()
+
+
+@pytest.mark.parametrize(
+    "bad", [np.zeros((9, 8), dtype=np.intc), np.full((9, 9), 10, dtype=np.intc)]
+)
+def test_canonical_form_bad_board(bad):
+    with pytest.raises(ValueError):
+        canonical_form(bad)
+
+
+def test_solve_deduplicated_bad_shape():
+    with pytest.raises(ValueError):
+        solve_deduplicated(board)
@@ -0,0 +1,26 @@
+# Unit tests for the precomputed lookup tables in tables.py
+from src.tables import UNITS, CELL_UNITS, CELL_BOX, PEERS, PEER_POSITIONS
+
+
+def test_units():
+    assert len(UNITS) == 27
+    for unit in UNITS:
+        assert sorted(unit) == sorted(set(unit))
+        assert len(unit) == 9
+
+
+def test_cell_units():
+    for idx in range(81):
+        row, col, box = CELL_UNITS[idx]
+        assert UNITS[row] == tuple(range(idx // 9 * 9, idx // 9 * 9 + 9))
+        assert idx in UNITS[col] and idx in UNITS[box]
+        assert box == 18 + CELL_BOX[idx]
+
+
+def test_peers():
+    for idx in range(81):
+        assert len(PEERS[idx]) == 20
+        assert len(set(PEERS[idx])) == 20
+        assert idx not in PEERS[idx]
+    assert PEER_POSITIONS[4][4] == tuple(divmod(p, 9) for p in PEERS[40])
+    assert (3, 3) in PEER_POSITIONS[4][4] and (0, 0) not in PEER_POSITIONS[4][4]
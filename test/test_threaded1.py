@@ -0,0 +1,140 @@
+# Unit tests for ThreadPoolSolver in threaded.py and the bt_mrv.solve_batch kernel
+import numpy as np
+import pytest
+from src.metrics import BatchMetrics
+from src.threaded import ThreadPoolSolver, bt
+from src.utils import verify_solutions
+
+pytestmark = pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+
+board = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+unsolvable = board.copy()
+unsolvable[0, 2] = 5
+
+
+def make_batch(n):
+    boards = []
+    for k in range(n):
+        relabelled = np.where(board == 0, 0, (board + k - 1) % 9 + 1)
+        boards.append(relabelled.T if k % 2 else relabelled)
+    return np.array(boards, dtype=np.intc)
+
+
+def test_bt_solve_batch_kernel():
+    boards = make_batch(4)
+    boards[2] = unsolvable
+    out = np.full(boards.shape, -1, dtype=np.intc)
+    status = np.zeros(4, dtype=np.uint8)
+    assert bt.solve_batch(boards, out, status) == 1
+    assert status.tolist() == [1, 1, 0, 1]
+    assert not out[2].any()
+    assert verify_solutions(out[[0, 1, 3]], boards[[0, 1, 3]]).all()
+
+
+def test_bt_solve_batch_kernel_seconds():
+    boards = make_batch(3)
+    out = np.empty(boards.shape, dtype=np.intc)
+    status = np.zeros(3, dtype=np.uint8)
+    seconds = np.full(3, -1.0)
+    assert bt.solve_batch(boards, out, status, seconds=seconds) == 0
+    assert (seconds >= 0).all() and (seconds < 10).all()
+
+
+def test_bt_solve_batch_kernel_bad_shapes():
+    boards = make_batch(2)
+    with pytest.raises(ValueError):
+        bt.solve_batch(boards, np.zeros((3, 9, 9), np.intc), np.zeros(2, np.uint8))
+    with pytest.raises(ValueError):
+        bt.solve_batch(
+            boards,
+            np.zeros((2, 9, 9), np.intc),
+            np.zeros(2, np.uint8),
+            seconds=np.zeros(3),
+        )
+
+
+def test_submit_and_map():
+    with ThreadPoolSolver(max_workers=3) as pool:
+        solved = pool.submit(board.tolist()).result()
+        assert verify_solutions(solved, board).all()
+        results = list(pool.map(make_batch(5)))
+        assert verify_solutions(np.array(results), make_batch(5)).all()
+        with pytest.raises(ValueError):
+            pool.submit(unsolvable).result()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 4, 100])
+def test_solve_batch(chunk_size):
+    boards = make_batch(9)
+    boards[4] = unsolvable
+    with ThreadPoolSolver(max_workers=4, tie_break="degree") as pool:
+        out, status = pool.solve_batch(boards, chunk_size=chunk_size)
+    assert status.tolist() == [k != 4 for k in range(9)]
+    assert verify_solutions(out[status], boards[status]).all()
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        ThreadPoolSolver(max_workers=0)
+    with ThreadPoolSolver(max_workers=1) as pool:
+        with pytest.raises(ValueError):
+            pool.solve_batch(board)
+        with pytest.raises(ValueError):
+            pool.solve_batch(make_batch(2), chunk_size=0)
+
+
+def test_bt_solve_batch_kernel_invalid_boards():
+    boards = make_batch(5)
+    boards[0, 0, :3] = [5, 5, 4]  # clashing givens in row 0
+    boards[1, 0, 2] = 12
+    boards[2, 0, 2] = -3
+    boards[3] = 0
+    boards[3, 0, 0] = boards[3, 8, 0] = 7  # clash on an otherwise empty board
+    out = np.full(boards.shape, -1, dtype=np.intc)
+    status = np.ones(5, dtype=np.uint8)
+    assert bt.solve_batch(boards, out, status) == 4
+    assert status.tolist() == [0, 0, 0, 0, 1]
+    assert not out[:4].any()
+    assert verify_solutions(out[4:], boards[4:]).all()
+
+
+def test_bt_solve_into_invalid_boards():
+    out = np.empty((9, 9), dtype=np.intc)
+    for value in [12, -3]:
+        invalid = board.copy()
+        invalid[0, 2] = value
+        with pytest.raises(ValueError, match="0-9"):
+            bt.solve_into(invalid, out)
+    sparse = np.zeros((9, 9), dtype=np.intc)
+    sparse[0, 0] = sparse[0, 8] = 5
+    with pytest.raises(ValueError, match="cannot be solved"):
+        bt.solve_into(sparse, out)
+    assert not bt.solve_with_stats(sparse.copy())["solved"]
+    assert not bt.solve_restarts(sparse.copy())["solved"]
+
+
+def test_solve_batch_invalid_boards():
+    boards = make_batch(4)
+    boards[0, 0, 2] = 12
+    boards[2, 0, 2] = -3
+    boards[3] = 0
+    boards[3, 0, 0] = boards[3, 0, 8] = 4
+    metrics = BatchMetrics()
+    with ThreadPoolSolver(max_workers=2) as pool:
+        out, status = pool.solve_batch(boards, chunk_size=1, metrics=metrics)
+    assert status.tolist() == [False, True, False, False]
+    assert not out[[0, 2, 3]].any()
+    assert metrics.snapshot()["failed"] == 3
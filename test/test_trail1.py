@@ -0,0 +1,35 @@
+# Unit tests for Trail and BoardState classes in trail.py
+from src.trail import ALL_VALUES, BoardState, Trail
+
+
+def test_trail_mark_undo():
+    data = [0, 0, 0]
+    table = {"a": 1}
+    trail = Trail()
+    trail.set(data, 0, 5)
+    mark = trail.mark()
+    trail.set(data, 1, 6)
+    trail.set(data, 1, 7)
+    trail.set(table, "a", 2)
+    assert data == [5, 7, 0] and table == {"a": 2} and len(trail) == 4
+    trail.undo(mark)
+    assert data == [5, 0, 0] and table == {"a": 1} and len(trail) == 1
+    trail.undo()
+    assert data == [0, 0, 0] and len(trail) == 0
+
+
+def test_board_state_place_undo():
+    board = [[0] * 9 for _ in range(9)]
+    board[0][0] = 1
+    state = BoardState(board)
+    assert state.candidates(0, 5) == ALL_VALUES & ~(1 << 1)
+    assert state.candidates(4, 4) == ALL_VALUES
+
+    mark = state.mark()
+    state.place(4, 4, 9)
+    assert board[4][4] == 9
+    assert not state.candidates(4, 0) >> 9 & 1  # same row
+    assert not state.candidates(3, 3) >> 9 & 1  # same block
+    assert state.candidates(0, 0) >> 9 & 1  # unrelated cell
+    state.undo(mark)
+    assert board[4][4] == 0 and state.candidates(4, 4) == ALL_VALUES
@@ -0,0 +1,68 @@
+# Unit tests for render_boards, write_boards and array inputs of utils.py
+import io
+
+import numpy as np
+import pytest
+
+from src.utils import display_sudoku, render_boards, validate_board, write_boards
+
+board = [
+    [0, 0, 0, 0, 0, 7, 0, 0, 0],
+    [0, 0, 0, 0, 0, 9, 5, 0, 4],
+    [0, 0, 0, 0, 5, 0, 1, 6, 9],
+    [0, 8, 0, 0, 0, 3, 0, 5, 0],
+    [0, 7, 5, 0, 0, 0, 2, 9, 0],
+    [4, 0, 6, 0, 0, 0, 0, 8, 0],
+    [7, 6, 2, 0, 8, 0, 0, 0, 0],
+    [1, 0, 3, 9, 0, 0, 0, 0, 0],
+    [0, 0, 0, 6, 0, 0, 0, 0, 0],
+]
+
+
+def test_render_boards_boxed():
+    boards = np.array([board, board], dtype=np.intc)
+    assert render_boards(boards).decode() == display_sudoku(board) * 2
+
+
+def test_render_boards_line():
+    expected = "".join(str(val) for row in board for val in row) + "\n"
+    assert render_boards(np.array(board), style="line").decode() == expected
+
+
+def test_render_boards_repeated_rows():
+    # separators depend on the row position, not on the row contents
+    boards = np.zeros((1, 9, 9), dtype=np.intc)
+    assert render_boards(boards).decode().count("---+---+---") == 2
+
+
+def test_render_boards_invalid():
+    with pytest.raises(ValueError):
+        render_boards(np.full((9, 9), 10))
+    with pytest.raises(ValueError):
+        render_boards(np.zeros((8, 9)))
+    with pytest.raises(ValueError):
+        render_boards(np.zeros((9, 9)), style="fancy")
+
+
+def test_write_boards_chunks():
+    boards = np.random.default_rng(0).integers(0, 10, (10, 9, 9))
+    stream = io.BytesIO()
+    written = write_boards(boards, stream, style="line", chunk_size=3)
+    assert written == 10 * 82
+    assert stream.getvalue() == render_boards(boards, style="line")
+
+
+def test_display_sudoku_array_and_memoryview():
+    array = np.array(board, dtype=np.intc)
+    assert display_sudoku(array) == display_sudoku(board)
+    assert display_sudoku(memoryview(array)) == display_sudoku(board)
+    with pytest.raises(ValueError):
+        display_sudoku(np.full((9, 9), 10, dtype=np.intc))
+    with pytest.raises(TypeError):
+        display_sudoku(np.zeros((9, 9)))
+
+
+def test_validate_board_memoryview():
+    array = np.array(board, dtype=np.intc)
+    array[0, 0] = 7  # clashes with [0][5] and [6][0]
+    assert validate_board(memoryview(array)) == (False, [(0, 5), (6, 0)])
@@ -0,0 +1,80 @@
+# Unit tests for verify_solutions in utils.py
+import numpy as np
+import pytest
+from src.utils import verify_solutions
+
+puzzle = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+solution = np.array(
+    [
+        [5, 3, 4, 6, 7, 8, 9, 1, 2],
+        [6, 7, 2, 1, 9, 5, 3, 4, 8],
+        [1, 9, 8, 3, 4, 2, 5, 6, 7],
+        [8, 5, 9, 7, 6, 1, 4, 2, 3],
+        [4, 2, 6, 8, 5, 3, 7, 9, 1],
+        [7, 1, 3, 9, 2, 4, 8, 5, 6],
+        [9, 6, 1, 5, 3, 7, 2, 8, 4],
+        [2, 8, 7, 4, 1, 9, 6, 3, 5],
+        [3, 4, 5, 2, 8, 6, 1, 7, 9],
+    ],
+    dtype=np.intc,
+)
+
+
+def test_verify_single_board():
+    assert verify_solutions(solution).tolist() == [True]
+    assert verify_solutions(solution, puzzle).tolist() == [True]
+
+
+def test_verify_detects_errors():
+    boards = np.repeat(solution[None], 6, axis=0)
+    boards[1, 0, 0] = 0  # empty cell
+    boards[2, 0, :] = solution[0, ::-1]  # columns and blocks broken
+    boards[3] = solution.T  # valid grid, but not the givens
+    boards[4, 0, 0] = 15  # out of range
+    boards[5, 0, 0] = -5
+    result = verify_solutions(boards, np.repeat(puzzle[None], 6, axis=0))
+    assert result.tolist() == [True, False, False, False, False, False]
+    # Without puzzles the transposed grid is a correct solution
+    assert verify_solutions(boards[3]).tolist() == [True]
+
+
+def test_verify_swapped_rows_within_band():
+    # Swapping two rows of a band keeps rows, columns and blocks valid
+    swapped = solution[[1, 0, 2, 3, 4, 5, 6, 7, 8]]
+    assert verify_solutions(swapped).tolist() == [True]
+    assert verify_solutions(swapped, puzzle).tolist() == [False]
+
+
+def test_verify_chunks_and_dtypes():
+    boards = np.repeat(solution[None], 10, axis=0).astype(np.int64)
+    boards[7, 4, 4] = boards[7, 4, 5]
+    result = verify_solutions(boards, chunk_size=3)
+    assert result.tolist() == [k != 7 for k in range(10)]
+
+
+def test_verify_empty():
+    assert verify_solutions(np.zeros((0, 9, 9), dtype=np.intc)).shape == (0,)
+
+
+@pytest.mark.parametrize("shape", [(81,), (9, 8), (2, 2, 9, 9)])
+def test_verify_bad_shape(shape):
+    with pytest.raises(ValueError):
+        verify_solutions(np.ones(shape, dtype=np.intc))
+
+
+def test_verify_mismatched_puzzles():
+    with pytest.raises(ValueError):
+        verify_solutions(np.repeat(solution[None], 2, axis=0), puzzle)
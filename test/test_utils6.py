@@ -0,0 +1,52 @@
+# Unit tests for validate_boards in utils.py
+import numpy as np
+import pytest
+from src.utils import validate_board, validate_boards
+
+puzzle = np.array(
+    [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9],
+    ],
+    dtype=np.intc,
+)
+
+
+def test_validate_single_board():
+    assert validate_boards(puzzle).tolist() == [True]
+    assert validate_boards(np.zeros((9, 9), dtype=np.intc)).tolist() == [True]
+
+
+def test_validate_detects_errors():
+    boards = np.repeat(puzzle[None], 6, axis=0)
+    boards[1, 0, 2] = 5  # repeated in the row
+    boards[2, 2, 0] = 6  # repeated in the column
+    boards[3, 1, 1] = 9  # repeated in the block
+    boards[4, 0, 2] = 12
+    boards[5, 0, 2] = -3
+    assert validate_boards(boards).tolist() == [True] + [False] * 5
+
+
+def test_validate_matches_validate_board():
+    rng = np.random.default_rng(0)
+    boards = rng.integers(0, 10, size=(200, 9, 9)) * (rng.random((200, 9, 9)) < 0.2)
+    expected = [validate_board(board)[0] for board in boards]
+    assert 0 < sum(expected) < 200
+    assert validate_boards(boards, chunk_size=7).tolist() == expected
+
+
+def test_validate_empty():
+    assert validate_boards(np.zeros((0, 9, 9), dtype=np.intc)).shape == (0,)
+
+
+@pytest.mark.parametrize("shape", [(81,), (9, 8), (2, 2, 9, 9)])
+def test_validate_bad_shape(shape):
+    with pytest.raises(ValueError):
+        validate_boards(np.ones(shape, dtype=np.intc))
@@ -0,0 +1,147 @@
+# Unit tests for the sudoku variants in variants.py and the generic unit tables
+import numpy as np
+import pytest
+from src.backtracking_mrv import solve_backtrack_MRV
+from src.tables import UnitTables, STANDARD_TABLES, PEERS, CELL_UNITS
+from src.utils import validate_board, verify_solutions
+from src.variants import (
+    DIAGONALS,
+    STANDARD,
+    WINDOKU,
+    X_SUDOKU,
+    get_variant,
+    jigsaw,
+    parse_regions,
+    solve,
+)
+
+try:
+    from src.cython import bt_mrv as bt
+except ImportError:
+    bt = None
+
+needs_bt = pytest.mark.skipif(bt is None, reason="bt_mrv extension not compiled")
+
+REGION_MAP = """
+# Jigsaw regions
+AAABBBCCC
+AABBBBCCC
+AAAABBCCC
+DDDEEEFFF
+DDEEEEFFF
+DDDDEEFFF
+GGGHHHIII
+GGGHHHIII
+GGGHHHIII
+"""
+
+JIGSAW = jigsaw(REGION_MAP)
+
+
+def puzzle_of(variant, seed=0, holes=45):
+    """
+    Solve an empty grid of the variant, relabel the values at random and remove
+    cells at random.
+    """
+    rng = np.random.default_rng(seed)
+    board = [[0] * 9 for _ in range(9)]
+    assert solve_backtrack_MRV(board, 0, 0, units=variant.tables) is not False
+    digits = np.concatenate([[0], rng.permutation(9) + 1]).astype(np.intc)
+    solution = digits[np.array(board)]
+    puzzle = solution.copy()
+    puzzle.flat[rng.choice(81, holes, replace=False)] = 0
+    return puzzle, solution
+
+
+def test_standard_tables():
+    assert STANDARD_TABLES.peers == PEERS
+    assert STANDARD_TABLES.cell_units == CELL_UNITS
+
+
+def test_unit_tables_invalid():
+    with pytest.raises(ValueError):
+        UnitTables([tuple(range(8))])
+    with pytest.raises(ValueError):
+        UnitTables([(0,) * 9])
+    with pytest.raises(ValueError):
+        UnitTables([tuple(range(73, 82))])
+
+
+@needs_bt
+def test_bt_unit_tables_invalid():
+    with pytest.raises(ValueError):
+        bt.UnitTables([tuple(range(8))])
+    with pytest.raises(ValueError):
+        bt.UnitTables([tuple(range(9))] * 9)
+    assert len(bt.UnitTables(X_SUDOKU.units)) == 29
+
+
+def test_parse_regions():
+    regions = parse_regions(REGION_MAP)
+    assert len(regions) == 9
+    assert sorted(idx for region in regions for idx in region) == list(range(81))
+    assert regions[0] == (0, 1, 2, 9, 10, 18, 19, 20, 21)
+
+
+def test_parse_regions_invalid():
+    with pytest.raises(ValueError):
+        parse_regions("AAABBBCCC\n" * 8)
+    with pytest.raises(ValueError):
+        parse_regions(REGION_MAP.replace("GGGHHHIII\n", "GGGHHHIIA\n", 1))
+    with pytest.raises(ValueError):
+        get_variant("jigsaw")
+    with pytest.raises(ValueError):
+        get_variant("killer")
+
+
+@pytest.mark.parametrize("variant", [X_SUDOKU, WINDOKU, JIGSAW])
+@pytest.mark.parametrize("backend", ["python_mrv", "bt_mrv"])
+def test_solve_variant(variant, backend):
+    if backend == "bt_mrv" and bt is None:
+        pytest.skip("bt_mrv extension not compiled")
+    puzzle, _ = puzzle_of(variant)
+    solved = solve(puzzle, variant, backend)
+    assert np.all(solved[puzzle != 0] == puzzle[puzzle != 0])
+    assert validate_board(solved, variant.tables)[0]
+    assert verify_solutions(solved, puzzle, units=variant.tables)[0]
+
+
+def test_variant_rules_checked():
+    puzzle, solution = puzzle_of(STANDARD, seed=3, holes=0)
+    # A standard solution almost never has distinct diagonals
+    if len(set(np.diag(solution))) < 9:
+        assert not validate_board(solution, X_SUDOKU.tables)[0]
+        assert not verify_solutions(solution, units=X_SUDOKU.tables)[0]
+    # Jigsaw solutions break the standard blocks
+    _, jigsaw_solution = puzzle_of(JIGSAW)
+    assert verify_solutions(jigsaw_solution, units=JIGSAW.tables)[0]
+    assert not verify_solutions(jigsaw_solution)[0]
+
+
+def test_unsolvable_variant():
+    # The first cell can only be 1, which is already on its diagonal
+    puzzle = np.zeros((9, 9), dtype=np.intc)
+    puzzle[0, 1:] = np.arange(2, 10)
+    puzzle[4, 4] = 1
+    for backend in ["python_mrv"] + (["bt_mrv"] if bt is not None else []):
+        with pytest.raises(ValueError):
+            solve(puzzle, X_SUDOKU, backend)
+
+
+@needs_bt
+@pytest.mark.parametrize("variant", [STANDARD, X_SUDOKU, JIGSAW])
+def test_node_count_parity(variant):
+    puzzle, _ = puzzle_of(variant, seed=1, holes=55)
+    stats = {}
+    board = puzzle.tolist()
+    solve_backtrack_MRV(board, 0, 0, stats=stats, units=variant.tables)
+    bt_board = puzzle.copy()
+    bt_stats = bt.solve_with_stats(bt_board, units=variant.bt_tables)
+    assert bt_stats["solved"]
+    assert bt_stats["nodes"] == stats["nodes"]
+    assert np.array_equal(np.asarray(bt_board), np.array(board))
+
+
+def test_diagonal_units():
+    assert DIAGONALS[0] == (0, 10, 20, 30, 40, 50, 60, 70, 80)
+    assert DIAGONALS[1] == (8, 16, 24, 32, 40, 48, 56, 64, 72)